@@ -0,0 +1,77 @@
+# app/api_json.py
+"""
+JSON pre /api/v1 (pages/api.py): rýchle kódovanie, výber polí a kurzory.
+
+Handlery vracajú JSONBytesResponse priamo, takže FastAPI výsledok
+nepreháňa cez jsonable_encoder ani response_model – slovníky z repozitárov
+idú rovno do orjson. Pydantic modely (model/) slúžia API len ako
+dokumentácia v OpenAPI a zoznam povolených polí pre ?fields=.
+
+    ?fields=id,date,location   -> každý záznam len s týmito kľúčmi, v tomto poradí
+    ?cursor=...&limit=...      -> ďalšia strana (kurzor je nepriehľadný token)
+
+orjson je voliteľný – bez neho štandardný json (kompaktný, bez medzier).
+"""
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # orjson je voliteľný – bez neho pomalší json zo stdlib
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class JSONBytesResponse(Response):
+    """JSON odpoveď bez jsonable_encoder; obsah musia byť dict/list/str/int/float/None."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def parse_fields(raw: Optional[str], allowed: Sequence[str]) -> Optional[Tuple[str, ...]]:
+    """?fields=b,a -> ("b", "a") v poradí z požiadavky (bez duplicít); None = všetky polia. Neznáme pole -> ValueError."""
+    if raw is None:
+        return None
+    wanted = tuple(dict.fromkeys(f.strip() for f in raw.split(",") if f.strip()))
+    unknown = set(wanted).difference(allowed)
+    if unknown:
+        raise ValueError(f"Neznáme polia: {', '.join(sorted(unknown))} (povolené: {', '.join(allowed)})")
+    if not wanted:
+        raise ValueError("Prázdny zoznam polí")
+    return wanted
+
+
+def project(rows: List[Dict[str, Any]], fields: Optional[Tuple[str, ...]]) -> List[Dict[str, Any]]:
+    # bez ?fields= sa záznamy nekopírujú
+    if fields is None:
+        return rows
+    return [{f: row[f] for f in fields} for row in rows]
+
+
+def encode_cursor(key: Any) -> str:
+    """Kľúč posledného záznamu na strane -> token do URL."""
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, kind: type) -> Any:
+    """Opak encode_cursor; kľúč musí byť typu `kind`, inak ValueError."""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError as e:
+        raise ValueError("Neplatný kurzor") from e
+    if not isinstance(key, kind) or isinstance(key, bool):
+        raise ValueError("Neplatný kurzor")
+    return key
@@ -0,0 +1,47 @@
+# benchmarks/_harness.py
+"""
+Spoločná kostra benchmarkov s viacerými variantmi.
+
+config.py číta TEAMHUB_* premenné pri importe, preto každý variant beží
+v samostatnom procese: rodič pripraví DB a spustí ten istý modul
+s `--child` a vlastným prostredím, dieťa odmeria scenár a posledný
+riadok výstupu je výsledok ako JSON.
+
+    ap = argparser()
+    ap.add_argument("--views", type=int, default=20)
+    args = ap.parse_args()
+    if args.child:
+        emit(asyncio.run(_run(args.views)))
+        return
+    result = run_child("benchmarks.stream_html", ["--views", args.views],
+                       TEAMHUB_DB_PATH=DB_PATH, TEAMHUB_STREAM_HTML="1")
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Sequence
+
+
+def argparser() -> argparse.ArgumentParser:
+    """ArgumentParser so skrytým --child (beh jedného variantu v podprocese)."""
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    return ap
+
+
+def emit(result: Any) -> None:
+    """Výsledok dieťaťa pre rodiča – jeden riadok JSON na konci výstupu."""
+    print(json.dumps(result))
+
+
+def run_child(module: str, args: Sequence[Any] = (), **env: str) -> Any:
+    """Spustí `python -m module --child *args` s TEAMHUB_* premennými `env` a vráti jeho výsledok."""
+    proc = subprocess.run(
+        [sys.executable, "-m", module, "--child", *map(str, args)],
+        env=dict(os.environ, **env), capture_output=True, text=True, check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
@@ -0,0 +1,137 @@
+# benchmarks/api_throughput.py
+"""
+Priepustnosť /api/v1 oproti HTML stránkam s rovnakými dátami a cena
+samotného JSON výstupu (orjson vs. json vs. FastAPI jsonable_encoder vs.
+validácia cez response_model).
+
+Dvojice (HTML, API) sa volajú sekvenčne cez httpx.ASGITransport; req/s je
+1 / medián latencie. Kompresia je vypnutá – KiB sú surové telá.
+
+    python -m benchmarks.api_throughput --requests 200
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from benchmarks._harness import argparser, emit, run_child
+
+DB_PATH = "/tmp/teamhub_bench_api.db"
+# (názov, HTML stránka, API s rovnakými dátami, user_id, rola)
+PAIRS = [
+    ("events page", "/events/?window=past", "/api/v1/events?window=past&limit=50", 1, "admin"),
+    ("events fields", "/events/?window=past", "/api/v1/events?window=past&limit=50&fields=id,date,event_type", 1, "admin"),
+    ("players", "/players", "/api/v1/players/summary?limit=500", 1, "admin"),
+    ("my statuses", "/me", "/api/v1/me/statuses?limit=500", 4, "player"),
+    ("items", "/items/", "/api/v1/items?limit=100", 1, "admin"),
+]
+
+
+def _timed(fn: Callable[[], Any], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times) * 1000
+
+
+async def _measure(client: Any, path: str, requests: int) -> Dict[str, float]:
+    await client.get(path)  # prvý request (šablóny, matica) nerátame
+    lat: List[float] = []
+    size = 0
+    for _ in range(requests):
+        started = time.perf_counter()
+        r = await client.get(path)
+        lat.append(time.perf_counter() - started)
+        assert r.status_code == 200, (path, r.status_code)
+        size = len(r.content)
+    p50 = statistics.median(lat) * 1000
+    return {"p50_ms": round(p50, 2), "rps": round(1000 / p50, 1), "kb": round(size / 1024, 1)}
+
+
+async def _run(requests: int) -> Dict[str, object]:
+    import httpx
+
+    from main import app
+    from services.auth import User
+    from services.session import SESSION_COOKIE_NAME, session_store
+
+    results: Dict[str, object] = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        for name, html_path, api_path, user_id, role in PAIRS:
+            sid = session_store.create_session(User(id=user_id, username=f"u{user_id}", role=role))
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench",
+                                         cookies={SESSION_COOKIE_NAME: sid}) as client:
+                results[name] = {
+                    "html": await _measure(client, html_path, requests),
+                    "api": await _measure(client, api_path, requests),
+                }
+    return results
+
+
+def _encoders(repeat: int) -> Dict[str, float]:
+    """Len serializácia jednej strany udalostí (500 záznamov) – bez DB a HTTP."""
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+
+    from api_json import dumps, orjson
+    from database.database import open_read_connection
+    from model.api import Page
+    from model.events import EventPublic
+    from services.events import EventsService
+
+    with open_read_connection() as conn:
+        page = EventsService(conn).list_events_page(window="past", limit=500)
+    content = {"data": page["events"], "next_cursor": page["next_cursor"]}
+    model = Page[EventPublic]
+
+    out = {
+        "api_json.dumps": _timed(lambda: dumps(content), repeat),
+        "json.dumps": _timed(lambda: json.dumps(content).encode(), repeat),
+        # predvolená cesta FastAPI pre vrátený dict
+        "jsonable_encoder + JSONResponse": _timed(lambda: JSONResponse(jsonable_encoder(content)), repeat),
+        # ...a s response_model=Page[EventPublic]
+        "response_model validate + dump": _timed(
+            lambda: JSONResponse(jsonable_encoder(model.model_validate(content))), repeat
+        ),
+    }
+    if orjson is None:
+        out["api_json.dumps (bez orjson = json)"] = out.pop("api_json.dumps")
+    return {k: round(v, 3) for k, v in out.items()}
+
+
+def main() -> None:
+    ap = argparser()
+    ap.add_argument("--requests", type=int, default=200)
+    ap.add_argument("--players", type=int, default=60)
+    ap.add_argument("--events", type=int, default=1500)
+    ap.add_argument("--items", type=int, default=1000)
+    args = ap.parse_args()
+
+    if args.child:
+        emit({"routes": asyncio.run(_run(args.requests)), "encoders": _encoders(args.requests)})
+        return
+
+    from benchmarks.synthetic_db import build
+
+    build(DB_PATH, players=args.players, events=args.events, items=args.items)
+    result = run_child("benchmarks.api_throughput", ["--requests", args.requests],
+                       TEAMHUB_DB_PATH=DB_PATH, TEAMHUB_SESSION_BACKEND="memory",
+                       TEAMHUB_PASSWORD_POOL_WORKERS="0", TEAMHUB_COMPRESSION="0")
+
+    print(f"{'':16s} {'HTML req/s':>11s} {'KiB':>7s} {'API req/s':>10s} {'KiB':>7s} {'x':>6s}")
+    for name, row in result["routes"].items():
+        html, api = row["html"], row["api"]
+        print(f"{name:16s} {html['rps']:11.1f} {html['kb']:7.1f} {api['rps']:10.1f} {api['kb']:7.1f} "
+              f"{api['rps'] / html['rps']:6.1f}")
+    print("\nserializácia 500 udalostí (ms):")
+    for name, ms in result["encoders"].items():
+        print(f"  {name:36s} {ms:8.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/attendance_matrix.py
+"""
+Súhrny pre /players, /me a /attendance/stats: pôvodné SQL (CROSS JOIN / agregácie) vs.
+matica dochádzky v pamäti (numpy, ak je nainštalovaná, a čistý Python bitset).
+Meria aj prvé načítanie matice a cenu jednej inkrementálnej zmeny.
+
+    python -m benchmarks.attendance_matrix --players 100 --events 2000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import time
+from typing import Callable, Dict
+
+import config
+from benchmarks.synthetic_db import build
+from services import attendance_matrix as am
+from services.attendance import AttendanceService
+
+DB_PATH = "/tmp/teamhub_bench_matrix.db"
+
+
+def _timed(fn: Callable[[], object], repeat: int) -> float:
+    fn()  # zahriatie (a pri matici prvé načítanie)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return round((time.perf_counter() - started) * 1000 / repeat, 3)
+
+
+def _suite(svc: AttendanceService, user_id: int, repeat: int) -> Dict[str, float]:
+    return {
+        "get_players_training_summary": _timed(svc.get_players_training_summary, repeat),
+        "get_my_training_summary": _timed(lambda: svc.get_my_training_summary(user_id), repeat),
+        "get_my_trainings": _timed(lambda: svc.get_my_trainings(user_id), repeat),
+        "get_user_stats": _timed(lambda: svc.get_user_stats(user_id), repeat),
+        "get_player_trends": _timed(lambda: svc.get_player_trends(user_id), repeat),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--players", type=int, default=100)
+    ap.add_argument("--events", type=int, default=2000)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    build(DB_PATH, players=args.players, events=args.events)
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    svc = AttendanceService(conn)
+    user_id = conn.execute("SELECT id FROM users WHERE role = 'player' LIMIT 1").fetchone()[0]
+    event_id = conn.execute("SELECT id FROM events LIMIT 1").fetchone()[0]
+
+    results: Dict[str, object] = {"players": args.players, "events": args.events}
+
+    config.ATTENDANCE_MATRIX = False
+    results["sql_ms"] = _suite(svc, user_id, args.repeat)
+
+    config.ATTENDANCE_MATRIX = True
+    backends = ["bitset"] if am.np is None else [None, "bitset"]
+    for backend in backends:
+        matrix = am.AttendanceMatrix(backend)
+        am.attendance_matrix = matrix
+        import services.attendance as att_module
+        att_module.attendance_matrix = matrix
+
+        started = time.perf_counter()
+        matrix.players_training_summary(conn)
+        load_ms = (time.perf_counter() - started) * 1000
+        name = matrix.stats()["backend"]
+        timings = _suite(svc, user_id, args.repeat)
+
+        started = time.perf_counter()
+        for i in range(1000):
+            matrix.apply([(event_id, user_id, ("yes", "no")[i % 2])])
+        apply_us = (time.perf_counter() - started) * 1000  # 1000 zmien -> µs na zmenu
+        # trendy hráča sú po _suite v cache -> každá zmena ich prepočíta
+
+        timings.update(first_load_ms=round(load_ms, 3), apply_one_us=round(apply_us, 3))
+        results[f"matrix_{name}_ms"] = timings
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# benchmarks/compression.py
+"""
+CPU za kompresiu vs. ušetrené bajty na našich šablónach – podklad pre
+TEAMHUB_COMPRESSION_GZIP_LEVEL / TEAMHUB_COMPRESSION_BR_QUALITY.
+
+Stránky sa vyrenderujú zo syntetickej DB (bez kompresie), potom sa každá
+skomprimuje na každej úrovni: celé telo naraz aj "stream" po 32 KiB so
+sync flushom (ako streamované stránky v CompressionMiddleware). Pre
+porovnanie je pri stránke aj čas jej renderu.
+
+    python -m benchmarks.compression --repeat 5
+"""
+from __future__ import annotations
+
+import statistics
+import time
+from typing import Dict, List
+
+from benchmarks._harness import argparser, emit, run_child
+
+DB_PATH = "/tmp/teamhub_bench_compression.db"
+PAGES = ["/events/", "/events/?window=past", "/players", "/admin/users", "/me", "/attendance/stats"]
+STREAM_CHUNK = 32 * 1024
+
+
+def _compress(encoding: str, level: int, body: bytes, chunk: int = 0) -> bytes:
+    from compression import compressor
+
+    c = compressor(encoding, level)
+    if not chunk:
+        return c.compress(body) + c.finish()
+    out = [c.compress(body[i:i + chunk]) + c.flush() for i in range(0, len(body), chunk)]
+    return b"".join(out) + c.finish()
+
+
+def _timed(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times) * 1000
+
+
+def _child(repeat: int) -> Dict[str, object]:
+    from fastapi.testclient import TestClient
+
+    from compression import brotli
+    from main import app
+    from services.auth import User
+    from services.session import SESSION_COOKIE_NAME, session_store
+
+    levels = [("gzip", level) for level in range(1, 10)]
+    if brotli is not None:
+        levels += [("br", q) for q in range(0, 12)]
+
+    pages: Dict[str, Dict[str, object]] = {}
+    with TestClient(app) as client:
+        client.cookies.set(SESSION_COOKIE_NAME, session_store.create_session(User(id=1, username="admin", role="admin")))
+        for path in PAGES:
+            client.get(path)
+            render_ms = _timed(lambda: client.get(path, headers={"accept-encoding": "identity"}), repeat)
+            body = client.get(path, headers={"accept-encoding": "identity"}).content
+            rows: List[Dict[str, object]] = []
+            for encoding, level in levels:
+                size = len(_compress(encoding, level, body))
+                stream_size = len(_compress(encoding, level, body, STREAM_CHUNK))
+                rows.append({
+                    "alg": encoding,
+                    "level": level,
+                    "ratio": round(size / len(body), 4),
+                    "kb": round(size / 1024, 1),
+                    "stream_kb": round(stream_size / 1024, 1),
+                    "ms": round(_timed(lambda: _compress(encoding, level, body), repeat), 3),
+                })
+            pages[path] = {"kb": round(len(body) / 1024, 1), "render_ms": round(render_ms, 2), "levels": rows}
+    return pages
+
+
+def main() -> None:
+    ap = argparser()
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--players", type=int, default=60)
+    ap.add_argument("--events", type=int, default=1500)
+    args = ap.parse_args()
+
+    if args.child:
+        emit(_child(args.repeat))
+        return
+
+    from benchmarks.synthetic_db import build
+
+    build(DB_PATH, players=args.players, events=args.events)
+    # stránky bez kompresie a bez streamovania – meriame samotné kompresory
+    pages = run_child("benchmarks.compression", ["--repeat", args.repeat],
+                      TEAMHUB_DB_PATH=DB_PATH, TEAMHUB_SESSION_BACKEND="memory",
+                      TEAMHUB_PASSWORD_POOL_WORKERS="0", TEAMHUB_COMPRESSION="0", TEAMHUB_STREAM_HTML="0")
+
+    total_kb = sum(p["kb"] for p in pages.values())
+    print(f"{'stránka':24s} {'KiB':>8s} {'render ms':>10s}")
+    for path, page in pages.items():
+        print(f"{path:24s} {page['kb']:8.1f} {page['render_ms']:10.2f}")
+    print(f"\nspolu {total_kb:.1f} KiB; súčet cez všetky stránky:")
+    print(f"{'alg':5s} {'level':>5s} {'KiB':>8s} {'stream KiB':>11s} {'ratio':>7s} {'ms':>8s} {'MB/s':>7s}")
+    for i, row in enumerate(next(iter(pages.values()))["levels"]):
+        kb = sum(p["levels"][i]["kb"] for p in pages.values())
+        stream_kb = sum(p["levels"][i]["stream_kb"] for p in pages.values())
+        ms = sum(p["levels"][i]["ms"] for p in pages.values())
+        print(f"{row['alg']:5s} {row['level']:5d} {kb:8.1f} {stream_kb:11.1f} {kb / total_kb:7.4f} "
+              f"{ms:8.2f} {total_kb * 1.024 / ms:7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# benchmarks/concurrency.py
+"""
+Priepustnosť pri súbežných requestoch: SQLite v event loope vs. na DB executore.
+
+Ťažké requesty (/events/ nad syntetickou DB) bežia súčasne s ľahkými
+(/login bez DB). Keď SQLite blokuje event loop, ľahké requesty čakajú na
+ťažké; s executorom by ich latencia mala zostať nízka.
+
+    python -m benchmarks.concurrency --duration 10 --heavy 8 --light 8
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks._harness import argparser, emit, run_child
+
+DB_PATH = "/tmp/teamhub_bench_concurrency.db"
+
+
+def _pct(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def _run(duration: float, heavy: int, light: int) -> dict:
+    import httpx
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        r = await client.post("/login", data={"username": "player001", "password": "pw"})
+        assert r.status_code in (200, 303), r.status_code
+
+        lat = {"heavy": [], "light": []}
+        stop = time.perf_counter() + duration
+
+        async def worker(kind: str, path: str) -> None:
+            while time.perf_counter() < stop:
+                started = time.perf_counter()
+                resp = await client.get(path)
+                resp.raise_for_status()
+                lat[kind].append(time.perf_counter() - started)
+
+        await asyncio.gather(
+            *[worker("heavy", "/events/") for _ in range(heavy)],
+            *[worker("light", "/login") for _ in range(light)],
+        )
+
+    out = {"mode": "executor" if os.environ.get("TEAMHUB_DB_EXECUTOR") != "0" else "inline"}
+    for kind, values in lat.items():
+        out[kind] = {
+            "requests": len(values),
+            "rps": round(len(values) / duration, 1),
+            "p50_ms": round(statistics.median(values) * 1000, 1) if values else 0.0,
+            "p95_ms": round(_pct(values, 0.95) * 1000, 1),
+        }
+    return out
+
+
+def main() -> None:
+    ap = argparser()
+    ap.add_argument("--duration", type=float, default=10.0)
+    ap.add_argument("--heavy", type=int, default=8)
+    ap.add_argument("--light", type=int, default=8)
+    ap.add_argument("--players", type=int, default=60)
+    ap.add_argument("--events", type=int, default=800)
+    args = ap.parse_args()
+
+    if args.child:
+        emit(asyncio.run(_run(args.duration, args.heavy, args.light)))
+        return
+
+    from benchmarks.synthetic_db import build
+
+    build(DB_PATH, players=args.players, events=args.events)
+    results = [
+        run_child("benchmarks.concurrency",
+                  ["--duration", args.duration, "--heavy", args.heavy, "--light", args.light],
+                  TEAMHUB_DB_PATH=DB_PATH, TEAMHUB_DB_EXECUTOR=executor)
+        for executor in ("0", "1")
+    ]
+
+    print(f"{args.players} hráčov × {args.events} udalostí, {args.heavy} ťažkých + {args.light} ľahkých klientov, {args.duration:.0f}s")
+    print(f"{'mode':<10}{'heavy rps':>10}{'heavy p95':>11}{'light rps':>11}{'light p50':>11}{'light p95':>11}")
+    for r in results:
+        print(f"{r['mode']:<10}{r['heavy']['rps']:>10}{r['heavy']['p95_ms']:>9}ms"
+              f"{r['light']['rps']:>11}{r['light']['p50_ms']:>9}ms{r['light']['p95_ms']:>9}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/events_rows.py
+"""
+/events/ s fragment cache riadkov a bez nej (TEAMHUB_EVENT_ROW_CACHE_SIZE=0).
+
+Tréner opakovane otvára stránku; pred každým --rsvp-every-tým zobrazením
+niekto klikne RSVP, takže sa jeden riadok zmení a musí sa prekresliť.
+
+    python -m benchmarks.events_rows --views 300 --rsvp-every 5
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import statistics
+import time
+from typing import Dict
+
+from benchmarks._harness import argparser, emit, run_child
+
+DB_PATH = "/tmp/teamhub_bench_event_rows.db"
+
+
+async def _run(views: int, rsvp_every: int) -> Dict[str, object]:
+    import httpx
+
+    from database.database import open_read_connection
+    from main import app
+    from services.attendance import AttendanceService
+    from services.events import EventsService
+    from services.auth import User
+    from services.fragment_cache import event_row_cache
+    from services.session import SESSION_COOKIE_NAME, session_store
+
+    sid = session_store.create_session(User(id=1, username="admin", role="coach"))
+    rnd = random.Random(1)
+    writer = AttendanceService()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench",
+                                 cookies={SESSION_COOKIE_NAME: sid}) as client:
+        # RSVP len na udalosti z prvej strany, ktorú tréner vidí
+        with open_read_connection() as conn:
+            event_ids = [e["id"] for e in EventsService(conn).list_events_page()["events"]]
+            player_ids = [r[0] for r in conn.execute("SELECT id FROM users WHERE role = 'player'")]
+        lat = []
+        for i in range(views):
+            if rsvp_every and i % rsvp_every == 0:
+                await writer.set_status_async(rnd.choice(event_ids), rnd.choice(player_ids),
+                                              rnd.choice(("yes", "no", "unknown")))
+            started = time.perf_counter()
+            r = await client.get("/events/")
+            lat.append(time.perf_counter() - started)
+            assert r.status_code == 200
+    ms = sorted(x * 1000 for x in lat)
+    return {
+        "row_cache": event_row_cache.max_size,
+        "mean_ms": round(statistics.fmean(ms), 2),
+        "p50_ms": round(statistics.median(ms), 2),
+        "p95_ms": round(ms[int(len(ms) * 0.95) - 1], 2),
+        "cache": event_row_cache.stats(),
+    }
+
+
+def main() -> None:
+    ap = argparser()
+    ap.add_argument("--views", type=int, default=300)
+    ap.add_argument("--rsvp-every", type=int, default=5)
+    ap.add_argument("--players", type=int, default=60)
+    args = ap.parse_args()
+
+    if args.child:
+        emit(asyncio.run(_run(args.views, args.rsvp_every)))
+        return
+
+    from benchmarks.synthetic_db import build
+
+    build(DB_PATH, players=args.players, events=300)
+    for size in ("0", "5000"):
+        result = run_child("benchmarks.events_rows", ["--views", args.views, "--rsvp-every", args.rsvp_every],
+                           TEAMHUB_DB_PATH=DB_PATH, TEAMHUB_EVENT_ROW_CACHE_SIZE=size,
+                           TEAMHUB_SESSION_BACKEND="memory", TEAMHUB_PASSWORD_POOL_WORKERS="0")
+        print(json.dumps(result))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# benchmarks/export_stream.py
+"""
+Export dochádzky na syntetickej DB cez viac sezón: priepustnosť cez HTTP
+(/export/attendance) a špička pamäte streamovaného exportu vs. "naivného"
+(fetchall + celý súbor v pamäti) pre 1, 5 a 10 sezón.
+
+    python -m benchmarks.export_stream --players 100 --seasons 1 5 10
+"""
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import json
+import time
+import tracemalloc
+
+from benchmarks._harness import argparser, emit, run_child
+
+DB_PATH = "/tmp/teamhub_bench_export.db"
+EVENTS_PER_SEASON = 300
+
+
+def _naive_export(conn, columns) -> bytes:
+    """Pôvodný prístup 'skopíruj všetko': fetchall a celý CSV v pamäti."""
+    from repositories.attendance import iter_attendance_matrix
+
+    rows = list(iter_attendance_matrix(conn))
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+    writer.writerows([tuple(r[c] for c in columns) for r in rows])
+    return buf.getvalue().encode("utf-8")
+
+
+def _memory(kind: str) -> dict:
+    from database.database import open_read_connection
+    from services.export import KINDS, ExportRequest, stream_export
+
+    columns = KINDS["matrix"][1]
+    tracemalloc.start()
+    started = time.perf_counter()
+    first_chunk = None
+    if kind == "stream":
+        size = 0
+        with open_read_connection() as conn:
+            for chunk in stream_export(ExportRequest(), conn):
+                if first_chunk is None:
+                    first_chunk = time.perf_counter() - started
+                size += len(chunk)
+    else:
+        with open_read_connection() as conn:
+            size = len(_naive_export(conn, columns))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # naivný export nepošle nič, kým nemá celý súbor
+    first_chunk = elapsed if first_chunk is None else first_chunk
+    return {
+        "bytes": size,
+        "peak_mb": round(peak / 2**20, 2),
+        "first_chunk_ms": round(first_chunk * 1000, 1),
+        "seconds_traced": round(elapsed, 3),
+    }
+
+
+async def _http(query: str) -> dict:
+    import httpx
+    from main import app
+    from services.auth import User
+    from services.session import SESSION_COOKIE_NAME, session_store
+
+    sid = session_store.create_session(User(id=1, username="admin", role="admin"))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench",
+                                 cookies={SESSION_COOKIE_NAME: sid}) as client:
+        # ASGITransport si telo odpovede zbiera celé, takže tu meriame len celkový čas;
+        # čas do prvého kusu je v _memory("stream")
+        started = time.perf_counter()
+        size = 0
+        async with client.stream("GET", f"/export/attendance?{query}") as r:
+            assert r.status_code == 200, r.status_code
+            async for chunk in r.aiter_raw():
+                size += len(chunk)
+        elapsed = time.perf_counter() - started
+    return {
+        "query": query,
+        "bytes": size,
+        "seconds": round(elapsed, 3),
+        "mb_per_s": round(size / 2**20 / elapsed, 1),
+    }
+
+
+def _child(players: int, seasons: int) -> dict:
+    from database.database import open_read_connection
+
+    with open_read_connection() as conn:
+        cells = conn.execute(
+            "SELECT (SELECT COUNT(*) FROM events) * (SELECT COUNT(*) FROM users WHERE role = 'player')"
+        ).fetchone()[0]
+    out = {"players": players, "seasons": seasons, "matrix_rows": cells}
+    out["memory_stream"] = _memory("stream")
+    out["memory_naive"] = _memory("naive")
+    out["http"] = [
+        asyncio.run(_http(q))
+        for q in ("format=csv", "format=jsonl", "format=csv&gzip=true", "kind=summary&format=csv")
+    ]
+    out["http"][0]["rows_per_s"] = round(cells / out["http"][0]["seconds"])
+    return out
+
+
+def main() -> None:
+    ap = argparser()
+    ap.add_argument("--players", type=int, default=100)
+    ap.add_argument("--seasons", type=int, nargs="+", default=[1, 5, 10])
+    args = ap.parse_args()
+
+    if args.child:
+        emit(_child(args.players, args.seasons[0]))
+        return
+
+    from benchmarks.synthetic_db import build
+
+    results = []
+    for seasons in args.seasons:
+        build(DB_PATH, players=args.players, events=seasons * EVENTS_PER_SEASON, fill=0.8)
+        results.append(run_child("benchmarks.export_stream", ["--players", args.players, "--seasons", seasons],
+                                 TEAMHUB_DB_PATH=DB_PATH))
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
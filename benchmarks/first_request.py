@@ -0,0 +1,96 @@
+# benchmarks/first_request.py
+"""
+Latencia prvého requestu po štarte (deploy / reštart workera).
+
+Každý režim beží v čerstvom procese: štart aplikácie (lifespan), potom
+prvý a druhý GET na niekoľko stránok. Režimy:
+
+- original:       auto_reload, bez bytecode cache, bez warm-upu (pôvodne)
+- bytecode_cold:  bytecode cache (prázdny adresár) + warm-up – prvý deploy
+- bytecode_warm:  ten istý adresár znova – ďalší worker / reštart
+- warm_up_only:   warm-up bez bytecode cache
+
+    python -m benchmarks.first_request --runs 3
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import statistics
+import time
+from typing import Dict, List
+
+from benchmarks._harness import argparser, emit, run_child
+
+DB_PATH = "/tmp/teamhub_bench_first.db"
+CACHE_DIR = "/tmp/teamhub_bench_jinja"
+PAGES = ["/", "/events/", "/me", "/players", "/attendance/stats"]
+
+MODES: Dict[str, Dict[str, str]] = {
+    "original": {"TEAMHUB_TEMPLATES_AUTO_RELOAD": "1", "TEAMHUB_TEMPLATE_BYTECODE_CACHE": "0",
+                 "TEAMHUB_TEMPLATE_WARM_UP": "0"},
+    "bytecode_cold": {"TEAMHUB_TEMPLATE_BYTECODE_CACHE": "1", "TEAMHUB_TEMPLATE_WARM_UP": "1"},
+    "bytecode_warm": {"TEAMHUB_TEMPLATE_BYTECODE_CACHE": "1", "TEAMHUB_TEMPLATE_WARM_UP": "1"},
+    "warm_up_only": {"TEAMHUB_TEMPLATE_BYTECODE_CACHE": "0", "TEAMHUB_TEMPLATE_WARM_UP": "1"},
+}
+
+
+def _child() -> dict:
+    started = time.perf_counter()
+    from fastapi.testclient import TestClient
+
+    from main import app
+    from services.auth import User
+    from services.session import SESSION_COOKIE_NAME, session_store
+
+    imported = time.perf_counter()
+    out: Dict[str, object] = {"import_ms": round((imported - started) * 1000, 1)}
+    with TestClient(app) as client:
+        out["startup_ms"] = round((time.perf_counter() - imported) * 1000, 1)
+        client.cookies.set(SESSION_COOKIE_NAME, session_store.create_session(User(id=1, username="admin", role="admin")))
+        first = {}
+        second = {}
+        for path in PAGES:
+            for target in (first, second):
+                t = time.perf_counter()
+                r = client.get(path)
+                assert r.status_code == 200, (path, r.status_code)
+                target[path] = (time.perf_counter() - t) * 1000
+        out["first_ms"] = {p: round(v, 1) for p, v in first.items()}
+        out["first_total_ms"] = round(sum(first.values()), 1)
+        out["second_total_ms"] = round(sum(second.values()), 1)
+    return out
+
+
+def main() -> None:
+    ap = argparser()
+    ap.add_argument("--runs", type=int, default=3)
+    args = ap.parse_args()
+
+    if args.child:
+        emit(_child())
+        return
+
+    from benchmarks.synthetic_db import build
+
+    build(DB_PATH, players=60, events=300)
+    results: Dict[str, Dict[str, object]] = {}
+    for mode, extra in MODES.items():
+        runs: List[dict] = []
+        for _ in range(args.runs):
+            if mode == "bytecode_cold":
+                shutil.rmtree(CACHE_DIR, ignore_errors=True)
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            runs.append(run_child("benchmarks.first_request",
+                                  TEAMHUB_DB_PATH=DB_PATH, TEAMHUB_SESSION_BACKEND="memory",
+                                  TEAMHUB_TEMPLATE_CACHE_DIR=CACHE_DIR, TEAMHUB_PASSWORD_POOL_WORKERS="0", **extra))
+        results[mode] = {
+            key: round(statistics.median(r[key] for r in runs), 1)
+            for key in ("import_ms", "startup_ms", "first_total_ms", "second_total_ms")
+        }
+        results[mode]["first_ms"] = runs[-1]["first_ms"]
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# benchmarks/login_storm.py
+"""
+"Všetci sa prihlásia naraz": N súčasných POST /login a medzitým
+GET /events/ od už prihláseného používateľa. Porovná latenciu stránky
+bez búrky a počas nej, keď bcrypt beží na DB executore (pôvodne,
+TEAMHUB_PASSWORD_POOL_WORKERS=0) a v poole procesov (s frontom a 503).
+
+Druhá búrka ide s --viewers súčasnými divákmi (viac ako spojení v poole):
+stránky držia všetky spojenia a prihlásenia ich potrebujú tiež – ak by
+executor čakal na pool blokujúco, worker zamrzne (PoolTimeout).
+
+    python -m benchmarks.login_storm --logins 64 --pages 40 --viewers 16
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import statistics
+import time
+from collections import Counter
+from typing import Dict, List
+
+from benchmarks._harness import argparser, emit, run_child
+
+DB_PATH = "/tmp/teamhub_bench_login.db"
+
+
+def _summary(latencies: List[float]) -> Dict[str, float]:
+    ms = sorted(x * 1000 for x in latencies)
+    return {
+        "p50_ms": round(statistics.median(ms), 1),
+        "p95_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 1),
+        "max_ms": round(ms[-1], 1),
+    }
+
+
+async def _run(logins: int, pages: int, players: int, viewers: int) -> dict:
+    import httpx
+    from main import app
+    from services.auth import User
+    from services.passwords import password_hasher
+    from services.session import SESSION_COOKIE_NAME, session_store
+
+    password_hasher.warm_up()
+    transport = httpx.ASGITransport(app=app)
+    sid = session_store.create_session(User(id=1, username="admin", role="admin"))
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench",
+                                 cookies={SESSION_COOKIE_NAME: sid}) as viewer:
+
+        page_status: Counter = Counter()
+
+        async def page_latencies(concurrent: int = 1) -> List[float]:
+            # `concurrent` divákov naraz, spolu `pages` stránok; chyby (PoolTimeout) sa len spočítajú
+            async def one(count: int) -> List[float]:
+                out = []
+                for _ in range(count):
+                    started = time.perf_counter()
+                    try:
+                        status = (await viewer.get("/events/")).status_code
+                    except Exception as e:
+                        status = type(e).__name__
+                    page_status[status] += 1
+                    out.append(time.perf_counter() - started)
+                return out
+
+            per_viewer = max(1, pages // concurrent)
+            return [x for lat in await asyncio.gather(*[one(per_viewer) for _ in range(concurrent)]) for x in lat]
+
+        async def login(i: int) -> int:
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                try:
+                    r = await client.post("/login", data={"username": f"player{i % players + 1:03d}", "password": "pw"},
+                                          follow_redirects=False)
+                except Exception as e:
+                    return type(e).__name__
+                return r.status_code
+
+        async def storm(concurrent: int) -> Dict[str, object]:
+            started = time.perf_counter()
+            page_status.clear()
+            logins_done = asyncio.gather(*[login(i) for i in range(logins)])
+            await asyncio.sleep(0.01)  # nech sú prihlásenia naozaj rozbehnuté
+            during = await page_latencies(concurrent)
+            statuses = Counter(await logins_done)
+            return {
+                "viewers": concurrent,
+                "login_status": dict(statuses),
+                "page_status": dict(page_status),
+                "storm_seconds": round(time.perf_counter() - started, 2),
+                "page_during_storm": _summary(during),
+            }
+
+        await page_latencies()  # zahriatie (pool, šablóny, matica)
+        baseline = await page_latencies()
+        storms = [await storm(1), await storm(viewers)]
+
+    workers = password_hasher.workers
+    password_hasher.shutdown()
+    return {
+        "mode": f"process-pool({workers})" if workers > 0 else "db-executor",
+        "logins": logins,
+        "page_baseline": _summary(baseline),
+        "storms": storms,
+    }
+
+
+def main() -> None:
+    ap = argparser()
+    ap.add_argument("--logins", type=int, default=64)
+    ap.add_argument("--pages", type=int, default=40)
+    ap.add_argument("--players", type=int, default=60)
+    ap.add_argument("--viewers", type=int, default=16, help="súčasní diváci v druhej búrke (> TEAMHUB_DB_POOL_SIZE)")
+    args = ap.parse_args()
+
+    if args.child:
+        emit(asyncio.run(_run(args.logins, args.pages, args.players, args.viewers)))
+        return
+
+    from benchmarks.synthetic_db import build
+
+    build(DB_PATH, players=args.players, events=300)
+    for workers in ("0", str(os.cpu_count() or 1)):
+        result = run_child("benchmarks.login_storm",
+                           ["--logins", args.logins, "--pages", args.pages, "--players", args.players,
+                            "--viewers", args.viewers],
+                           TEAMHUB_DB_PATH=DB_PATH, TEAMHUB_PASSWORD_POOL_WORKERS=workers,
+                           TEAMHUB_SESSION_BACKEND="memory")
+        print(json.dumps(result))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# benchmarks/pool_saturation.py
+"""
+Plný pool spojení: viac súčasných klientov ako spojení (a vlákien DB
+executora). Polovica klientov ťahá /events/ (spojenie requestu, drží ho
+počas celého handlera), druhá polovica volá služby bez spojenia
+(`AuthService().aio`, `AttendanceService().aio`), ktoré si ho požičiavajú.
+
+Keby vlákno executora čakalo na pool blokujúco, všetky vlákna by čakali
+na spojenia, ktoré držia requesty čakajúce na vlákno – worker zamrzne
+a po TEAMHUB_DB_POOL_TIMEOUT padajú PoolTimeout. Benchmark skončí
+s chybou, ak sa objaví čo i len jedna chyba, alebo ak blokujúci
+acquire() na executore nezlyhá hneď (poistka v database/executor.py).
+
+    python -m benchmarks.pool_saturation --clients 32 --duration 5 --pool-sizes 2 8
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+
+from benchmarks._harness import argparser, emit, run_child
+
+DB_PATH = "/tmp/teamhub_bench_pool_saturation.db"
+
+
+def _pct(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def _guard_trips() -> bool:
+    from database.database import get_read_pool
+    from database.executor import run_db
+
+    try:
+        conn = await run_db(get_read_pool().acquire)
+    except RuntimeError:
+        return True
+    get_read_pool().release(conn)
+    return False
+
+
+async def _run(clients: int, duration: float) -> dict:
+    import httpx
+    from database.database import get_read_pool
+    from main import app
+    from services.attendance import AttendanceService
+    from services.auth import AuthService
+
+    lat = {"page": [], "service": []}
+    errors: Counter = Counter()
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            r = await client.post("/login", data={"username": "player001", "password": "pw"})
+            assert r.status_code in (200, 303), r.status_code
+            stop = time.perf_counter() + duration
+
+            async def page() -> None:
+                resp = await client.get("/events/")
+                if resp.status_code != 200:
+                    raise RuntimeError(f"HTTP {resp.status_code}")
+
+            async def service() -> None:
+                await AuthService().aio.password_cost_report()
+                await AttendanceService().aio.get_players_training_summary()
+
+            async def worker(kind: str, call) -> None:
+                while time.perf_counter() < stop:
+                    started = time.perf_counter()
+                    try:
+                        await call()
+                    except Exception as e:
+                        errors[type(e).__name__] += 1
+                        continue
+                    lat[kind].append(time.perf_counter() - started)
+
+            await asyncio.gather(
+                *[worker("page", page) for _ in range(clients - clients // 2)],
+                *[worker("service", service) for _ in range(clients // 2)],
+            )
+        guard = await _guard_trips()
+        in_use = get_read_pool().stats()["in_use"]
+
+    out = {"pool_size": int(os.environ["TEAMHUB_DB_POOL_SIZE"]), "errors": dict(errors),
+           "guard": guard, "in_use_after": in_use}
+    for kind, values in lat.items():
+        out[kind] = {
+            "requests": len(values),
+            "rps": round(len(values) / duration, 1),
+            "p50_ms": round(statistics.median(values) * 1000, 1) if values else 0.0,
+            "p95_ms": round(_pct(values, 0.95) * 1000, 1),
+        }
+    return out
+
+
+def main() -> None:
+    ap = argparser()
+    ap.add_argument("--clients", type=int, default=32)
+    ap.add_argument("--duration", type=float, default=5.0)
+    ap.add_argument("--pool-sizes", type=int, nargs="+", default=[2, 8])
+    ap.add_argument("--players", type=int, default=60)
+    ap.add_argument("--events", type=int, default=800)
+    args = ap.parse_args()
+
+    if args.child:
+        emit(asyncio.run(_run(args.clients, args.duration)))
+        return
+
+    from benchmarks.synthetic_db import build
+
+    build(DB_PATH, players=args.players, events=args.events)
+    # krátky timeout – zamrznutie sa ukáže ako PoolTimeout, nie ako visiaci benchmark
+    results = [
+        run_child("benchmarks.pool_saturation", ["--clients", args.clients, "--duration", args.duration],
+                  TEAMHUB_DB_PATH=DB_PATH, TEAMHUB_DB_POOL_SIZE=str(size),
+                  TEAMHUB_DB_EXECUTOR_WORKERS=str(size), TEAMHUB_DB_POOL_TIMEOUT="3")
+        for size in args.pool_sizes
+    ]
+
+    print(f"{args.clients} klientov (polovica stránky, polovica služby bez spojenia), {args.duration:.0f}s")
+    print(f"{'pool':<6}{'page rps':>9}{'page p95':>10}{'svc rps':>9}{'svc p95':>10}  chyby")
+    failed = False
+    for r in results:
+        print(f"{r['pool_size']:<6}{r['page']['rps']:>9}{r['page']['p95_ms']:>8}ms"
+              f"{r['service']['rps']:>9}{r['service']['p95_ms']:>8}ms  {r['errors'] or '-'}")
+        if r["errors"] or not r["guard"] or r["in_use_after"]:
+            failed = True
+    if failed:
+        print("CHYBA: chyby pod záťažou, poistka proti blokujúcemu acquire() nezafungovala alebo ostali požičané spojenia")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/rsvp_burst.py
+"""
+"Tréner ohlásil zápas": celý káder odpovedá naraz cez POST
+/events/{id}/attendance. Porovná commit po každom RSVP s group commitom.
+
+    python -m benchmarks.rsvp_burst --players 60 --clicks 5
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+import time
+
+from benchmarks._harness import argparser, emit, run_child
+
+DB_PATH = "/tmp/teamhub_bench_rsvp.db"
+
+
+async def _run(players: int, clicks: int) -> dict:
+    import httpx
+    from main import app
+    from services.attendance import rsvp_queue
+    from services.auth import User
+    from services.session import SESSION_COOKIE_NAME, session_store
+    from database.database import open_connection
+
+    with open_connection() as conn:
+        users = conn.execute("SELECT id, username, role FROM users WHERE role = 'player' LIMIT ?", (players,)).fetchall()
+        event_ids = [r[0] for r in conn.execute("SELECT id FROM events ORDER BY date DESC LIMIT 3")]
+
+    transport = httpx.ASGITransport(app=app)
+    rnd = random.Random(1)
+
+    async def player(u) -> int:
+        sid = session_store.create_session(User(id=u["id"], username=u["username"], role=u["role"]))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench",
+                                     cookies={SESSION_COOKIE_NAME: sid}) as client:
+            done = 0
+            for _ in range(clicks):  # pár kliknutí, hráči si to rozmýšľajú
+                r = await client.post(f"/events/{rnd.choice(event_ids)}/attendance",
+                                      data={"status": rnd.choice(("yes", "no", "unknown"))})
+                assert r.status_code == 303, r.status_code
+                done += 1
+            return done
+
+    started = time.perf_counter()
+    total = sum(await asyncio.gather(*[player(u) for u in users]))
+    elapsed = time.perf_counter() - started
+    out = {
+        "mode": "group-commit" if os.environ.get("TEAMHUB_RSVP_GROUP_COMMIT") != "0" else "commit-per-rsvp",
+        "rsvps": total,
+        "seconds": round(elapsed, 3),
+        "rsvps_per_s": round(total / elapsed, 1),
+    }
+    if out["mode"] == "group-commit":
+        st = rsvp_queue.stats()
+        out.update(batches=st["batches"], batch_size_mean=st["batch_size_mean"],
+                   batch_size_max=st["batch_size_max"], collapsed=st["collapsed"])
+    return out
+
+
+def main() -> None:
+    ap = argparser()
+    ap.add_argument("--players", type=int, default=60)
+    ap.add_argument("--clicks", type=int, default=5)
+    args = ap.parse_args()
+
+    if args.child:
+        emit(asyncio.run(_run(args.players, args.clicks)))
+        return
+
+    from benchmarks.synthetic_db import build
+
+    for group_commit in ("0", "1"):
+        build(DB_PATH, players=args.players, events=300)
+        result = run_child("benchmarks.rsvp_burst", ["--players", args.players, "--clicks", args.clicks],
+                           TEAMHUB_DB_PATH=DB_PATH, TEAMHUB_RSVP_GROUP_COMMIT=group_commit)
+        print(json.dumps(result))
+
+if __name__ == "__main__":
+    main()
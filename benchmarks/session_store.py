@@ -0,0 +1,102 @@
+# benchmarks/session_store.py
+"""
+Vyhľadanie session (get_user pri každej požiadavke) z viacerých vlákien:
+pamäť vs. SQLite s LRU cache vs. SQLite bez cache, 1 zámok vs. pruhy,
+a bezstavová podpísaná cookie (aj keď každý token je starší ako posledné
+odvolanie, teda prechádza aj kontrolou zoznamu).
+
+    python -m benchmarks.session_store --sessions 5000 --threads 8 --lookups 20000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from typing import Dict
+
+from services.auth import User
+from services.session import (
+    MemorySessionBackend,
+    SessionBackend,
+    SignedCookieSessionBackend,
+    SqliteSessionBackend,
+)
+
+DB_PATH = "/tmp/teamhub_bench_sessions.db"
+TTL = 3600.0
+
+
+def _sqlite(stripes: int, cache_ttl: float) -> SqliteSessionBackend:
+    return SqliteSessionBackend(DB_PATH, TTL, TTL, stripes, cache_size=100000, cache_ttl=cache_ttl)
+
+
+def _signed(revoked: bool) -> SignedCookieSessionBackend:
+    store = SignedCookieSessionBackend("bench-secret", TTL, TTL)
+    store._loaded = True  # bez DB s odvolaniami
+    if revoked:
+        # odvolanie "v budúcnosti" – každý token ide cez kontrolu zoznamu (najhorší prípad)
+        store.revoke_user(10**9, 1, time.time() + TTL)
+    return store
+
+
+def _run(store: SessionBackend, sessions: int, threads: int, lookups: int) -> Dict[str, object]:
+    ids = [store.create_session(User(id=i, username=f"u{i}", role="player")) for i in range(sessions)]
+    per_thread = lookups // threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(seed: int) -> None:
+        rnd = random.Random(seed)
+        picks = [rnd.choice(ids) for _ in range(per_thread)]
+        barrier.wait()
+        for sid in picks:
+            assert store.get_user(sid) is not None
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - started
+    stats = store.stats()
+    store.close()
+    return {
+        "lookups_per_s": round(per_thread * threads / elapsed),
+        "us_per_lookup": round(elapsed / (per_thread * threads) * 1e6, 2),
+        "hit_rate": stats.get("hit_rate"),
+        "live": stats["live"],
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, default=5000)
+    ap.add_argument("--threads", type=int, default=8)
+    ap.add_argument("--lookups", type=int, default=20000)
+    args = ap.parse_args()
+
+    variants = {
+        "memory_1_lock": lambda: MemorySessionBackend(TTL, TTL, 1),
+        "memory_16_stripes": lambda: MemorySessionBackend(TTL, TTL, 16),
+        "sqlite_cache_1_lock": lambda: _sqlite(1, 60.0),
+        "sqlite_cache_16_stripes": lambda: _sqlite(16, 60.0),
+        # cache_ttl=0 = každé čítanie ide do DB (horný odhad pre studenú cache)
+        "sqlite_no_cache": lambda: _sqlite(16, 0.0),
+        "signed_cookie": lambda: _signed(False),
+        "signed_cookie_revocation_check": lambda: _signed(True),
+    }
+    results: Dict[str, object] = {"sessions": args.sessions, "threads": args.threads}
+    for name, factory in variants.items():
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(DB_PATH + suffix):
+                os.remove(DB_PATH + suffix)
+        results[name] = _run(factory(), args.sessions, args.threads, args.lookups)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
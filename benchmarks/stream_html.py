@@ -0,0 +1,100 @@
+# benchmarks/stream_html.py
+"""
+Čas do prvého bajtu (TTFB) a celkový čas veľkých stránok s
+TEAMHUB_STREAM_HTML a bez neho, pre maticu v pamäti aj čisté SQL.
+
+Volá ASGI aplikáciu priamo a meria, kedy príde prvý neprázdny kus tela –
+httpx.ASGITransport by celé telo najprv nazbieral.
+
+    python -m benchmarks.stream_html --views 20 --players 300 --events 3000
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import statistics
+import time
+from typing import Dict, List
+
+from benchmarks._harness import argparser, emit, run_child
+
+DB_PATH = "/tmp/teamhub_bench_stream.db"
+# (cesta, user_id, rola) – /me pre hráča s najdlhším zoznamom tréningov
+PAGES = [("/events/?window=past", 1, "admin"), ("/players", 1, "admin"), ("/me", 4, "player")]
+
+
+async def _get(app, path: str, cookie: str) -> Dict[str, float]:
+    raw_path, _, query = path.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": raw_path, "raw_path": raw_path.encode(), "root_path": "",
+        "query_string": query.encode(), "headers": [(b"host", b"bench"), (b"cookie", cookie.encode())],
+        "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    started = time.perf_counter()
+    out = {"ttfb_ms": 0.0, "chunks": 0, "bytes": 0, "status": 0}
+
+    async def receive():
+        await asyncio.sleep(3600)  # klient neodíde
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            out["status"] = message["status"]
+        elif message["type"] == "http.response.body" and message.get("body"):
+            if not out["chunks"]:
+                out["ttfb_ms"] = (time.perf_counter() - started) * 1000
+            out["chunks"] += 1
+            out["bytes"] += len(message["body"])
+
+    await app(scope, receive, send)
+    out["total_ms"] = (time.perf_counter() - started) * 1000
+    return out
+
+
+async def _run(views: int) -> Dict[str, object]:
+    from main import app
+    from services.auth import User
+    from services.session import SESSION_COOKIE_NAME, session_store
+
+    results: Dict[str, object] = {}
+    async with app.router.lifespan_context(app):
+        for path, user_id, role in PAGES:
+            sid = session_store.create_session(User(id=user_id, username=f"u{user_id}", role=role))
+            cookie = f"{SESSION_COOKIE_NAME}={sid}"
+            await _get(app, path, cookie)  # prvý render (šablóny, matica) nerátame
+            runs: List[Dict[str, float]] = [await _get(app, path, cookie) for _ in range(views)]
+            assert all(r["status"] == 200 for r in runs), (path, runs[0])
+            results[path] = {
+                "ttfb_ms": round(statistics.median(r["ttfb_ms"] for r in runs), 2),
+                "total_ms": round(statistics.median(r["total_ms"] for r in runs), 2),
+                "chunks": runs[-1]["chunks"],
+                "kb": round(runs[-1]["bytes"] / 1024, 1),
+            }
+    return results
+
+
+def main() -> None:
+    ap = argparser()
+    ap.add_argument("--views", type=int, default=20)
+    ap.add_argument("--players", type=int, default=300)
+    ap.add_argument("--events", type=int, default=3000)
+    args = ap.parse_args()
+
+    if args.child:
+        emit(asyncio.run(_run(args.views)))
+        return
+
+    from benchmarks.synthetic_db import build
+
+    build(DB_PATH, players=args.players, events=args.events)
+    for matrix in ("1", "0"):
+        for stream in ("0", "1"):
+            result = run_child("benchmarks.stream_html", ["--views", args.views],
+                               TEAMHUB_DB_PATH=DB_PATH, TEAMHUB_STREAM_HTML=stream,
+                               TEAMHUB_ATTENDANCE_MATRIX=matrix, TEAMHUB_SESSION_BACKEND="memory",
+                               TEAMHUB_PASSWORD_POOL_WORKERS="0")
+            print(json.dumps({"matrix": matrix == "1", "stream": stream == "1", "pages": result}))
+
+if __name__ == "__main__":
+    main()
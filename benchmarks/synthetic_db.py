@@ -0,0 +1,94 @@
+# benchmarks/synthetic_db.py
+"""
+Syntetická databáza na benchmarky: N hráčov, M udalostí (tréningy + zápasy
+cez viac sezón) a náhodná dochádzka. Heslá sa nehashujú (pomalé) –
+každý používateľ má rovnaký vopred vypočítaný hash hesla "pw".
+
+    python -m benchmarks.synthetic_db /tmp/bench.db --players 100 --events 2000
+"""
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import os
+import random
+import sqlite3
+
+from database.migrations import MIGRATIONS, migrate
+
+# bcrypt("pw") – nech generovanie netrvá minúty
+PW_HASH = "$2b$12$3vUWyoKTuIpCFhs2dgqNfOPEneorNLi1tUZt0BpvlELOHKLVUMDLm"
+
+
+def build(path: str, players: int = 60, events: int = 1500, coaches: int = 2,
+          fill: float = 0.8, seed: int = 42, items: int = 0) -> str:
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    rnd = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")
+    migrate(conn)
+
+    users = [("admin", "admin")]
+    users += [(f"coach{i}", "coach") for i in range(1, coaches + 1)]
+    users += [(f"player{i:03d}", "player") for i in range(1, players + 1)]
+    conn.executemany(
+        "INSERT INTO users(username, password_hash, role) VALUES (?, ?, ?)",
+        [(u, PW_HASH, r) for u, r in users],
+    )
+
+    # udalosti rozložené okolo dneška (minulé aj budúce sezóny)
+    start = dt.date.today() - dt.timedelta(days=events // 2)
+    rows = []
+    for i in range(events):
+        day = start + dt.timedelta(days=i)
+        kind = "match" if i % 7 == 6 else "training"
+        rows.append((kind, day.isoformat(), "18:00", "19:30", "Ihrisko", None))
+    conn.executemany(
+        "INSERT INTO events(event_type, date, time_from, time_to, location, note) VALUES (?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+
+    player_ids = [r[0] for r in conn.execute("SELECT id FROM users WHERE role = 'player'")]
+    event_ids = [r[0] for r in conn.execute("SELECT id FROM events")]
+    statuses = ("yes", "yes", "yes", "no", "unknown")
+    # hromadný import: trigger súhrnu by prepočítal event po každom riadku,
+    # takže ho na chvíľu zahodíme a súhrn prepočítame raz na konci
+    trigger_sql = next(
+        st for m in MIGRATIONS for st in m.statements if "trg_attendance_summary_ins" in st
+    )
+    conn.execute("DROP TRIGGER trg_attendance_summary_ins")
+    conn.executemany(
+        "INSERT INTO attendance(event_id, user_id, status) VALUES (?, ?, ?)",
+        (
+            (e, u, rnd.choice(statuses))
+            for e in event_ids
+            for u in player_ids
+            if rnd.random() < fill
+        ),
+    )
+    conn.execute(trigger_sql)
+    conn.executemany(
+        "INSERT INTO items(name, description, price) VALUES (?, ?, ?)",
+        ((f"Položka {i}", "Dres / lopta / poplatok", round(rnd.uniform(1, 100), 2)) for i in range(items)),
+    )
+    conn.execute("DELETE FROM event_attendance_summary")
+    conn.execute("INSERT INTO event_attendance_summary SELECT * FROM v_event_attendance")
+    conn.commit()
+    conn.close()
+    return path
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("path")
+    ap.add_argument("--players", type=int, default=60)
+    ap.add_argument("--events", type=int, default=1500)
+    ap.add_argument("--fill", type=float, default=0.8)
+    ap.add_argument("--items", type=int, default=0)
+    args = ap.parse_args()
+    build(args.path, players=args.players, events=args.events, fill=args.fill, items=args.items)
+    print("OK", args.path)
@@ -0,0 +1,121 @@
+# benchmarks/write_burst.py
+"""
+Nárazové zápisy (RSVP, úpravy udalostí) súbežne s ťažkými reportmi.
+
+Porovná bežný režim (každé spojenie zapisuje samo) s RW splitom
+(read-only pool + jeden serializovaný zapisovač): počet `database is
+locked` chýb, zápisy/s a latenciu zápisu.
+
+    python -m benchmarks.write_burst --writers 32 --writes 200
+"""
+from __future__ import annotations
+
+import json
+import os
+import random
+import sqlite3
+import statistics
+import threading
+import time
+
+from benchmarks._harness import argparser, emit, run_child
+
+DB_PATH = "/tmp/teamhub_bench_write_burst.db"
+
+
+def _child(writers: int, writes: int, readers: int) -> dict:
+    from database.database import close_pool, open_read_connection
+    from services.attendance import AttendanceService
+    from services.events import EventsService
+
+    with open_read_connection() as conn:
+        event_ids = [r[0] for r in conn.execute("SELECT id FROM events")]
+        user_ids = [r[0] for r in conn.execute("SELECT id FROM users WHERE role = 'player'")]
+
+    latencies, locked, other = [], 0, 0
+    lock = threading.Lock()
+    stop_readers = threading.Event()
+
+    def writer(seed: int) -> None:
+        nonlocal locked, other
+        rnd = random.Random(seed)
+        for i in range(writes):
+            started = time.perf_counter()
+            try:
+                with open_read_connection() as conn:
+                    if i % 10 == 0:
+                        EventsService(conn).update_event(
+                            rnd.choice(event_ids), "training", "2030-01-01", "18:00", "19:30", "Ihrisko", f"w{seed}",
+                        )
+                    else:
+                        AttendanceService(conn).set_status(
+                            rnd.choice(event_ids), rnd.choice(user_ids), rnd.choice(("yes", "no", "unknown")),
+                        )
+            except sqlite3.OperationalError as e:
+                with lock:
+                    if "locked" in str(e):
+                        locked += 1
+                    else:
+                        other += 1
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    def reader() -> None:
+        while not stop_readers.is_set():
+            with open_read_connection() as conn:
+                AttendanceService(conn).get_players_training_summary()
+
+    readers_t = [threading.Thread(target=reader) for _ in range(readers)]
+    writers_t = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    started = time.perf_counter()
+    for t in readers_t + writers_t:
+        t.start()
+    for t in writers_t:
+        t.join()
+    elapsed = time.perf_counter() - started
+    stop_readers.set()
+    for t in readers_t:
+        t.join()
+    close_pool()
+
+    latencies.sort()
+    return {
+        "mode": "rw-split" if os.environ.get("TEAMHUB_DB_RW_SPLIT") == "1" else "default",
+        "ok": len(latencies),
+        "locked": locked,
+        "other_errors": other,
+        "writes_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2) if latencies else 0.0,
+        "p99_ms": round(latencies[int(0.99 * (len(latencies) - 1))] * 1000, 2) if latencies else 0.0,
+    }
+
+
+def main() -> None:
+    ap = argparser()
+    ap.add_argument("--writers", type=int, default=32)
+    ap.add_argument("--writes", type=int, default=200)
+    ap.add_argument("--readers", type=int, default=2)
+    args = ap.parse_args()
+
+    if args.child:
+        emit(_child(args.writers, args.writes, args.readers))
+        return
+
+    from benchmarks.synthetic_db import build
+
+    results = []
+    for split in ("0", "1"):
+        build(DB_PATH, players=60, events=600)
+        results.append(run_child("benchmarks.write_burst",
+                                 ["--writers", args.writers, "--writes", args.writes, "--readers", args.readers],
+                                 TEAMHUB_DB_PATH=DB_PATH, TEAMHUB_DB_RW_SPLIT=split,
+                                 TEAMHUB_DB_POOL_SIZE=str(args.writers + args.readers)))
+
+    print(f"{args.writers} zapisovačov × {args.writes} zápisov, {args.readers} čitatelia reportov")
+    for r in results:
+        print(json.dumps(r))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Build statických súborov: static/ -> static/dist (odtlačky, .gz/.br, obrázky).
+
+Spustiť pri deployi pred štartom aplikácie; manifest sa načíta pri štarte.
+Brotli a zmenšené obrázky len ak sú nainštalované `brotli` a `Pillow`.
+
+    python build_assets.py           # build
+    python build_assets.py --clean   # aj zmazať súbory starších buildov
+"""
+import argparse
+
+import config
+from static_assets import Image, brotli, build
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--static-dir", default=config.STATIC_DIR)
+    ap.add_argument("--clean", action="store_true", help="zmazať súbory, ktoré nový manifest nepozná")
+    args = ap.parse_args()
+
+    if brotli is None:
+        print("POZOR: bez balíka brotli – len .gz varianty")
+    if Image is None:
+        print("POZOR: bez Pillow – obrázky sa nezmenšia ani neprevedú na WebP/AVIF")
+
+    manifest = build(args.static_dir, clean=args.clean)
+    for path, entry in manifest["assets"].items():
+        sizes = " ".join(f"{enc}={entry[f'{enc}_size']}" for enc in entry["encodings"])
+        print(f"{path:24s} {entry['size']:8d} B -> {entry['file']}  {sizes}")
+        for mime, variants in entry.get("images", {}).items():
+            print(f"{'':24s} {mime:10s} " + ", ".join(f"{w}px={size} B" for w, _, size in variants))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Kalibrácia ceny bcryptu na tomto stroji.
+
+Zmeria hash pre rounds od --min-rounds nahor (každé kolo = 2x dlhšie)
+a vyberie najvyššie, ktorého medián sa zmestí do rozpočtu
+(TEAMHUB_BCRYPT_BUDGET_MS, alebo --budget-ms). Výsledok treba nastaviť
+ako TEAMHUB_BCRYPT_ROUNDS v prostredí aplikácie; existujúce hashe sa
+prepočítajú pri najbližšom prihlásení.
+
+    python calibrate_bcrypt.py                 # kalibrácia
+    python calibrate_bcrypt.py --budget-ms 150
+    python calibrate_bcrypt.py --report        # rozdelenie cien v tabuľke users
+"""
+import argparse
+import json
+import statistics
+import time
+from typing import List, Tuple
+
+from passlib.hash import bcrypt
+
+import config
+
+# bcrypt pod 10 je dnes príliš lacný, nad 16 neprejde žiadny rozumný rozpočet
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+
+
+def measure(rounds: int, samples: int) -> float:
+    """Medián času jedného hashu v ms."""
+    handler = bcrypt.using(rounds=rounds)
+    times: List[float] = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        handler.hash("calibration-password")
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+def calibrate(budget_ms: float, samples: int, min_rounds: int, max_rounds: int) -> Tuple[int, List[Tuple[int, float]]]:
+    measured: List[Tuple[int, float]] = []
+    chosen = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        ms = measure(rounds, samples)
+        measured.append((rounds, ms))
+        if ms > budget_ms:
+            break  # vyššie kolá sú už len dvojnásobky
+        chosen = rounds
+    return chosen, measured
+
+
+def report() -> None:
+    from database.database import close_pool
+    from services.auth import AuthService
+
+    print(json.dumps(AuthService().password_cost_report(), indent=2))
+    close_pool()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--budget-ms", type=float, default=config.BCRYPT_BUDGET_MS)
+    ap.add_argument("--samples", type=int, default=3)
+    ap.add_argument("--min-rounds", type=int, default=MIN_ROUNDS)
+    ap.add_argument("--max-rounds", type=int, default=MAX_ROUNDS)
+    ap.add_argument("--report", action="store_true", help="len rozdelenie cien hashov v DB")
+    args = ap.parse_args()
+
+    if args.report:
+        report()
+        return
+
+    chosen, measured = calibrate(args.budget_ms, args.samples, args.min_rounds, args.max_rounds)
+    for rounds, ms in measured:
+        mark = "<- vybrané" if rounds == chosen else ("" if ms <= args.budget_ms else "nad rozpočet")
+        print(f"rounds={rounds:2d}  {ms:8.1f} ms  {mark}")
+    if measured[0][1] > args.budget_ms:
+        print(f"POZOR: ani rounds={args.min_rounds} sa nezmestí do {args.budget_ms:.0f} ms")
+    print(f"aktuálne TEAMHUB_BCRYPT_ROUNDS={config.BCRYPT_ROUNDS}")
+    print(f"TEAMHUB_BCRYPT_ROUNDS={chosen}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+# app/compression.py
+"""
+Kompresia odpovedí (gzip / brotli) ako čistý ASGI middleware.
+
+HTML tabuľky (/events, /players, /admin/users) sa veľmi opakujú a gzip ich
+zmenší na zlomok – na mobilných dátach je to rozdiel, ktorý hráč pocíti.
+Komprimuje sa, len ak:
+
+- klient kódovanie prijíma (Accept-Encoding) a je v TEAMHUB_COMPRESSION_ALGORITHMS
+  (poradie = preferencia; "br" len s nainštalovaným balíkom brotli)
+- typ obsahu je v allow-liste (TEAMHUB_COMPRESSION_TYPES) – obrázky,
+  application/gzip exporty a pod. nie
+- odpoveď ešte nemá Content-Encoding (vopred skomprimované statické súbory)
+- nejde o presmerovanie, 204/206/304 ani HEAD a telo má aspoň
+  TEAMHUB_COMPRESSION_MIN_SIZE bajtov
+
+Streamované odpovede (StreamingResponse, TEAMHUB_STREAM_HTML) sa komprimujú
+priebežne a každý kus sa hneď flushne – hlavička stránky dorazí do
+prehliadača rovnako skoro ako bez kompresie.
+
+Skomprimovaná odpoveď dostane slabý ETag (W/...): silný ETag identity
+odpovede by inak zdieľali dve rôzne telá. If-None-Match so slabým ETagom
+StaticFiles aj tak porovná (W/ odstráni), takže 304 funguje ďalej.
+
+Úroveň vyberať podľa benchmarks/compression.py (CPU vs. ušetrené bajty
+na našich šablónach).
+"""
+from __future__ import annotations
+
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+import config
+
+try:
+    import brotli
+except ImportError:  # brotli je voliteľné – bez neho len gzip
+    brotli = None
+
+
+def pick_encoding(accept_encoding: str, available: Sequence[str]) -> Optional[str]:
+    """Prvé kódovanie z `available` (poradie = preferencia), ktoré klient prijíma (q > 0)."""
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    for encoding in available:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+class _Gzip:
+    def __init__(self, level: int) -> None:
+        # wbits=31 = gzip hlavička a pätička, nie holý zlib
+        self._c = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._c.flush()
+
+
+class _Brotli:
+    def __init__(self, quality: int) -> None:
+        self._c = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.process(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush()
+
+    def finish(self) -> bytes:
+        return self._c.finish()
+
+
+def compressor(encoding: str, level: int) -> Any:
+    """Prúdový kompresor: compress() / flush() po kuse streamu / finish() na konci."""
+    return _Gzip(level) if encoding == "gzip" else _Brotli(level)
+
+
+class CompressionStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._compressed: Dict[str, int] = {}
+        self._skipped: Dict[str, int] = {}
+        self._streamed = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+        self._seconds = 0.0
+
+    def compressed(self, encoding: str, streamed: bool) -> None:
+        with self._lock:
+            self._compressed[encoding] = self._compressed.get(encoding, 0) + 1
+            self._streamed += streamed
+
+    def skipped(self, reason: str) -> None:
+        with self._lock:
+            self._skipped[reason] = self._skipped.get(reason, 0) + 1
+
+    def bytes(self, bytes_in: int, bytes_out: int, seconds: float) -> None:
+        with self._lock:
+            self._bytes_in += bytes_in
+            self._bytes_out += bytes_out
+            self._seconds += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "compressed": dict(self._compressed),
+                "streamed": self._streamed,
+                "skipped": dict(self._skipped),
+                "bytes_in": self._bytes_in,
+                "bytes_out": self._bytes_out,
+                "ratio": round(self._bytes_out / self._bytes_in, 4) if self._bytes_in else None,
+                "cpu_ms": round(self._seconds * 1000, 3),
+                "mb_per_s": round(self._bytes_in / self._seconds / 1e6, 1) if self._seconds else None,
+            }
+
+
+compression_stats = CompressionStats()
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        algorithms: Optional[Sequence[str]] = None,
+        gzip_level: Optional[int] = None,
+        br_quality: Optional[int] = None,
+        min_size: Optional[int] = None,
+        content_types: Optional[Sequence[str]] = None,
+    ) -> None:
+        self.app = app
+        algorithms = config.COMPRESSION_ALGORITHMS if algorithms is None else algorithms
+        self.algorithms = [a for a in algorithms if a == "gzip" or (a == "br" and brotli is not None)]
+        self.levels = {
+            "gzip": config.COMPRESSION_GZIP_LEVEL if gzip_level is None else gzip_level,
+            "br": config.COMPRESSION_BR_QUALITY if br_quality is None else br_quality,
+        }
+        self.min_size = config.COMPRESSION_MIN_SIZE if min_size is None else min_size
+        self.content_types = frozenset(config.COMPRESSION_TYPES if content_types is None else content_types)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD" or not self.algorithms:
+            await self.app(scope, receive, send)
+            return
+        encoding = pick_encoding(Headers(scope=scope).get("accept-encoding", ""), self.algorithms)
+        await self.app(scope, receive, _Responder(self, encoding, send).send)
+
+    def skip_reason(self, status: int, headers: MutableHeaders) -> Optional[str]:
+        if status < 200 or 300 <= status < 400 or status in (204, 206):
+            return "status"  # presmerovania, 304 a pod. nemajú čo komprimovať
+        if "content-encoding" in headers:
+            return "encoded"
+        if headers.get("content-type", "").split(";")[0].strip().lower() not in self.content_types:
+            return "type"
+        if "no-transform" in headers.get("cache-control", ""):
+            return "no_transform"
+        return None
+
+
+class _Responder:
+    """send() jednej odpovede: http.response.start podrží do prvého kusu tela."""
+
+    def __init__(self, mw: CompressionMiddleware, encoding: Optional[str], send: Send) -> None:
+        self.mw = mw
+        self.encoding = encoding
+        self._send = send
+        self.start: Optional[Message] = None
+        self.compressor: Any = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        kind = message["type"]
+        if kind == "http.response.start":
+            self.start = message
+            return
+        if kind != "http.response.body" or self.passthrough:
+            # napr. http.response.debug (pred štartom) – ten na rozhodnutie nemá vplyv
+            if self.start is not None:
+                await self._flush_start()
+                self.passthrough = True
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more = message.get("more_body", False)
+        if self.compressor is not None:
+            # ďalší kus streamu
+            started = time.perf_counter()
+            out = self.compressor.compress(body) + (self.compressor.flush() if more else self.compressor.finish())
+            compression_stats.bytes(len(body), len(out), time.perf_counter() - started)
+            await self._send({"type": "http.response.body", "body": out, "more_body": more})
+            return
+
+        start = self.start
+        headers = MutableHeaders(scope=start)
+        reason = self.mw.skip_reason(start["status"], headers)
+        if reason is None:
+            if self.encoding is None:
+                reason = "not_accepted"
+            elif not more and len(body) < self.mw.min_size:
+                reason = "small"
+            elif more and int(headers.get("content-length", self.mw.min_size)) < self.mw.min_size:
+                reason = "small"
+            if reason is not None:
+                # obsah by sa komprimoval, keby klient / veľkosť dovolili
+                headers.add_vary_header("Accept-Encoding")
+        if reason is not None:
+            compression_stats.skipped(reason)
+            self.passthrough = True
+            await self._flush_start()
+            await self._send(message)
+            return
+
+        started = time.perf_counter()
+        c = compressor(self.encoding, self.mw.levels[self.encoding])
+        if more:
+            out = c.compress(body) + c.flush()
+            self.compressor = c
+            del headers["content-length"]  # dĺžka sa vopred nevie
+        else:
+            out = c.compress(body) + c.finish()
+            headers["content-length"] = str(len(out))
+        compression_stats.bytes(len(body), len(out), time.perf_counter() - started)
+        compression_stats.compressed(self.encoding, streamed=more)
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # iné bajty ako identity odpoveď – silný ETag by zdieľali obe verzie
+            headers["etag"] = "W/" + etag
+        await self._flush_start()
+        await self._send({"type": "http.response.body", "body": out, "more_body": more})
+
+    async def _flush_start(self) -> None:
+        start, self.start = self.start, None
+        if start is not None:
+            await self._send(start)
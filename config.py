@@ -0,0 +1,194 @@
+# app/config.py
+# Nastavenia aplikácie – všetko sa dá prepísať cez premenné prostredia.
+import os
+
+BASE_DIR = os.path.dirname(os.path.realpath(__file__))
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.environ.get(name, default))
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    return os.environ.get(name, "1" if default else "0").lower() in ("1", "true", "yes", "on")
+
+
+# ---------- DATABÁZA ----------
+
+DATABASE_PATH = os.environ.get(
+    "TEAMHUB_DB_PATH",
+    os.path.join(BASE_DIR, "database", "database.db"),
+)
+
+# max. počet otvorených spojení v poole
+DB_POOL_SIZE = _env_int("TEAMHUB_DB_POOL_SIZE", 8)
+# koľko spojení sa otvorí hneď pri štarte (warm-up)
+DB_POOL_MIN_SIZE = _env_int("TEAMHUB_DB_POOL_MIN_SIZE", 2)
+# ako dlho (s) čakať na voľné spojenie, kým to vzdáme
+DB_POOL_TIMEOUT = _env_float("TEAMHUB_DB_POOL_TIMEOUT", 10.0)
+# spojenie nečinné dlhšie ako toto (s) sa pred použitím overí cez SELECT 1
+DB_POOL_HEALTH_CHECK_AFTER = _env_float("TEAMHUB_DB_POOL_HEALTH_CHECK_AFTER", 30.0)
+# requesty čítajú z read-only poolu, všetky zápisy idú cez jeden zapisovač
+DB_RW_SPLIT = _env_bool("TEAMHUB_DB_RW_SPLIT")
+# pri štarte aplikácie dobehnúť chýbajúce migrácie schémy
+DB_AUTO_MIGRATE = _env_bool("TEAMHUB_DB_AUTO_MIGRATE", True)
+
+# ---------- SESSION ----------
+
+# "sqlite" = zdieľané všetkými workermi (prežije reštart), "memory" = len v procese,
+# "signed" = bez úložiska: identita je v podpísanej cookie (itsdangerous)
+SESSION_BACKEND = os.environ.get("TEAMHUB_SESSION_BACKEND", "sqlite")
+# vlastný súbor, aby sa session zápisy nebili so zapisovačom hlavnej DB
+SESSION_DB_PATH = os.environ.get(
+    "TEAMHUB_SESSION_DB_PATH",
+    os.path.splitext(DATABASE_PATH)[0] + "-sessions.db",
+)
+# session bez požiadavky dlhšie ako toto (s) vyprší
+SESSION_IDLE_TTL = _env_float("TEAMHUB_SESSION_IDLE_TTL", 12 * 3600)
+# a najneskôr toto (s) po prihlásení bez ohľadu na aktivitu
+SESSION_ABSOLUTE_TTL = _env_float("TEAMHUB_SESSION_ABSOLUTE_TTL", 7 * 24 * 3600)
+# LRU cache session v procese pred SQLite (počet záznamov)
+SESSION_CACHE_SIZE = _env_int("TEAMHUB_SESSION_CACHE_SIZE", 10000)
+# ako dlho (s) veriť záznamu v cache – odhlásenie na inom workeri sa prejaví najneskôr po tomto čase
+SESSION_CACHE_TTL = _env_float("TEAMHUB_SESSION_CACHE_TTL", 5.0)
+# last_seen sa do DB zapíše najviac raz za toto (s), nie pri každej požiadavke
+SESSION_TOUCH_INTERVAL = _env_float("TEAMHUB_SESSION_TOUCH_INTERVAL", 60.0)
+# ako často (s) mazať vypršané session na pozadí
+SESSION_SWEEP_INTERVAL = _env_float("TEAMHUB_SESSION_SWEEP_INTERVAL", 300.0)
+# počet zámkov (pruhov); session sa rozdelia podľa hash(session_id)
+SESSION_LOCK_STRIPES = _env_int("TEAMHUB_SESSION_LOCK_STRIPES", 16)
+# kľúč na podpis cookie; TEAMHUB_SESSION_BACKEND=signed s predvoleným "dev-secret" nenaštartuje
+SESSION_SECRET = os.environ.get("TEAMHUB_SESSION_SECRET", "dev-secret")
+# ako často (s) si worker načíta odvolania (zmeny hesla) z iných workerov
+SESSION_REVOCATION_REFRESH = _env_float("TEAMHUB_SESSION_REVOCATION_REFRESH", 5.0)
+
+# ---------- DB EXECUTOR (async handlery) ----------
+
+# vypnuté = SQLite beží priamo v event loope (pôvodné správanie, na porovnanie)
+DB_EXECUTOR_ENABLED = _env_bool("TEAMHUB_DB_EXECUTOR", True)
+# vlákna na SQLite prácu; viac ako DB_POOL_SIZE nemá zmysel
+DB_EXECUTOR_WORKERS = _env_int("TEAMHUB_DB_EXECUTOR_WORKERS", DB_POOL_SIZE)
+# max. rozpracovaných úloh; ďalšie čakajú v event loope
+DB_EXECUTOR_MAX_PENDING = _env_int("TEAMHUB_DB_EXECUTOR_MAX_PENDING", 64)
+
+# ---------- HESLÁ (bcrypt) ----------
+
+# procesy na bcrypt (hash/verify); 0 = na DB executore ako predtým (na porovnanie).
+# Pri uvicorn --workers N má každý worker vlastný pool – zvyčajne stačí jadrá / N.
+PASSWORD_POOL_WORKERS = _env_int("TEAMHUB_PASSWORD_POOL_WORKERS", os.cpu_count() or 1)
+# koľko ďalších hashovaní môže čakať; nad limit = hneď 503
+PASSWORD_QUEUE_SIZE = _env_int("TEAMHUB_PASSWORD_QUEUE_SIZE", 16)
+# cena bcryptu (2^rounds); hodnotu pre daný stroj vyberie `python calibrate_bcrypt.py`.
+# Staršie hashe s inou cenou sa prepočítajú pri najbližšom úspešnom prihlásení.
+BCRYPT_ROUNDS = _env_int("TEAMHUB_BCRYPT_ROUNDS", 12)
+# rozpočet na jeden hash pri kalibrácii (ms) – z cieľovej latencie prihlásenia
+BCRYPT_BUDGET_MS = _env_float("TEAMHUB_BCRYPT_BUDGET_MS", 250.0)
+
+# ---------- RSVP GROUP COMMIT ----------
+
+# RSVP, ktoré prídu v rámci okna, sa zapíšu jednou transakciou
+RSVP_GROUP_COMMIT = _env_bool("TEAMHUB_RSVP_GROUP_COMMIT", True)
+RSVP_BATCH_WINDOW_MS = _env_float("TEAMHUB_RSVP_BATCH_WINDOW_MS", 5.0)
+RSVP_MAX_BATCH = _env_int("TEAMHUB_RSVP_MAX_BATCH", 256)
+
+# ---------- UDALOSTI ----------
+
+# koľko udalostí je na jednej strane /events (keyset stránkovanie)
+EVENTS_PAGE_SIZE = _env_int("TEAMHUB_EVENTS_PAGE_SIZE", 50)
+# koľko udalostí (stĺpcov) má mriežka hromadnej dochádzky
+ATTENDANCE_GRID_EVENTS = _env_int("TEAMHUB_ATTENDANCE_GRID_EVENTS", 10)
+# LRU cache vyrenderovaných riadkov tabuľky /events (počet fragmentov; 0 = vypnutá)
+EVENT_ROW_CACHE_SIZE = _env_int("TEAMHUB_EVENT_ROW_CACHE_SIZE", 5000)
+
+# ---------- MATICA DOCHÁDZKY ----------
+
+# súhrny /players a /me z matice v pamäti (zápisy iných workerov zachytí data_version)
+ATTENDANCE_MATRIX = _env_bool("TEAMHUB_ATTENDANCE_MATRIX", True)
+# začiatok sezóny (MM-DD) pre "účasť v sezóne" na /attendance/stats a /me
+SEASON_START = os.getenv("TEAMHUB_SEASON_START", "08-01")
+# kĺzavé okno pre "účasť za posledné týždne"
+TREND_WINDOW_DAYS = _env_int("TEAMHUB_TREND_WINDOW_DAYS", 28)
+
+# ---------- ŠABLÓNY (Jinja2) ----------
+
+# pri každom renderi kontrolovať, či sa súbor šablóny nezmenil – len pri vývoji
+TEMPLATES_AUTO_RELOAD = _env_bool("TEAMHUB_TEMPLATES_AUTO_RELOAD")
+# skompilované šablóny na disku, zdieľané workermi aj reštartmi
+TEMPLATE_BYTECODE_CACHE = _env_bool("TEAMHUB_TEMPLATE_BYTECODE_CACHE", True)
+# "" = predvolený adresár Jinja2 (v /tmp, vlastný pre každého používateľa)
+TEMPLATE_CACHE_DIR = os.environ.get("TEAMHUB_TEMPLATE_CACHE_DIR", "")
+# pri štarte načítať všetky šablóny, prvý request už nekompiluje
+TEMPLATE_WARM_UP = _env_bool("TEAMHUB_TEMPLATE_WARM_UP", True)
+# /events, /players a /me streamovať (generate_async) – hlavička ide hneď, riadky po dávkach;
+# async render Jinja2 stojí zhruba 2x viac CPU, takže celkový čas stránky mierne narastie
+STREAM_HTML = _env_bool("TEAMHUB_STREAM_HTML")
+# koľko riadkov sa pri streamovaní načíta z kurzora naraz (jeden skok na DB executor)
+STREAM_HTML_BATCH = _env_int("TEAMHUB_STREAM_HTML_BATCH", 100)
+
+# ---------- STATICKÉ SÚBORY ----------
+
+# zdrojové súbory; build_assets.py z nich robí static/dist (odtlačky, .gz/.br, obrázky)
+STATIC_DIR = os.getenv("TEAMHUB_STATIC_DIR", "static")
+# používať static/dist/manifest.json (0 = vždy pôvodné súbory, napr. pri úprave CSS)
+STATIC_FINGERPRINT = _env_bool("TEAMHUB_STATIC_FINGERPRINT", True)
+# súbory s odtlačkom v názve sa nikdy nemenia – prehliadač ich nemusí overovať
+STATIC_MAX_AGE = _env_int("TEAMHUB_STATIC_MAX_AGE", 365 * 24 * 3600)
+
+# ---------- KOMPRESIA ODPOVEDÍ ----------
+
+COMPRESSION = _env_bool("TEAMHUB_COMPRESSION", True)
+# poradie = preferencia, ak klient vie oboje; "br" len s nainštalovaným balíkom brotli
+COMPRESSION_ALGORITHMS = [
+    a.strip() for a in os.getenv("TEAMHUB_COMPRESSION_ALGORITHMS", "br,gzip").split(",") if a.strip()
+]
+# úrovne podľa benchmarks/compression.py: gzip 3 a br 4 sú "koleno" – vyššie úrovne
+# ušetria pod 1 KiB na stránku za 2x a viac CPU
+COMPRESSION_GZIP_LEVEL = _env_int("TEAMHUB_COMPRESSION_GZIP_LEVEL", 3)
+COMPRESSION_BR_QUALITY = _env_int("TEAMHUB_COMPRESSION_BR_QUALITY", 4)
+# menšie telá sa nekomprimujú (hlavičky gzipu + CPU za pár ušetrených bajtov)
+COMPRESSION_MIN_SIZE = _env_int("TEAMHUB_COMPRESSION_MIN_SIZE", 1024)
+COMPRESSION_TYPES = [
+    t.strip() for t in os.getenv(
+        "TEAMHUB_COMPRESSION_TYPES",
+        "text/html,text/css,text/plain,text/csv,text/javascript,application/javascript,"
+        "application/json,application/x-ndjson,image/svg+xml",
+    ).split(",") if t.strip()
+]
+
+# ---------- JSON API (/api/v1) ----------
+
+# predvolená a maximálna veľkosť strany (?limit=) pri kurzorovom stránkovaní
+API_PAGE_SIZE = _env_int("TEAMHUB_API_PAGE_SIZE", 100)
+API_MAX_PAGE_SIZE = _env_int("TEAMHUB_API_MAX_PAGE_SIZE", 500)
+
+# ---------- EXPORT DOCHÁDZKY ----------
+
+# export drží spojenie celý čas sťahovania – má vlastné, mimo DB_POOL_SIZE
+# (pomalí klienti nezaberú spojenia stránkam); koľko exportov naraz
+EXPORT_MAX_CONCURRENT = _env_int("TEAMHUB_EXPORT_MAX_CONCURRENT", 2)
+# ako dlho (s) čakať na voľný export, potom 503
+EXPORT_WAIT = _env_float("TEAMHUB_EXPORT_WAIT", 2.0)
+
+# ---------- ŠTART WORKERA ----------
+
+# stránky (pages/*), Jinja a procesy na bcrypt až pri prvom použití (startup.py):
+# worker naštartuje rýchlejšie, prvý request na danú časť webu zaplatí import;
+# TEMPLATE_WARM_UP sa vtedy nerobí
+LAZY_STARTUP = _env_bool("TEAMHUB_LAZY_STARTUP")
+# vypísať zaregistrované cesty pri štarte (debug)
+PRINT_ROUTES = _env_bool("TEAMHUB_PRINT_ROUTES")
+
+# ---------- SQL PROFILER ----------
+
+# zbiera štatistiky dotazov (/admin/queries); vypnutý = nulová réžia
+QUERY_PROFILER = _env_bool("TEAMHUB_QUERY_PROFILER")
+# dotazy pomalšie ako toto (ms) sa označia ako pomalé + EXPLAIN QUERY PLAN
+QUERY_SLOW_MS = _env_float("TEAMHUB_QUERY_SLOW_MS", 50.0)
+# každý SQL príkaz do loggera "teamhub.sql" (DEBUG) – náhrada za print
+SQL_ECHO = _env_bool("TEAMHUB_SQL_ECHO")
+# hlavičky X-DB-Connections / X-DB-Statements v každej odpovedi (súhrn je vždy na /admin/db/requests)
+REQUEST_DB_HEADERS = _env_bool("TEAMHUB_REQUEST_DB_HEADERS")
@@ -1,23 +1,137 @@
+import pathlib
 import sqlite3
 from contextlib import contextmanager
-from typing import Iterator
-import os
+from threading import Lock
+from typing import Iterator, Optional
 
-@contextmanager
-def open_connection() -> Iterator[sqlite3.Connection]:
-    current_dir = os.path.dirname(os.path.realpath(__file__))
-    database_path = os.path.join(current_dir, 'database.db')
+import config
+from database.pool import ConnectionPool
+from database.profiler import (
+    InstrumentedConnection,
+    add_observer,
+    instrumentation_active,
+    log_query,
+    query_profiler,
+)
+from database.writer import SerializedWriter
+
+_pool: Optional[ConnectionPool] = None
+_read_pool: Optional[ConnectionPool] = None
+_export_pool: Optional[ConnectionPool] = None
+_writer: Optional[SerializedWriter] = None
+_pool_lock = Lock()
+
+if config.QUERY_PROFILER:
+    query_profiler.slow_ms = config.QUERY_SLOW_MS
+    add_observer(query_profiler)
+if config.SQL_ECHO:
+    add_observer(log_query)
+
+
+def create_connection(read_only: bool = False) -> sqlite3.Connection:
+    """Nové, plne nakonfigurované spojenie. PRAGMA sa nastavia len raz, pri vytvorení."""
+    if read_only:
+        target, uri = pathlib.Path(config.DATABASE_PATH).resolve().as_uri() + "?mode=ro", True
+    else:
+        target, uri = config.DATABASE_PATH, False
     conn = sqlite3.connect(
-        database_path,
+        target,
+        uri=uri,
         detect_types=sqlite3.PARSE_DECLTYPES,
         check_same_thread=False,   # povolí použití v jiném vlákně
+        # meriame len ak niekto počúva (profiler / SQL echo), inak čisté sqlite3
+        factory=InstrumentedConnection if instrumentation_active() else sqlite3.Connection,
     )
     conn.row_factory = sqlite3.Row
-    conn.set_trace_callback(print)
     conn.execute("PRAGMA foreign_keys = ON")
-    conn.execute("PRAGMA journal_mode = WAL")
+    if read_only:
+        conn.execute("PRAGMA query_only = ON")
+    else:
+        conn.execute("PRAGMA journal_mode = WAL")
+    return conn
+
+
+def create_read_connection() -> sqlite3.Connection:
+    return create_connection(read_only=True)
+
+
+def _new_pool(factory) -> ConnectionPool:
+    return ConnectionPool(
+        factory,
+        max_size=config.DB_POOL_SIZE,
+        min_size=config.DB_POOL_MIN_SIZE,
+        timeout=config.DB_POOL_TIMEOUT,
+        health_check_after=config.DB_POOL_HEALTH_CHECK_AFTER,
+    )
+
+
+def get_pool() -> ConnectionPool:
+    """Read-write pool (migrácie, CLI skripty, a bez RW splitu aj requesty)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = _new_pool(create_connection)
+        return _pool
+
 
-    try:
+def get_read_pool() -> ConnectionPool:
+    """Pool pre requesty: pri RW splite read-only spojenia, inak ten istý ako get_pool()."""
+    global _read_pool
+    if not config.DB_RW_SPLIT:
+        return get_pool()
+    with _pool_lock:
+        if _read_pool is None:
+            _read_pool = _new_pool(create_read_connection)
+        return _read_pool
+
+
+def get_export_pool() -> ConnectionPool:
+    """Malý samostatný pool pre exporty (spojenie sa drží počas celého sťahovania)."""
+    global _export_pool
+    with _pool_lock:
+        if _export_pool is None:
+            _export_pool = ConnectionPool(
+                create_read_connection if config.DB_RW_SPLIT else create_connection,
+                max_size=config.EXPORT_MAX_CONCURRENT,
+                timeout=config.EXPORT_WAIT,
+                health_check_after=config.DB_POOL_HEALTH_CHECK_AFTER,
+            )
+        return _export_pool
+
+
+def get_writer() -> Optional[SerializedWriter]:
+    """Jediný zapisovač pri RW splite; bez splitu None (zapisuje sa cez conn requestu)."""
+    global _writer
+    if not config.DB_RW_SPLIT:
+        return None
+    with _pool_lock:
+        if _writer is None:
+            _writer = SerializedWriter(create_connection)
+        return _writer
+
+
+def close_pool() -> None:
+    global _pool, _read_pool, _export_pool, _writer
+    with _pool_lock:
+        pools = [_pool, _read_pool, _export_pool]
+        writer = _writer
+        _pool = _read_pool = _export_pool = _writer = None
+    if writer is not None:
+        writer.close()
+    for pool in pools:
+        if pool is not None:
+            pool.close()
+
+
+@contextmanager
+def open_connection() -> Iterator[sqlite3.Connection]:
+    """Požičia read-write spojenie z poolu a po skončení ho vráti (nezatvára ho)."""
+    with get_pool().connection() as conn:
+        yield conn
+
+
+@contextmanager
+def open_read_connection() -> Iterator[sqlite3.Connection]:
+    """Spojenie pre request – zápisy z neho idú cez @writes repository funkcie."""
+    with get_read_pool().connection() as conn:
         yield conn
-    finally:
-        conn.close()
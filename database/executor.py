@@ -0,0 +1,226 @@
+# app/database/executor.py
+"""
+Blokujúci sqlite3 kód mimo event loopu.
+
+`run_db(fn, *args)` spustí funkciu na vyhradenom, ohraničenom thread poole
+a vráti awaitable. Async handlery tak nečakajú na SQLite priamo v event
+loope a pomalý dotaz nezablokuje ostatné requesty na workeri.
+
+Služby majú `svc.aio.<metoda>(...)` – to isté ako `svc.<metoda>(...)`,
+len awaitable a bežiace na tomto executore.
+
+Vlákno executora nikdy nečaká na spojenie z poolu: executor má toľko
+vlákien ako pool spojení, takže úlohy čakajúce na spojenie by obsadili
+všetky vlákna, kým requesty držiace spojenia čakajú na voľné vlákno.
+Kód, ktorý si spojenie berie sám (služba bez `conn`), preto ide cez
+`run_db_pooled` – spojenie sa požičia v event loope a úlohe sa len odovzdá.
+Blokujúci `pool.acquire()` vo vlákne executora hneď zlyhá (RuntimeError).
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, AsyncIterator, Callable, Dict, Generic, Iterator, List, Optional, TypeVar
+
+import config
+from database.pool import forbid_blocking_acquire
+
+T = TypeVar("T")
+S = TypeVar("S")
+
+
+class DbExecutor:
+    """
+    ThreadPoolExecutor s obmedzeným počtom rozpracovaných úloh (`max_pending`).
+    Keď je plný, ďalšie `run()` čakajú v event loope (nie vo fronte executora),
+    takže front sa nemôže nafúknuť donekonečna.
+    """
+
+    def __init__(self, workers: int, max_pending: int, enabled: bool = True) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.enabled = enabled
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = Lock()
+
+        self._pending = 0
+        self._running = 0
+        self._max_pending_seen = 0
+        self._submitted = 0
+        self._completed = 0
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        self._run_total = 0.0
+        self._run_max = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="db")
+            return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_pending)
+            self._slots_loop = loop
+        return self._slots
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        if not self.enabled:
+            # pôvodné správanie: blokujúco priamo v event loope
+            return fn(*args, **kwargs)
+
+        submitted = time.perf_counter()
+        async with self._get_slots():
+            with self._lock:
+                self._pending += 1
+                self._submitted += 1
+                self._max_pending_seen = max(self._max_pending_seen, self._pending)
+            try:
+                loop = asyncio.get_running_loop()
+                # kópia kontextu (ako asyncio.to_thread) – počítadlá requestu platia aj vo vlákne
+                context = contextvars.copy_context()
+                return await loop.run_in_executor(
+                    self._get_executor(),
+                    functools.partial(context.run, self._timed, submitted, fn, *args, **kwargs),
+                )
+            finally:
+                with self._lock:
+                    self._pending -= 1
+
+    def _timed(self, submitted: float, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        started = time.perf_counter()
+        with self._lock:
+            self._running += 1
+        try:
+            with forbid_blocking_acquire():
+                return fn(*args, **kwargs)
+        finally:
+            finished = time.perf_counter()
+            queue_wait, run = started - submitted, finished - started
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._queue_wait_total += queue_wait
+                self._queue_wait_max = max(self._queue_wait_max, queue_wait)
+                self._run_total += run
+                self._run_max = max(self._run_max, run)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            done = self._completed
+            return {
+                "enabled": self.enabled,
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "queued": self._pending - self._running,
+                "running": self._running,
+                "max_pending_seen": self._max_pending_seen,
+                "submitted": self._submitted,
+                "completed": done,
+                "queue_wait_mean_ms": round(self._queue_wait_total * 1000 / done, 3) if done else 0.0,
+                "queue_wait_max_ms": round(self._queue_wait_max * 1000, 3),
+                "run_mean_ms": round(self._run_total * 1000 / done, 3) if done else 0.0,
+                "run_max_ms": round(self._run_max * 1000, 3),
+            }
+
+
+db_executor = DbExecutor(
+    workers=config.DB_EXECUTOR_WORKERS,
+    max_pending=config.DB_EXECUTOR_MAX_PENDING,
+    enabled=config.DB_EXECUTOR_ENABLED,
+)
+
+
+async def run_db(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    return await db_executor.run(fn, *args, **kwargs)
+
+
+async def run_db_pooled(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """run_db pre kód, ktorý si spojenie berie z get_read_pool(): na spojenie sa čaká v event loope."""
+    from database.database import get_read_pool
+
+    pool = get_read_pool()
+    conn = await pool.acquire_async()
+    try:
+        with pool.lend(conn):
+            return await run_db(fn, *args, **kwargs)
+    finally:
+        pool.release(conn)
+
+
+_DONE = object()
+_NO_CONN = object()
+
+
+def _take(iterator: Iterator[T], size: int) -> List[T]:
+    return list(itertools.islice(iterator, size))
+
+
+async def iterate_db(iterator: Iterator[T], batch: int = 1) -> AsyncIterator[T]:
+    """
+    Blokujúci iterátor (napr. riadky z kurzora) ako async iterátor: každý
+    next() beží na DB executore. Keď sa prúd preruší (klient odišiel),
+    iterátor sa zavrie, aby vrátil spojenie do poolu.
+
+    batch > 1: na executor sa ide raz za `batch` položiek (riadky tabuľky),
+    nie za každú zvlášť.
+    """
+    try:
+        if batch > 1:
+            while True:
+                items = await run_db(_take, iterator, batch)
+                if not items:
+                    return
+                for item in items:
+                    yield item
+        while True:
+            item = await run_db(next, iterator, _DONE)
+            if item is _DONE:
+                return
+            yield item  # type: ignore[misc]
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await run_db(close)
+
+
+class AsyncProxy(Generic[S]):
+    """
+    `svc.aio.list_events()` -> awaitable `svc.list_events()` na DB executore.
+    Služba bez spojenia (conn=None) dostane spojenie požičané v event loope (run_db_pooled).
+    """
+
+    __slots__ = ("_target",)
+
+    def __init__(self, target: S) -> None:
+        self._target = target
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        method = getattr(self._target, name)
+        if not callable(method):
+            raise AttributeError(f"{name} nie je metóda")
+
+        if getattr(self._target, "conn", _NO_CONN) is None:
+            async def call(*args: Any, **kwargs: Any) -> Any:
+                return await run_db_pooled(method, *args, **kwargs)
+        else:
+            async def call(*args: Any, **kwargs: Any) -> Any:
+                return await run_db(method, *args, **kwargs)
+
+        return call
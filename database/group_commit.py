@@ -0,0 +1,184 @@
+# app/database/group_commit.py
+"""
+Group commit: zápisy, ktoré prídu v rozmedzí pár milisekúnd, sa spoja
+do jednej transakcie (jeden commit = jeden fsync namiesto N).
+
+- opakované zápisy pre ten istý kľúč sa zlúčia, vyhráva posledný
+- volajúci dostane Future, ktorý sa vyrieši až po commite (zápis je trvalý)
+- ak dávka zlyhá, zápisy sa skúsia po jednom, aby chyba jedného
+  (napr. zmazaná udalosť) neodmietla ostatných
+- vlákno má vlastné spojenie (`connect`), nepožičiava si ho z poolu –
+  requesty, ktoré čakajú na commit, môžu mať pool celý obsadený
+"""
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Sequence, Tuple
+
+_STOP = object()
+
+
+class GroupCommitQueue:
+    def __init__(
+        self,
+        apply_batch: Callable[[sqlite3.Connection, Sequence[Tuple]], None],
+        connect: Callable[[], sqlite3.Connection],
+        key: Callable[[Tuple], Hashable],
+        window_ms: float = 5.0,
+        max_batch: int = 256,
+        name: str = "group-commit",
+    ) -> None:
+        self._apply_batch = apply_batch
+        self._connect = connect
+        self._conn: Optional[sqlite3.Connection] = None
+        self._key = key
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.name = name
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self._submitted = 0
+        self._written = 0
+        self._collapsed = 0
+        self._batches = 0
+        self._failed = 0
+        self._max_batch_seen = 0
+        self._commit_total = 0.0
+        self._recent: Deque[Tuple[float, int]] = deque()  # (čas, zapísané riadky) za poslednú minútu
+        self._started_at = time.monotonic()
+
+    def submit(self, row: Tuple) -> Future:
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((row, future))
+        return future
+
+    def close(self) -> None:
+        """Dopíše všetko, čo je vo fronte, a zastaví vlákno."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            while self._recent and now - self._recent[0][0] > 60:
+                self._recent.popleft()
+            recent_rows = sum(n for _, n in self._recent)
+            window = min(60.0, max(now - self._started_at, 1e-9))
+            batches = self._batches
+            return {
+                "running": self._thread is not None,
+                "queue_depth": self._queue.qsize(),
+                "window_ms": self.window * 1000,
+                "submitted": self._submitted,
+                "written": self._written,
+                "collapsed": self._collapsed,
+                "batches": batches,
+                "failed": self._failed,
+                "batch_size_mean": round(self._written / batches, 2) if batches else 0.0,
+                "batch_size_max": self._max_batch_seen,
+                "commit_mean_ms": round(self._commit_total * 1000 / batches, 3) if batches else 0.0,
+                "writes_per_s_1m": round(recent_rows / window, 2),
+            }
+
+    # ---------- interné ----------
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _loop(self) -> None:
+        try:
+            self._run()
+        finally:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            stop = False
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+            if stop:
+                return
+
+    def _flush(self, batch: List[Tuple[Tuple, Future]]) -> None:
+        # posledný zápis pre kľúč vyhráva; poradie prvých výskytov zachováme
+        latest: Dict[Hashable, Tuple] = {}
+        for row, _ in batch:
+            latest[self._key(row)] = row
+        rows = list(latest.values())
+
+        started = time.perf_counter()
+        try:
+            self._apply(rows)
+            errors: Dict[Hashable, BaseException] = {}
+        except Exception:
+            errors = self._apply_one_by_one(rows)
+        elapsed = time.perf_counter() - started
+
+        for row, future in batch:
+            error = errors.get(self._key(row))
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(None)
+
+        written = len(rows) - len(errors)
+        with self._lock:
+            self._submitted += len(batch)
+            self._written += written
+            self._collapsed += len(batch) - len(rows)
+            self._failed += len(errors)
+            self._batches += 1
+            self._max_batch_seen = max(self._max_batch_seen, len(rows))
+            self._commit_total += elapsed
+            self._recent.append((time.monotonic(), written))
+
+    def _apply(self, rows: Sequence[Tuple]) -> None:
+        if self._conn is None:
+            self._conn = self._connect()
+        try:
+            self._apply_batch(self._conn, rows)
+        except Exception:
+            if self._conn.in_transaction:
+                self._conn.rollback()
+            raise
+
+    def _apply_one_by_one(self, rows: Sequence[Tuple]) -> Dict[Hashable, BaseException]:
+        errors: Dict[Hashable, BaseException] = {}
+        for row in rows:
+            try:
+                self._apply([row])
+            except Exception as e:
+                errors[self._key(row)] = e
+        return errors
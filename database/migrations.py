@@ -0,0 +1,356 @@
+# app/database/migrations.py
+"""
+Verzionované migrácie schémy. Aktuálna verzia je v `PRAGMA user_version`.
+
+Každá migrácia beží vo vlastnej transakcii (BEGIN IMMEDIATE) spolu so
+zvýšením user_version, takže sa buď aplikuje celá, alebo vôbec.
+Nové migrácie sa len pridávajú na koniec zoznamu, existujúce sa nemenia.
+
+    python -m database.migrations      # aplikuje chýbajúce migrácie
+"""
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    statements: Tuple[str, ...]
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        1,
+        "baseline schema",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS items(
+              id INTEGER PRIMARY KEY AUTOINCREMENT,
+              name TEXT NOT NULL,
+              description TEXT,
+              price REAL NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS users(
+              id INTEGER PRIMARY KEY AUTOINCREMENT,
+              username TEXT UNIQUE NOT NULL,
+              password_hash TEXT NOT NULL,
+              role TEXT NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS events (
+              id INTEGER PRIMARY KEY AUTOINCREMENT,
+              event_type TEXT NOT NULL,   -- 'training' alebo 'match'
+              date TEXT NOT NULL,         -- 'YYYY-MM-DD'
+              time_from TEXT,             -- napr. '18:00'
+              time_to TEXT,               -- napr. '19:30'
+              location TEXT,
+              note TEXT
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS attendance (
+              event_id   INTEGER NOT NULL,
+              user_id    INTEGER NOT NULL,
+              status     TEXT NOT NULL,   -- 'yes', 'no', 'unknown'
+              comment    TEXT,
+              updated_at TEXT,
+              PRIMARY KEY (event_id, user_id),
+              FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE,
+              FOREIGN KEY (user_id)  REFERENCES users(id)  ON DELETE CASCADE
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS announcements (
+              id         INTEGER PRIMARY KEY AUTOINCREMENT,
+              author_id  INTEGER NOT NULL,
+              title      TEXT NOT NULL,
+              body       TEXT NOT NULL,
+              created_at TEXT NOT NULL,
+              FOREIGN KEY (author_id) REFERENCES users(id)
+            )
+            """,
+        ),
+    ),
+    Migration(
+        2,
+        "hot-path indexes",
+        (
+            # get_statuses_for_user, get_my_trainings, get_user_stats
+            "CREATE INDEX IF NOT EXISTS ix_attendance_user_event ON attendance(user_id, event_id)",
+            # tréningové súhrny (event_type = 'training') + zoradenie podľa dátumu
+            "CREATE INDEX IF NOT EXISTS ix_events_type_date ON events(event_type, date, time_from)",
+            # WHERE role = 'player' ... ORDER BY username
+            "CREATE INDEX IF NOT EXISTS ix_users_role_username ON users(role, username)",
+        ),
+    ),
+    Migration(
+        3,
+        "materialized attendance summary",
+        (
+            # "pravda" počítaná od nuly; WHERE event_id = ? sa pretlačí dovnútra,
+            # takže pre jeden event je to len O(hráčov) cez indexy
+            """
+            CREATE VIEW IF NOT EXISTS v_event_attendance AS
+            SELECT
+              e.id AS event_id,
+              COUNT(u.id) FILTER (WHERE a.status = 'yes') AS yes_count,
+              COUNT(u.id) FILTER (WHERE a.status = 'no') AS no_count,
+              COUNT(u.id) FILTER (WHERE COALESCE(a.status, 'unknown') = 'unknown') AS unknown_count,
+              json_group_array(u.username) FILTER (WHERE a.status = 'yes') AS yes_names,
+              json_group_array(u.username) FILTER (WHERE a.status = 'no') AS no_names,
+              json_group_array(u.username)
+                FILTER (WHERE u.id IS NOT NULL AND COALESCE(a.status, 'unknown') = 'unknown') AS unknown_names
+            FROM events e
+            LEFT JOIN users u ON u.role = 'player'
+            LEFT JOIN attendance a ON a.event_id = e.id AND a.user_id = u.id
+            GROUP BY e.id
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS event_attendance_summary (
+              event_id      INTEGER PRIMARY KEY,
+              yes_count     INTEGER NOT NULL,
+              no_count      INTEGER NOT NULL,
+              unknown_count INTEGER NOT NULL,
+              yes_names     TEXT NOT NULL,   -- JSON pole usernames
+              no_names      TEXT NOT NULL,
+              unknown_names TEXT NOT NULL
+            )
+            """,
+            # dochádzka: prepočíta sa riadok dotknutého eventu
+            # (INSERT OR REPLACE spúšťa AFTER INSERT, takže stačí insert/update/delete)
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_attendance_summary_ins
+            AFTER INSERT ON attendance
+            BEGIN
+              DELETE FROM event_attendance_summary WHERE event_id = NEW.event_id;
+              INSERT INTO event_attendance_summary SELECT * FROM v_event_attendance WHERE event_id = NEW.event_id;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_attendance_summary_upd
+            AFTER UPDATE OF event_id, user_id, status ON attendance
+            BEGIN
+              DELETE FROM event_attendance_summary WHERE event_id IN (OLD.event_id, NEW.event_id);
+              INSERT INTO event_attendance_summary
+                SELECT * FROM v_event_attendance WHERE event_id IN (OLD.event_id, NEW.event_id);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_attendance_summary_del
+            AFTER DELETE ON attendance
+            BEGIN
+              DELETE FROM event_attendance_summary WHERE event_id = OLD.event_id;
+              INSERT INTO event_attendance_summary SELECT * FROM v_event_attendance WHERE event_id = OLD.event_id;
+            END
+            """,
+            # nový event = všetci hráči "unknown"; zmazaný event = preč
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_events_summary_ins
+            AFTER INSERT ON events
+            BEGIN
+              INSERT OR REPLACE INTO event_attendance_summary SELECT * FROM v_event_attendance WHERE event_id = NEW.id;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_events_summary_del
+            AFTER DELETE ON events
+            BEGIN
+              DELETE FROM event_attendance_summary WHERE event_id = OLD.id;
+            END
+            """,
+            # hráč pridaný / odobratý / zmenená rola či meno -> dotkne sa všetkých eventov;
+            # je to zriedkavá admin operácia, takže sa prepočíta celá tabuľka
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_users_summary_ins
+            AFTER INSERT ON users
+            WHEN NEW.role = 'player'
+            BEGIN
+              DELETE FROM event_attendance_summary;
+              INSERT INTO event_attendance_summary SELECT * FROM v_event_attendance;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_users_summary_upd
+            AFTER UPDATE OF role, username ON users
+            WHEN OLD.role = 'player' OR NEW.role = 'player'
+            BEGIN
+              DELETE FROM event_attendance_summary;
+              INSERT INTO event_attendance_summary SELECT * FROM v_event_attendance;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_users_summary_del
+            AFTER DELETE ON users
+            WHEN OLD.role = 'player'
+            BEGIN
+              DELETE FROM event_attendance_summary;
+              INSERT INTO event_attendance_summary SELECT * FROM v_event_attendance;
+            END
+            """,
+            "DELETE FROM event_attendance_summary",
+            "INSERT INTO event_attendance_summary SELECT * FROM v_event_attendance",
+        ),
+    ),
+    Migration(
+        4,
+        "events keyset index",
+        (
+            # stránkovanie /events podľa (date, time_from, id); time_from môže byť NULL,
+            # preto IFNULL – inak by porovnanie (date, time_from, id) > (?, ?, ?) vrátilo NULL
+            "CREATE INDEX IF NOT EXISTS ix_events_date_time_id ON events(date, IFNULL(time_from, ''), id)",
+        ),
+    ),
+    Migration(
+        5,
+        "credential version + revocations",
+        (
+            # zmena hesla zvýši verziu; podpísané session cookie nesú verziu z prihlásenia
+            "ALTER TABLE users ADD COLUMN credential_version INTEGER NOT NULL DEFAULT 0",
+            # posledné odvolanie na používateľa: tokeny s verziou < min_version sú neplatné
+            """
+            CREATE TABLE IF NOT EXISTS credential_revocations (
+              user_id     INTEGER PRIMARY KEY,
+              min_version INTEGER NOT NULL,
+              revoked_at  REAL NOT NULL,    -- time.time()
+              FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS ix_credential_revocations_at ON credential_revocations(revoked_at)",
+        ),
+    ),
+    Migration(
+        6,
+        "data version for in-memory attendance matrix",
+        (
+            # počítadlo zmien dát, z ktorých je matica dochádzky (services/attendance_matrix);
+            # každý zapísaný riadok ho zvýši o 1 – aj zápis z iného workera alebo CLI skriptu
+            """
+            CREATE TABLE IF NOT EXISTS data_version (
+              id      INTEGER PRIMARY KEY CHECK (id = 1),
+              version INTEGER NOT NULL
+            )
+            """,
+            "INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)",
+            # INSERT OR REPLACE spúšťa len AFTER INSERT (bez recursive_triggers), takže +1 na riadok
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_attendance_version_ins
+            AFTER INSERT ON attendance
+            BEGIN
+              UPDATE data_version SET version = version + 1 WHERE id = 1;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_attendance_version_upd
+            AFTER UPDATE ON attendance
+            BEGIN
+              UPDATE data_version SET version = version + 1 WHERE id = 1;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_attendance_version_del
+            AFTER DELETE ON attendance
+            BEGIN
+              UPDATE data_version SET version = version + 1 WHERE id = 1;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_events_version_ins
+            AFTER INSERT ON events
+            BEGIN
+              UPDATE data_version SET version = version + 1 WHERE id = 1;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_events_version_upd
+            AFTER UPDATE ON events
+            BEGIN
+              UPDATE data_version SET version = version + 1 WHERE id = 1;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_events_version_del
+            AFTER DELETE ON events
+            BEGIN
+              UPDATE data_version SET version = version + 1 WHERE id = 1;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_users_version_ins
+            AFTER INSERT ON users
+            BEGIN
+              UPDATE data_version SET version = version + 1 WHERE id = 1;
+            END
+            """,
+            # zmena hesla / credential_version maticu nezaujíma
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_users_version_upd
+            AFTER UPDATE OF username, role ON users
+            BEGIN
+              UPDATE data_version SET version = version + 1 WHERE id = 1;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_users_version_del
+            AFTER DELETE ON users
+            BEGIN
+              UPDATE data_version SET version = version + 1 WHERE id = 1;
+            END
+            """,
+        ),
+    ),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def migrate(conn: sqlite3.Connection, target: Optional[int] = None) -> List[int]:
+    """Aplikuje chýbajúce migrácie (až po `target`). Vráti zoznam aplikovaných verzií."""
+    target = LATEST_VERSION if target is None else target
+    applied: List[int] = []
+
+    if conn.in_transaction:
+        conn.commit()
+
+    for migration in MIGRATIONS:
+        if migration.version > target:
+            break
+        if current_version(conn) >= migration.version:
+            continue
+        # BEGIN IMMEDIATE = zápisový zámok hneď, takže dva workery
+        # štartujúce naraz nespustia tú istú migráciu dvakrát
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if current_version(conn) >= migration.version:  # medzitým ju spravil iný proces
+                conn.rollback()
+                continue
+            for statement in migration.statements:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(migration.version)
+
+    return applied
+
+
+if __name__ == "__main__":
+    from database.database import open_connection, close_pool
+
+    with open_connection() as c:
+        before = current_version(c)
+        done = migrate(c)
+        print(f"user_version {before} -> {current_version(c)}, aplikované: {done or 'nič'}")
+    close_pool()
@@ -0,0 +1,148 @@
+# app/database/plan_check.py
+"""
+Kontrola query plánov: spustí čítacie metódy služieb nad aktuálnou DB,
+zachytí každý SQL príkaz, ktorý pri tom vznikne, a pre každý vypíše
+EXPLAIN QUERY PLAN. Riadky `SCAN <tabuľka>` bez indexu = full scan.
+
+Dotazy sa nepíšu ručne do zoznamu – berú sa priamo z kódu, takže
+kontrola nezastará, keď sa repository zmení.
+
+    python -m database.plan_check
+"""
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple
+
+import config
+from database.migrations import current_version
+from database.profiler import InstrumentedConnection, add_observer, fingerprint, remove_observer
+
+
+@dataclass
+class PlanReport:
+    source: str
+    sql: str
+    plan: List[str] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def table_scans(self) -> List[str]:
+        # "SCAN events" je full scan; "SCAN x USING COVERING INDEX" je aspoň len index
+        return [line for line in self.plan if line.startswith("SCAN") and " USING " not in line]
+
+    @property
+    def index_scans(self) -> List[str]:
+        return [line for line in self.plan if line.startswith("SCAN") and " USING " in line]
+
+
+def _probes(conn: sqlite3.Connection) -> List[Tuple[str, Callable[[], Any]]]:
+    """Čítacie volania, ktorých SQL chceme skontrolovať (zápisy sa tu nevolajú)."""
+    from repositories.attendance import get_user_timeline, iter_attendance_matrix, iter_player_summaries
+    from repositories.events import list_events, list_events_page
+    from repositories.items import list_items, total_price
+    from repositories.users import get_user_by_username
+    from services.attendance import AttendanceService
+    from services.auth import AuthService
+    from services.events import EventsService
+
+    att = AttendanceService(conn)
+    ev = EventsService(conn)
+    user_id, event_id = 1, 1
+    return [
+        ("repositories.events.list_events", lambda: list_events(conn)),
+        ("repositories.events.list_events_page", lambda: list_events_page(conn, "2024-01-01", after=("2024-02-01", "18:00", 1))),
+        ("repositories.events.list_events_page(past)", lambda: list_events_page(conn, "2024-01-01", past=True)),
+        ("repositories.items.list_items", lambda: list_items(conn)),
+        ("repositories.items.total_price", lambda: total_price(conn)),
+        ("repositories.users.get_user_by_username", lambda: get_user_by_username(conn, "admin")),
+        ("AuthService.list_users", lambda: AuthService(conn).list_users()),
+        ("EventsService.get_event", lambda: ev.get_event(event_id)),
+        ("AttendanceService.get_statuses_for_user", lambda: att.get_statuses_for_user(user_id, [event_id])),
+        ("AttendanceService.get_event_overview", lambda: att.get_event_overview(event_id)),
+        ("AttendanceService.list_events", lambda: att.list_events()),
+        ("AttendanceService.get_attendance_overview", lambda: att.get_attendance_overview([event_id])),
+        ("AttendanceService.check_summary", lambda: att.check_summary()),
+        ("AttendanceService.get_statuses_for_events", lambda: att.get_statuses_for_events([event_id])),
+        ("repositories.attendance.iter_attendance_matrix",
+         lambda: list(iter_attendance_matrix(conn, "2024-01-01", "2024-12-31", "training"))),
+        ("repositories.attendance.iter_player_summaries",
+         lambda: list(iter_player_summaries(conn, "2024-01-01", "2024-12-31"))),
+        ("AttendanceService.get_user_stats", lambda: att.get_user_stats(user_id, only_past=True)),
+        ("repositories.attendance.get_user_timeline", lambda: get_user_timeline(conn, user_id)),
+        ("AttendanceService.get_players_training_summary", lambda: att.get_players_training_summary()),
+        ("AttendanceService.get_my_trainings_yes", lambda: att.get_my_trainings_yes(user_id)),
+        ("AttendanceService.get_my_training_summary", lambda: att.get_my_training_summary(user_id)),
+        ("AttendanceService.get_my_trainings", lambda: att.get_my_trainings(user_id)),
+    ]
+
+
+def check_plans(database_path: str | None = None) -> List[PlanReport]:
+    conn = sqlite3.connect(database_path or config.DATABASE_PATH, factory=InstrumentedConnection)
+    conn.row_factory = sqlite3.Row
+    reports: List[PlanReport] = []
+    seen: Dict[str, PlanReport] = {}
+    captured: List[Tuple[str, Any]] = []
+
+    def capture(sql: str, params: Any, elapsed: float, rows: int) -> None:
+        captured.append((sql, params))
+
+    add_observer(capture)
+    try:
+        for source, probe in _probes(conn):
+            captured.clear()
+            try:
+                probe()
+            except sqlite3.Error as e:
+                # dotaz zlyhal ešte pred EXPLAIN (napr. neexistujúci stĺpec)
+                reports.append(PlanReport(source, "", error=str(e)))
+                continue
+            for sql, params in captured:
+                fp = fingerprint(sql)
+                if fp in seen:
+                    continue
+                report = PlanReport(source, fp)
+                try:
+                    rows = sqlite3.Cursor(conn).execute("EXPLAIN QUERY PLAN " + sql, params or ()).fetchall()
+                    report.plan = [r[-1] for r in rows]  # stĺpec "detail"
+                except sqlite3.Error as e:
+                    report.error = str(e)
+                seen[fp] = report
+                reports.append(report)
+    finally:
+        remove_observer(capture)
+        conn.rollback()
+        conn.close()
+    return reports
+
+
+def main() -> int:
+    reports = check_plans()
+    conn = sqlite3.connect(config.DATABASE_PATH)
+    version = current_version(conn)
+    conn.close()
+    print(f"DB: {config.DATABASE_PATH} (user_version={version})\n")
+
+    scans = 0
+    for r in reports:
+        if r.error:
+            mark = "ERROR"
+        elif r.table_scans:
+            mark = "SCAN "
+            scans += 1
+        else:
+            mark = "ok   "
+        print(f"[{mark}] {r.source}")
+        if r.sql:
+            print(f"        {r.sql[:160]}")
+        if r.error:
+            print(f"        ! {r.error}")
+        for line in r.plan:
+            print(f"        - {line}")
+    print(f"\n{scans} z {len(reports)} dotazov robí full table SCAN")
+    return 1 if scans else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
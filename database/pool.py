@@ -0,0 +1,345 @@
+# app/database/pool.py
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from threading import Condition
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+from database.profiler import request_counters
+
+
+class PoolTimeout(RuntimeError):
+    """Nepodarilo sa získať spojenie z poolu v časovom limite."""
+
+
+class PoolClosed(RuntimeError):
+    """Pool už bol zatvorený (shutdown aplikácie)."""
+
+
+@dataclass
+class _Idle:
+    conn: sqlite3.Connection
+    since: float
+
+
+_SLOT = object()     # voľné miesto v poole – spojenie si vytvorí ten, kto ho dostal
+_NOTHING = object()  # nič voľné
+
+
+# spojenie, ktoré úlohe na DB executore požičal event loop (ConnectionPool.lend)
+_lent: ContextVar[Optional[Tuple["ConnectionPool", sqlite3.Connection]]] = ContextVar("pool_lent", default=None)
+# vlákno DB executora: čakať na spojenie sa tu nesmie (deadlock, viď database/executor.py)
+_no_wait: ContextVar[bool] = ContextVar("pool_no_wait", default=False)
+
+
+@contextmanager
+def forbid_blocking_acquire() -> Iterator[None]:
+    """acquire() v tomto kontexte hneď zlyhá – spojenie musí byť požičané (lend)."""
+    token = _no_wait.set(True)
+    try:
+        yield
+    finally:
+        _no_wait.reset(token)
+
+
+def _deliver(future: asyncio.Future, taken) -> None:
+    # beží v event loope čakateľa; ak medzitým vypršal, acquire_async si to upratal sám
+    if not future.done():
+        future.set_result(taken)
+
+
+def _fail(future: asyncio.Future, error: BaseException) -> None:
+    if not future.done():
+        future.set_exception(error)
+
+
+class ConnectionPool:
+    """
+    Ohraničený pool SQLite spojení.
+
+    - max. `max_size` spojení naraz, ďalší čakajú (najviac `timeout` s)
+    - `factory` vytvorí a nakonfiguruje spojenie (PRAGMA) len raz
+    - spojenie nečinné dlhšie ako `health_check_after` sa pred vydaním overí
+    - pri vrátení sa rollbackne rozbehnutá transakcia
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], sqlite3.Connection],
+        max_size: int = 8,
+        min_size: int = 0,
+        timeout: float = 10.0,
+        health_check_after: float = 30.0,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size musí byť aspoň 1")
+        self._factory = factory
+        self.max_size = max_size
+        self.min_size = min(min_size, max_size)
+        self.timeout = timeout
+        self.health_check_after = health_check_after
+
+        self._idle: Deque[_Idle] = deque()
+        self._async_waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._size = 0  # všetky otvorené spojenia (idle + vydané)
+        self._closed = False
+        self._cond = Condition()
+
+        # štatistiky
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+
+    # ---------- životný cyklus ----------
+
+    def warm_up(self) -> None:
+        """Otvorí `min_size` spojení dopredu, aby ich prvé requesty nemuseli vytvárať."""
+        while True:
+            # slot po jednom – keď _create zlyhá, uvoľní len ten svoj a ďalšie nie sú rezervované
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            conn = self._create()
+            with self._cond:
+                self._idle.append(_Idle(conn, time.monotonic()))
+                self._cond.notify()
+
+    def close(self) -> None:
+        """Zavrie všetky nečinné spojenia; vydané sa zavrú pri vrátení."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            waiters = list(self._async_waiters)
+            self._async_waiters.clear()
+            self._cond.notify_all()
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_fail, future, PoolClosed("Connection pool je zatvorený"))
+        for item in idle:
+            item.conn.close()
+
+    # ---------- checkout / checkin ----------
+
+    def acquire(self) -> sqlite3.Connection:
+        if _no_wait.get():
+            # zlyhá vždy, nielen keď je pool plný – chyba sa ukáže hneď, nie až pod záťažou
+            raise RuntimeError("Blokujúci acquire() na DB executore – spojenie požičaj v event loope (run_db_pooled)")
+        started = time.monotonic()
+        deadline = started + self.timeout
+        waited = False
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolClosed("Connection pool je zatvorený")
+                taken = self._take_locked()
+                if taken is not _NOTHING:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise self._timeout_error()
+                waited = True
+                self._cond.wait(remaining)
+            self._record_wait_locked(started, waited)
+
+        return self._track(self._checkout(taken))
+
+    async def acquire_async(self) -> sqlite3.Connection:
+        """
+        Ako acquire(), ale čaká v event loope, nie v blokovanom vlákne.
+        Vrátené spojenie sa odovzdá priamo čakajúcej korutine (release()).
+        """
+        started = time.monotonic()
+        loop = asyncio.get_running_loop()
+        with self._cond:
+            if self._closed:
+                raise PoolClosed("Connection pool je zatvorený")
+            taken = self._take_locked()
+            if taken is not _NOTHING:
+                self._record_wait_locked(started, False)
+                return self._track(self._checkout(taken))
+            future: asyncio.Future = loop.create_future()
+            self._async_waiters.append((loop, future))
+
+        try:
+            taken = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            with self._cond:
+                if (loop, future) in self._async_waiters:
+                    self._async_waiters.remove((loop, future))
+                    handed_over = False
+                else:
+                    handed_over = True
+                if isinstance(e, asyncio.TimeoutError):
+                    self._timeouts += 1
+            if handed_over:
+                # spojenie (alebo slot) nám už medzitým niekto odovzdal – vrátime ho
+                taken = await future
+                if taken is _SLOT:
+                    with self._cond:
+                        self._size -= 1
+                        self._wake_locked()
+                else:
+                    self.release(taken.conn)
+            if isinstance(e, asyncio.TimeoutError):
+                raise self._timeout_error() from None
+            raise
+
+        with self._cond:
+            self._record_wait_locked(started, True)
+        return self._track(self._checkout(taken))
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        try:
+            conn.set_trace_callback(None)
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+
+        with self._cond:
+            if self._closed:
+                self._size -= 1
+                conn.close()
+                self._cond.notify()
+                return
+            self._idle.append(_Idle(conn, time.monotonic()))
+            self._wake_locked()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        lent = _lent.get()
+        if lent is not None and lent[0] is self:
+            # požičané zvonku (lend) – vráti ho ten, kto ho požičal
+            yield lent[1]
+            return
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    @contextmanager
+    def lend(self, conn: sqlite3.Connection) -> Iterator[None]:
+        """connection() v tomto kontexte (aj vo vláknach s jeho kópiou) vráti `conn` bez čakania na pool."""
+        token = _lent.set((self, conn))
+        try:
+            yield
+        finally:
+            _lent.reset(token)
+
+    # ---------- štatistiky ----------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            checkouts = self._checkouts
+            return {
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "checkouts": checkouts,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "wait_total_ms": round(self._wait_total * 1000, 3),
+                "wait_mean_ms": round(self._wait_total * 1000 / checkouts, 3) if checkouts else 0.0,
+                "wait_max_ms": round(self._wait_max * 1000, 3),
+                "created": self._created,
+                "discarded": self._discarded,
+                "closed": self._closed,
+            }
+
+    # ---------- interné ----------
+
+    def _take_locked(self):
+        """Idle spojenie, _SLOT (smieme vytvoriť nové) alebo _NOTHING. Volať pod zámkom."""
+        if self._idle:
+            return self._idle.pop()  # LIFO – najčerstvejšie spojenie
+        if self._size < self.max_size:
+            self._size += 1
+            return _SLOT
+        return _NOTHING
+
+    def _wake_locked(self) -> None:
+        """Uvoľnilo sa spojenie alebo slot: prednostne ho odovzdáme async čakateľovi."""
+        while self._async_waiters:
+            taken = self._take_locked()
+            if taken is _NOTHING:
+                return
+            loop, future = self._async_waiters.popleft()
+            loop.call_soon_threadsafe(_deliver, future, taken)
+        self._cond.notify()
+
+    def _checkout(self, taken) -> sqlite3.Connection:
+        if taken is _SLOT:
+            return self._create()
+        if time.monotonic() - taken.since >= self.health_check_after and not self._is_healthy(taken.conn):
+            # slot si necháme a rovno ho zaplníme novým spojením
+            self._discard(taken.conn, free_slot=False)
+            return self._create()
+        return taken.conn
+
+    @staticmethod
+    def _track(conn: sqlite3.Connection) -> sqlite3.Connection:
+        # v requeste: započítať spojenie a kým ho drží, aj jeho príkazy
+        counters = request_counters.get()
+        if counters is not None:
+            counters.connections += 1
+            conn.set_trace_callback(counters.count_statement)
+        return conn
+
+    def _record_wait_locked(self, started: float, waited: bool) -> None:
+        wait = time.monotonic() - started
+        self._checkouts += 1
+        if waited:
+            self._waits += 1
+        self._wait_total += wait
+        self._wait_max = max(self._wait_max, wait)
+
+    def _timeout_error(self) -> PoolTimeout:
+        return PoolTimeout(f"Žiadne voľné spojenie do {self.timeout:.1f}s (max_size={self.max_size})")
+
+    def _create(self) -> sqlite3.Connection:
+        try:
+            conn = self._factory()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._wake_locked()
+            raise
+        with self._cond:
+            self._created += 1
+        return conn
+
+    @staticmethod
+    def _is_healthy(conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn: sqlite3.Connection, free_slot: bool = True) -> None:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._cond:
+            self._discarded += 1
+            if free_slot:
+                self._size -= 1
+                self._wake_locked()
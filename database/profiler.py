@@ -0,0 +1,305 @@
+# app/database/profiler.py
+"""
+Inštrumentácia SQL dotazov.
+
+Spojenia sa vytvárajú s `InstrumentedConnection` len vtedy, keď je
+zaregistrovaný aspoň jeden observer (profiler, SQL echo). Inak sa používa
+obyčajné `sqlite3.Connection` a inštrumentácia nestojí nič.
+
+Observer je funkcia `(sql, params, elapsed_s, rows) -> None`.
+
+Nezávisle od toho sa počíta, koľko spojení si request požičal a koľko
+príkazov na nich SQLite vykonal (`RequestCounters`, cez trace callback –
+lacné, beží stále).
+"""
+from __future__ import annotations
+
+import logging
+import math
+import re
+import sqlite3
+import time
+from collections import deque
+from contextvars import ContextVar
+from threading import Lock
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+QueryObserver = Callable[[str, Any, float, int], None]
+
+_observers: List[QueryObserver] = []
+
+sql_logger = logging.getLogger("teamhub.sql")
+
+
+def add_observer(observer: QueryObserver) -> None:
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def remove_observer(observer: QueryObserver) -> None:
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+def instrumentation_active() -> bool:
+    return bool(_observers)
+
+
+def _notify(sql: str, params: Any, elapsed: float, rows: int) -> None:
+    for observer in _observers:
+        try:
+            observer(sql, params, elapsed, rows)
+        except Exception:  # observer nesmie zhodiť dotaz
+            sql_logger.exception("query observer zlyhal")
+
+
+def log_query(sql: str, params: Any, elapsed: float, rows: int) -> None:
+    """Náhrada za `set_trace_callback(print)` – ide do loggera, nie na stdout."""
+    sql_logger.debug("%.2f ms, %d rows: %s %r", elapsed * 1000, rows, " ".join(sql.split()), params)
+
+
+# ---------- počítadlá na request ----------
+
+
+class RequestCounters:
+    """
+    Spojenia požičané z poolu a SQL príkazy vykonané na nich počas jedného requestu.
+
+    Príkazy počíta trace callback SQLite, teda aj BEGIN/COMMIT a každé
+    spustenie triggera (ohlási sa ako ďalší výskyt príkazu, ktorý ho spustil).
+    """
+
+    __slots__ = ("connections", "statements")
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self.statements = 0
+
+    def count_statement(self, sql: str) -> None:
+        self.statements += 1
+
+
+# nastavuje RequestContextMiddleware; vlákna DB executora dostanú kópiu kontextu
+request_counters: ContextVar[Optional[RequestCounters]] = ContextVar("request_counters", default=None)
+
+
+# ---------- inštrumentované spojenie ----------
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Meria čas execute + fetch a počet vrátených riadkov pre jeden príkaz."""
+
+    _pending: Optional[list] = None
+
+    def execute(self, sql, parameters=()):
+        self._flush()
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._pending = [sql, parameters, time.perf_counter() - started, 0]
+
+    def executemany(self, sql, seq_of_parameters):
+        self._flush()
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._pending = [sql, None, time.perf_counter() - started, 0]
+            self._flush()
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._add(time.perf_counter() - started, 0 if row is None else 1)
+        if row is None:
+            self._flush()
+        return row
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._add(time.perf_counter() - started, len(rows))
+        if not rows:
+            self._flush()
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._add(time.perf_counter() - started, len(rows))
+        self._flush()
+        return rows
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._add(time.perf_counter() - started, 0)
+            self._flush()
+            raise
+        self._add(time.perf_counter() - started, 1)
+        return row
+
+    def close(self):
+        self._flush()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._flush()
+        except Exception:
+            pass
+
+    def _add(self, elapsed: float, rows: int) -> None:
+        pending = self._pending
+        if pending is not None:
+            pending[2] += elapsed
+            pending[3] += rows
+
+    def _flush(self) -> None:
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return
+        sql, params, elapsed, rows = pending
+        if not rows and self.rowcount > 0:  # INSERT/UPDATE/DELETE
+            rows = self.rowcount
+        _notify(sql, params, elapsed, rows)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+# ---------- profiler ----------
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """Normalizovaný tvar príkazu: literály a parametre -> ?, IN (...) zlúčené, jedna medzera."""
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _SPACE_RE.sub(" ", sql).strip().rstrip(";").strip()
+    sql = _IN_LIST_RE.sub("(?+)", sql)
+    return sql
+
+
+class QueryStats:
+    __slots__ = ("fingerprint", "calls", "total", "max", "rows", "slow_calls",
+                 "samples", "slow_sql", "slow_params", "plan")
+
+    def __init__(self, fp: str, sample_size: int) -> None:
+        self.fingerprint = fp
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.slow_calls = 0
+        self.samples: Deque[float] = deque(maxlen=sample_size)
+        # najpomalší výskyt – na EXPLAIN QUERY PLAN
+        self.slow_sql: Optional[str] = None
+        self.slow_params: Any = None
+        self.plan: Optional[List[str]] = None
+
+    def p95(self) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+
+class QueryProfiler:
+    """
+    Agreguje dotazy podľa fingerprintu: počet volaní, total/mean/p95/max čas,
+    vrátené riadky. Dotazy pomalšie ako `slow_ms` sa označia a pre ich
+    fingerprint sa dá (lenivo, mimo hot path) zistiť EXPLAIN QUERY PLAN.
+    """
+
+    def __init__(self, slow_ms: float = 50.0, sample_size: int = 512) -> None:
+        self.slow_ms = slow_ms
+        self.sample_size = sample_size
+        self._stats: Dict[str, QueryStats] = {}
+        self._fp_cache: Dict[str, str] = {}
+        self._lock = Lock()
+        self.started_at = time.time()
+
+    def __call__(self, sql: str, params: Any, elapsed: float, rows: int) -> None:
+        fp = self._fp_cache.get(sql)
+        if fp is None:
+            fp = fingerprint(sql)
+            if len(self._fp_cache) < 10_000:
+                self._fp_cache[sql] = fp
+
+        slow = elapsed * 1000 >= self.slow_ms
+        with self._lock:
+            st = self._stats.get(fp)
+            if st is None:
+                st = self._stats[fp] = QueryStats(fp, self.sample_size)
+            st.calls += 1
+            st.total += elapsed
+            st.rows += rows
+            st.samples.append(elapsed)
+            if slow:
+                st.slow_calls += 1
+            if elapsed > st.max:
+                st.max = elapsed
+                if slow:
+                    st.slow_sql, st.slow_params, st.plan = sql, params, None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self.started_at = time.time()
+
+    def explain(self, conn: sqlite3.Connection) -> None:
+        """Doplní EXPLAIN QUERY PLAN pre pomalé fingerprinty, ktoré ho ešte nemajú."""
+        with self._lock:
+            todo = [st for st in self._stats.values() if st.slow_sql and st.plan is None]
+        for st in todo:
+            sql = st.slow_sql.strip()
+            if not sql.upper().startswith(("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")):
+                st.plan = []
+                continue
+            try:
+                # obyčajný kurzor, aby sa samotný EXPLAIN nezapočítal do štatistík
+                cur = sqlite3.Cursor(conn)
+                rows = cur.execute("EXPLAIN QUERY PLAN " + sql, st.slow_params or ()).fetchall()
+                st.plan = [r[-1] for r in rows]  # stĺpec "detail"
+            except sqlite3.Error as e:
+                st.plan = [f"(EXPLAIN zlyhal: {e})"]
+
+    def snapshot(self, order_by: str = "total") -> List[Dict[str, Any]]:
+        with self._lock:
+            stats = list(self._stats.values())
+            out = [
+                {
+                    "fingerprint": st.fingerprint,
+                    "calls": st.calls,
+                    "total_ms": st.total * 1000,
+                    "mean_ms": st.total * 1000 / st.calls,
+                    "p95_ms": st.p95() * 1000,
+                    "max_ms": st.max * 1000,
+                    "rows": st.rows,
+                    "rows_per_call": st.rows / st.calls,
+                    "slow_calls": st.slow_calls,
+                    "plan": list(st.plan) if st.plan else [],
+                }
+                for st in stats
+            ]
+        out.sort(key=lambda r: r.get(order_by + "_ms", r.get(order_by, 0)), reverse=True)
+        return out
+
+
+query_profiler = QueryProfiler()
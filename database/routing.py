@@ -0,0 +1,39 @@
+# app/database/routing.py
+"""
+Repository funkcie deklarujú, či čítajú alebo zapisujú:
+
+    @reads
+    def list_events(conn): ...
+
+    @writes
+    def insert_event(conn, ...): ...
+
+Pri TEAMHUB_DB_RW_SPLIT=1 dostávajú requesty read-only spojenia a `@writes`
+funkcie sa automaticky presmerujú na jediný zapisovač (odovzdané `conn`
+sa ignoruje a použije sa spojenie zapisovača). Bez splitu sa nemení nič.
+"""
+from __future__ import annotations
+
+import functools
+from typing import Callable, TypeVar
+
+from database.database import get_writer
+
+F = TypeVar("F", bound=Callable)
+
+
+def reads(fn: F) -> F:
+    fn.db_access = "read"  # type: ignore[attr-defined]
+    return fn
+
+
+def writes(fn: F) -> F:
+    @functools.wraps(fn)
+    def wrapper(conn, *args, **kwargs):
+        writer = get_writer()
+        if writer is None:
+            return fn(conn, *args, **kwargs)
+        return writer.submit(fn, *args, **kwargs)
+
+    wrapper.db_access = "write"  # type: ignore[attr-defined]
+    return wrapper  # type: ignore[return-value]
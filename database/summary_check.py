@@ -0,0 +1,39 @@
+# app/database/summary_check.py
+"""
+Kontrola materializovaného súhrnu dochádzky (event_attendance_summary).
+Triggery ho držia presný; toto je poistka, ak sa DB menila mimo aplikácie
+(ručný import, staré zálohy, vypnuté triggery...).
+
+    python -m database.summary_check            # len vypíše nezhody
+    python -m database.summary_check --rebuild  # a prebuduje súhrn od nuly
+"""
+from __future__ import annotations
+
+import argparse
+
+from database.database import close_pool, open_connection
+from repositories.attendance import check_summary, rebuild_summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rebuild", action="store_true", help="prebudovať súhrn od nuly")
+    args = parser.parse_args()
+
+    try:
+        with open_connection() as conn:
+            drifted = check_summary(conn)
+            if drifted:
+                print(f"nesedí {len(drifted)} eventov: {drifted[:20]}{' ...' if len(drifted) > 20 else ''}")
+            else:
+                print("súhrn sedí")
+            if args.rebuild:
+                print(f"prebudované: {rebuild_summary(conn)} riadkov")
+                drifted = check_summary(conn)
+    finally:
+        close_pool()
+    return 1 if drifted else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
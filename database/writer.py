@@ -0,0 +1,129 @@
+# app/database/writer.py
+"""
+Jeden serializovaný zapisovač. Všetky zápisy idú cez jedno spojenie
+a jedno vlákno, ktoré spracúva front požiadaviek po jednej. SQLite má
+aj tak len jeden zápisový zámok, takže súbežné commity sa už nebijú
+o zámok (`database is locked`), len počkajú vo fronte.
+"""
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+_STOP = object()
+
+
+class WriterClosed(RuntimeError):
+    """Zapisovač bol zastavený (shutdown aplikácie)."""
+
+
+class SerializedWriter:
+    def __init__(self, factory: Callable[[], sqlite3.Connection], timeout: float = 30.0) -> None:
+        self._factory = factory
+        self.timeout = timeout
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._jobs = 0
+        self._failed = 0
+        self._cancelled = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._run_total = 0.0
+        self._max_depth = 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            if self._closed:
+                raise WriterClosed("Zapisovač je zastavený")
+            self._conn = self._factory()
+            self._thread = threading.Thread(target=self._loop, name="db-writer", daemon=True)
+            self._thread.start()
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Spustí `fn(writer_conn, *args, **kwargs)` vo vlákne zapisovača a počká na výsledok."""
+        if threading.current_thread() is self._thread:
+            # zápis volaný zo zápisu – sme už vo vlákne zapisovača
+            return fn(self._conn, *args, **kwargs)
+
+        self.start()
+        future: Future = Future()
+        self._queue.put((fn, args, kwargs, future, time.perf_counter()))
+        depth = self._queue.qsize()
+        with self._lock:
+            self._max_depth = max(self._max_depth, depth)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # ešte vo fronte: zrušíme, _loop ho preskočí (volajúci dostal chybu, zápis sa nesmie vykonať neskôr);
+            # ak už beží, cancel() nič neurobí a zápis dobehne
+            if future.cancel():
+                with self._lock:
+                    self._cancelled += 1
+            raise
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            jobs = self._jobs
+            return {
+                "running": self._thread is not None,
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self._max_depth,
+                "jobs": jobs,
+                "failed": self._failed,
+                "cancelled": self._cancelled,
+                "queue_wait_mean_ms": round(self._wait_total * 1000 / jobs, 3) if jobs else 0.0,
+                "queue_wait_max_ms": round(self._wait_max * 1000, 3),
+                "run_mean_ms": round(self._run_total * 1000 / jobs, 3) if jobs else 0.0,
+            }
+
+    def _loop(self) -> None:
+        conn = self._conn
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                break
+            fn, args, kwargs, future, queued_at = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            started = time.perf_counter()
+            failed = False
+            try:
+                result = fn(conn, *args, **kwargs)
+            except BaseException as e:
+                if conn.in_transaction:
+                    conn.rollback()
+                failed = True
+                future.set_exception(e)
+            else:
+                if conn.in_transaction:  # funkcia zabudla commitnúť
+                    conn.commit()
+                future.set_result(result)
+            finished = time.perf_counter()
+            wait = started - queued_at
+            with self._lock:
+                self._jobs += 1
+                self._failed += failed
+                self._wait_total += wait
+                self._wait_max = max(self._wait_max, wait)
+                self._run_total += finished - started
+        conn.close()
@@ -1,33 +1,49 @@
 import sqlite3
-from typing import Iterator, Optional
+from typing import Optional
 from fastapi import Depends, HTTPException, Request, status
-from database.database import open_connection
+from request_context import RequestContext, request_context
 from services.items import ItemsService
 from services.events import EventsService
 from services.auth import AuthService, User
-from services.session import session_store, SESSION_COOKIE_NAME
 from services.attendance import AttendanceService
 
-def get_conn() -> Iterator[sqlite3.Connection]:
-    with open_connection() as conn:
-        yield conn
+async def get_request_context(request: Request) -> RequestContext:
+    # async, aby FastAPI kvôli nej neskákal do threadpoolu
+    return request_context(request)
 
-def items_service(conn: sqlite3.Connection = Depends(get_conn)) -> ItemsService:
-    return ItemsService(conn)
+async def get_conn(ctx: RequestContext = Depends(get_request_context)) -> sqlite3.Connection:
+    # jedno spojenie na request (pri RW splite read-only; zápisy idú cez @writes funkcie).
+    # Na voľné spojenie sa čaká v event loope, nie v (obmedzenom) threadpoole –
+    # inak by čakajúce requesty zablokovali aj vrátenie spojení a pool by zamrzol.
+    # Do poolu ho vráti RequestContextMiddleware po odoslaní odpovede.
+    return await ctx.connection_async()
 
-def events_service(conn: sqlite3.Connection = Depends(get_conn)) -> EventsService:
-    return EventsService(conn)
+async def items_service(ctx: RequestContext = Depends(get_request_context)) -> ItemsService:
+    return await ctx.service_async(ItemsService)
 
-def auth_service(conn: sqlite3.Connection = Depends(get_conn)) -> AuthService:
-    return AuthService(conn)
+async def events_service(ctx: RequestContext = Depends(get_request_context)) -> EventsService:
+    return await ctx.service_async(EventsService)
 
-def attendance_service() -> AttendanceService:
+async def auth_service(ctx: RequestContext = Depends(get_request_context)) -> AuthService:
+    return await ctx.service_async(AuthService)
+
+async def attendance_service(ctx: RequestContext = Depends(get_request_context)) -> AttendanceService:
+    return await ctx.service_async(AttendanceService)
+
+def password_auth_service() -> AuthService:
+    # prihlásenie / zmena hesla: bcrypt trvá ~0.25 s a pri plnom fronte aj dlhšie –
+    # spojenie z poolu sa požičia len na SELECT/UPDATE (čaká sa naň v event loope), nie na celý request
+    return AuthService()
+
+def attendance_writer_service() -> AttendanceService:
+    # RSVP nepotrebuje spojenie requestu: pri group commite zapisuje vlákno
+    # s vlastným spojením, inak si ho set_status požičia len na chvíľu
     return AttendanceService()
 
 
 def get_current_user(request: Request) -> Optional[User]:
-    session_id = request.cookies.get(SESSION_COOKIE_NAME)
-    return session_store.get_user(session_id)
+    # overí sa raz na request, middleware/dependencies/šablóny zdieľajú výsledok
+    return request_context(request).user
 
 def require_user(user: Optional[User] = Depends(get_current_user)) -> User:
     if not user:
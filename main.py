@@ -1,57 +1,155 @@
 # app/main.py
-from fastapi import FastAPI, Request
-from fastapi.staticfiles import StaticFiles
-from starlette.templating import Jinja2Templates
+import asyncio
+from contextlib import asynccontextmanager
+import time
+from typing import Any
+from fastapi import FastAPI
 from starlette.middleware.sessions import SessionMiddleware
-from pages.items import router as items_router  # ← DŮLEŽITÉ: přímý import modulu
-from pages.dashboard import router as dashboard_router  # ← DŮLEŽITÉ: přímý import modulu
-from pages.auth import router as auth_router
-from pages.events import router as events_router
-from pages.home import router as home_router
-from pages.admin_users import router as admin_users_router
-from pages.me import router as me_router
-from pages.attendance_stats import router as attendance_stats_router
-from pages.players import router as players_router
+from database.database import get_read_pool, get_writer, close_pool, open_connection
+from database.migrations import migrate
+from database.executor import db_executor
+from services.attendance import rsvp_queue
+from services.passwords import password_hasher
+from services.session import session_store
+import config
+from compression import CompressionMiddleware
+from request_context import RequestContextMiddleware
+from startup import Lazy, RouterLoader, RouterSpec
+from static_assets import STATIC_URL, AssetStaticFiles, asset_manifest
 from dependencies import items_service, auth_service, get_current_user,events_service
 from services.items import ItemsService
 from services.auth import AuthService
 from services.events import EventsService
 
-def create_app() -> FastAPI:
-    app = FastAPI(title="Mini FastAPI – Items")
-
-    app.mount("/static", StaticFiles(directory="static"), name="static")
-    app.state.templates = Jinja2Templates(directory="templates")
-    app.include_router(home_router, prefix="")
-    app.include_router(items_router, prefix="/items", tags=["items"])
-    app.include_router(auth_router, prefix="", tags=["auth"])
-    app.include_router(events_router, prefix="/events", tags=["events"])
-    app.include_router(admin_users_router)
-    app.include_router(players_router, prefix="")
-    app.include_router(me_router)
-    # DEBUG: vypiš zaregistrované cesty
+# stránky v poradí registrácie; `paths` = ktoré URL obsluhujú (pri TEAMHUB_LAZY_STARTUP
+# sa podľa nich modul načíta až pri prvom requeste – nový router sem pridať aj s cestami)
+ROUTERS = [
+    RouterSpec("pages.home", ("/",)),
+    RouterSpec("pages.items", ("/items",), prefix="/items", tags=["items"]),
+    RouterSpec("pages.auth", ("/login", "/logout", "/change-password"), tags=["auth"]),
+    RouterSpec("pages.events", ("/events",), prefix="/events", tags=["events"]),
+    RouterSpec("pages.admin_users", ("/admin/users",)),
+    RouterSpec("pages.admin_db", ("/admin/db", "/admin/queries")),
+    RouterSpec("pages.players", ("/players",)),
+    RouterSpec("pages.me", ("/me",)),
+    RouterSpec("pages.attendance_stats", ("/attendance/stats",)),
+    RouterSpec("pages.export", ("/export",)),
+    RouterSpec("pages.api", ("/api/v1",)),
+]
+
+
+def _create_templates() -> Any:
+    # templating (a s ním Jinja2) sa importuje až tu – pri lenivom štarte pri prvom renderi
+    from templating import create_templates
+
+    templates = create_templates("templates")
+    templates.env.globals.update(
+        get_user=get_current_user,
+        static_url=asset_manifest.url,
+        static_image=asset_manifest.image,
+    )
+    return templates
+
+
+def _create_streaming_templates(app: FastAPI) -> Any:
+    from templating import StreamingTemplates
+
+    return StreamingTemplates(app.state.templates)
+
+
+def print_routes(app: FastAPI) -> None:
     print("=== ROUTES ===")
     for r in app.routes:
-        try:
-            print(getattr(r, "methods", ""), getattr(r, "path", ""))
-        except Exception:
-            pass
+        print(getattr(r, "methods", ""), getattr(r, "path", r))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if config.DB_AUTO_MIGRATE:
+        with open_connection() as conn:
+            migrate(conn)
+    # warm-up: otvoríme spojenia dopredu, PRAGMA sa nastavia len raz
+    get_read_pool().warm_up()
+    writer = get_writer()
+    if writer is not None:
+        writer.start()
+    session_store.start_sweeper(config.SESSION_SWEEP_INTERVAL)
+    # pri lenivom štarte sa bcrypt procesy aj šablóny pripravia až pri prvom použití
+    if not config.LAZY_STARTUP:
+        # procesy na bcrypt naštartujeme hneď, prvé prihlásenie na ne nečaká
+        await asyncio.get_running_loop().run_in_executor(None, password_hasher.warm_up)
+    # šablóny skompilujeme (alebo načítame z bytecode cache) pred prvým requestom
+    if config.TEMPLATE_WARM_UP and not config.LAZY_STARTUP:
+        from templating import warm_up
+
+        app.state.template_warm_up = await asyncio.get_running_loop().run_in_executor(
+            None, warm_up, app.state.templates
+        )
+        if config.STREAM_HTML:
+            app.state.template_warm_up["streaming"] = await asyncio.get_running_loop().run_in_executor(
+                None, warm_up, app.state.streaming_templates
+            )
+    yield
+    session_store.close()
+    password_hasher.shutdown()
+    rsvp_queue.close()  # dopíše čakajúce RSVP
+    db_executor.shutdown()
+    close_pool()
+
+
+def create_app() -> FastAPI:
+    started = time.perf_counter()
+    app = FastAPI(title="Mini FastAPI – Items", lifespan=lifespan)
+
+    # súbory s odtlačkom zo static/dist (build_assets.py): immutable + vopred skomprimované
+    app.state.static_files = AssetStaticFiles(directory=config.STATIC_DIR, manifest=asset_manifest)
+    app.mount(STATIC_URL, app.state.static_files, name="static")
+    if config.LAZY_STARTUP:
+        app.state.templates = Lazy(_create_templates)
+        app.state.streaming_templates = Lazy(lambda: _create_streaming_templates(app))
+    else:
+        app.state.templates = _create_templates()
+        app.state.streaming_templates = _create_streaming_templates(app)
+    app.state.template_warm_up = None
+
+    # routery stránok: hneď, alebo (TEAMHUB_LAZY_STARTUP) až pri prvom requeste / url_for
+    app.state.routers = RouterLoader(app, ROUTERS)
+    if not config.LAZY_STARTUP:
+        app.state.routers.load_all()
+    if config.PRINT_ROUTES:
+        print_routes(app)
 
     # Pokud používáš override přes třídu, nech, jinak ho klidně vyhoď
     app.dependency_overrides[ItemsService] = items_service
     app.dependency_overrides[AuthService] = auth_service
     app.dependency_overrides[EventsService] = events_service
 
-    app.add_middleware(SessionMiddleware, secret_key="dev-secret")
+    app.add_middleware(SessionMiddleware, secret_key=config.SESSION_SECRET)
 
-    app.state.templates.env.globals.update(get_user=lambda request: getattr(request.state, "user", None))
+    # gzip/brotli pre HTML a JSON; nastavenia v config.py (KOMPRESIA ODPOVEDÍ)
+    if config.COMPRESSION:
+        app.add_middleware(CompressionMiddleware)
 
-    @app.middleware("http")
-    async def inject_user(request: Request, call_next):
-        request.state.user = get_current_user(request)
-        response = await call_next(request)
-        return response
+    # najvonkajší: používateľ/spojenie/služby raz na request (namiesto inject_user)
+    app.add_middleware(RequestContextMiddleware)
 
+    app.state.startup = {"lazy": config.LAZY_STARTUP, "create_app_ms": round((time.perf_counter() - started) * 1000, 2)}
     return app
 
 app = create_app()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from startup import profile_startup
+
+    ap = argparse.ArgumentParser(description="TeamHub (server: uvicorn main:app)")
+    ap.add_argument("--profile-startup", action="store_true",
+                    help="čas importu po moduloch, create_app, lifespan a prvých requestov (bežný aj lenivý štart)")
+    ap.add_argument("--top", type=int, default=15, help="koľko najdrahších importov vypísať")
+    args = ap.parse_args()
+    if args.profile_startup:
+        profile_startup(top=args.top)
+    else:
+        ap.print_help()
@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """Obálka zoznamov v /api/v1 (len pre OpenAPI – odpovede sa cez model nevalidujú)."""
+    data: List[T]
+    next_cursor: Optional[str] = Field(None, description="?cursor= ďalšej strany; null = posledná strana")
@@ -0,0 +1,40 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class AttendanceChange(BaseModel):
+    event_id: int
+    user_id: int
+    status: str = Field(..., description="yes / no / unknown")
+
+
+class BulkAttendanceIn(BaseModel):
+    """Vstup hromadnej zmeny dochádzky; status a existenciu overuje služba naraz."""
+    changes: List[AttendanceChange]
+
+
+class AttendanceOverview(BaseModel):
+    """Súhrn dochádzky udalosti (/api/v1/attendance/overview)."""
+    event_id: int
+    yes_count: int
+    unknown_count: int
+    no_count: int
+    yes: List[str]
+    unknown: List[str]
+    no: List[str]
+
+
+class MyStatus(BaseModel):
+    event_id: int
+    status: str = Field(..., description="yes / no / unknown")
+    updated_at: Optional[str] = None
+
+
+class PlayerTrainingSummary(BaseModel):
+    """Riadok /players: tréningy hráča (missing = unknown aj bez odpovede)."""
+    user_id: int
+    username: str
+    trainings_total: int
+    yes_count: int
+    no_count: int
+    missing_count: int
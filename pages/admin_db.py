@@ -0,0 +1,173 @@
+# pages/admin_db.py
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import RedirectResponse
+from starlette import status as http_status
+
+import config
+from compression import brotli, compression_stats
+from database.database import get_read_pool, get_writer, open_connection
+from database.executor import db_executor
+from database.profiler import query_profiler
+from services.attendance import AttendanceService, rsvp_queue
+from services.attendance_matrix import attendance_matrix
+from services.fragment_cache import event_row_cache
+from services.passwords import password_hasher
+from services.session import session_store
+from dependencies import require_admin
+from request_context import request_context, request_stats
+from templating import template_stats
+from services.auth import AuthService, User
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/db/pool", name="admin_db_pool")
+async def admin_db_pool(user: User = Depends(require_admin)) -> dict:
+    # čakanie na spojenie, počty checkoutov, veľkosť poolu (spojenia pre requesty)
+    return get_read_pool().stats()
+
+
+@router.get("/db/executor", name="admin_db_executor")
+async def admin_db_executor(user: User = Depends(require_admin)) -> dict:
+    # hĺbka frontu a latencia DB executora (čakanie vo fronte vs. samotný beh)
+    return db_executor.stats()
+
+
+@router.get("/db/writer", name="admin_db_writer")
+async def admin_db_writer(user: User = Depends(require_admin)) -> dict:
+    # len pri TEAMHUB_DB_RW_SPLIT=1
+    writer = get_writer()
+    return writer.stats() if writer is not None else {"running": False, "rw_split": False}
+
+
+@router.get("/db/rsvp", name="admin_db_rsvp")
+async def admin_db_rsvp(user: User = Depends(require_admin)) -> dict:
+    # group commit RSVP: zápisy/s, veľkosť dávok, zlúčené opakované kliky
+    return rsvp_queue.stats()
+
+
+@router.get("/db/matrix", name="admin_db_matrix")
+async def admin_db_matrix(user: User = Depends(require_admin)) -> dict:
+    # matica dochádzky v pamäti: backend (numpy/bitset), počet načítaní a inkrementálnych zmien
+    return attendance_matrix.stats()
+
+
+@router.get("/db/fragments", name="admin_db_fragments")
+async def admin_db_fragments(user: User = Depends(require_admin)) -> dict:
+    # LRU cache riadkov /events: hit rate, vytláčanie, invalidácie (úpravy, RSVP)
+    return event_row_cache.stats()
+
+
+@router.get("/db/sessions", name="admin_db_sessions")
+async def admin_db_sessions(user: User = Depends(require_admin)) -> dict:
+    # živé session, hit rate LRU cache pred SQLite, výsledky mazania na pozadí
+    return session_store.stats()
+
+
+@router.get("/db/passwords", name="admin_db_passwords")
+async def admin_db_passwords(user: User = Depends(require_admin)) -> dict:
+    # pool procesov na bcrypt: rozpracované, odmietnuté (503), priemerný čas
+    return password_hasher.stats()
+
+
+@router.get("/db/password-costs", name="admin_db_password_costs")
+async def admin_db_password_costs(request: Request, user: User = Depends(require_admin)) -> dict:
+    # koľko hashov má akú cenu bcryptu – postup prepočítavania po zmene TEAMHUB_BCRYPT_ROUNDS
+    svc = await request_context(request).service_async(AuthService)
+    return await svc.aio.password_cost_report()
+
+
+@router.get("/db/requests", name="admin_db_requests")
+async def admin_db_requests(reset: bool = False, user: User = Depends(require_admin)) -> dict:
+    # podľa route: spojenia z poolu a SQL príkazy na jeden request (N+1, viac spojení naraz)
+    routes = request_stats.snapshot()
+    if reset:
+        request_stats.reset()
+    return {"routes": routes}
+
+
+@router.get("/db/templates", name="admin_db_templates")
+async def admin_db_templates(request: Request, user: User = Depends(require_admin)) -> dict:
+    # Jinja2: auto_reload, načítané šablóny, bytecode cache na disku, trvanie warm-upu, streamovanie
+    return template_stats(request.app.state.templates, request.app.state.template_warm_up,
+                          request.app.state.streaming_templates)
+
+
+@router.get("/db/static", name="admin_db_static")
+async def admin_db_static(request: Request, user: User = Depends(require_admin)) -> dict:
+    # build statických súborov (manifest, veľkosti .br/.gz, varianty obrázkov) a čo sa koľkokrát poslalo
+    return request.app.state.static_files.stats()
+
+
+@router.get("/db/startup", name="admin_db_startup")
+async def admin_db_startup(request: Request, user: User = Depends(require_admin)) -> dict:
+    # lenivý štart: trvanie create_app, ktoré routery sa kedy (a za koľko) načítali, či už sú šablóny
+    return dict(
+        request.app.state.startup,
+        routers=request.app.state.routers.stats(),
+        templates_loaded=getattr(request.app.state.templates, "loaded", True),
+    )
+
+
+@router.get("/db/compression", name="admin_db_compression")
+async def admin_db_compression(user: User = Depends(require_admin)) -> dict:
+    # koľko odpovedí sa skomprimovalo / prečo nie, bajty pred a po, čas kompresie
+    return dict(compression_stats.snapshot(), algorithms=config.COMPRESSION_ALGORITHMS,
+                gzip_level=config.COMPRESSION_GZIP_LEVEL, br_quality=config.COMPRESSION_BR_QUALITY,
+                brotli_installed=brotli is not None)
+
+
+@router.get("/db/summary", name="admin_db_summary")
+async def admin_db_summary(request: Request, user: User = Depends(require_admin)) -> dict:
+    # kontrola event_attendance_summary voči prepočtu od nuly
+    svc = await request_context(request).service_async(AttendanceService)
+    drifted = await svc.aio.check_summary()
+    return {"consistent": not drifted, "drifted_event_ids": drifted}
+
+
+@router.post("/db/summary/rebuild", name="admin_db_summary_rebuild")
+async def admin_db_summary_rebuild(request: Request, user: User = Depends(require_admin)) -> dict:
+    # rebuild_summary je @writes – pri RW splite pôjde cez zapisovač
+    svc = await request_context(request).service_async(AttendanceService)
+    rows = await svc.aio.rebuild_summary()
+    return {"rebuilt_rows": rows}
+
+
+@router.get("/queries", name="admin_queries_ui")
+def admin_queries_ui(
+    request: Request,
+    order: str = "total",
+    user: User = Depends(require_admin),
+):
+    if order not in ("total", "mean", "p95", "max", "calls", "rows", "slow_calls"):
+        order = "total"
+
+    # EXPLAIN QUERY PLAN pre pomalé dotazy počítame až tu, nie pri samotnom dotaze
+    if config.QUERY_PROFILER:
+        with open_connection() as conn:
+            query_profiler.explain(conn)
+
+    templates = request.app.state.templates
+    return templates.TemplateResponse(
+        "admin_queries.html",
+        {
+            "request": request,
+            "user": user,
+            "enabled": config.QUERY_PROFILER,
+            "slow_ms": query_profiler.slow_ms,
+            "order": order,
+            "queries": query_profiler.snapshot(order_by=order),
+            "pool": get_read_pool().stats(),
+        },
+    )
+
+
+@router.post("/queries/reset", name="admin_queries_reset")
+async def admin_queries_reset(request: Request, user: User = Depends(require_admin)):
+    query_profiler.reset()
+    return RedirectResponse(
+        url=request.url_for("admin_queries_ui"),
+        status_code=http_status.HTTP_303_SEE_OTHER,
+    )
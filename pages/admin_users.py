@@ -6,6 +6,7 @@ from starlette import status as http_status
 
 from dependencies import auth_service, require_admin
 from services.auth import AuthService, User
+from services.passwords import PasswordHasherBusy
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -17,7 +18,7 @@ async def admin_users_ui(
     svc: AuthService = Depends(auth_service),
 ):
     templates = request.app.state.templates
-    users = svc.list_users()
+    users = await svc.aio.list_users()
     return templates.TemplateResponse(
         "admin_users.html",
         {"request": request, "user": user, "users": users, "error": None, "created": None},
@@ -32,10 +33,14 @@ async def admin_users_create(
     username: str = Form(...),
     role: str = Form("player"),
 ):
-    temp_password, err = svc.create_user(username=username, role=role)
+    busy = False
+    try:
+        temp_password, err = await svc.create_user_async(username=username, role=role)
+    except PasswordHasherBusy as e:
+        temp_password, err, busy = None, str(e), True
 
     templates = request.app.state.templates
-    users = svc.list_users()
+    users = await svc.aio.list_users()
     return templates.TemplateResponse(
         "admin_users.html",
         {
@@ -45,5 +50,9 @@ async def admin_users_create(
             "error": err,
             "created": None if err else {"username": username, "temp_password": temp_password, "role": role},
         },
-        status_code=http_status.HTTP_400_BAD_REQUEST if err else http_status.HTTP_200_OK,
+        status_code=(
+            http_status.HTTP_503_SERVICE_UNAVAILABLE if busy
+            else http_status.HTTP_400_BAD_REQUEST if err
+            else http_status.HTTP_200_OK
+        ),
     )
@@ -0,0 +1,191 @@
+# pages/api.py
+"""
+/api/v1 – tie isté dáta ako HTML stránky, ale ako JSON (mobilná aplikácia).
+
+- prihlásenie rovnakou session cookie ako web; chyby sú {"detail": ...}
+- zoznamy: {"data": [...], "next_cursor": "..."}; ďalšia strana cez ?cursor=,
+  veľkosť ?limit= (max TEAMHUB_API_MAX_PAGE_SIZE)
+- ?fields=id,date vráti len vybrané polia (menej bajtov do mobilu)
+
+Odpovede sa skladajú v api_json (orjson, bez Pydantic validácie na výstupe);
+modely v `responses=` sú len dokumentácia pre /docs.
+"""
+from __future__ import annotations
+
+from itertools import dropwhile
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+import config
+from api_json import JSONBytesResponse, decode_cursor, encode_cursor, parse_fields, project
+from dependencies import attendance_service, events_service, items_service, require_coach_or_admin, require_user
+from model.Item import Item
+from model.api import Page
+from model.attendance import AttendanceOverview, MyStatus, PlayerTrainingSummary
+from model.events import EventPublic
+from services.attendance import AttendanceService
+from services.auth import User
+from services.events import EventsService
+from services.items import ItemsService
+
+router = APIRouter(prefix="/api/v1", tags=["api"])
+
+# povolené ?fields= = polia modelov
+EVENT_FIELDS = tuple(EventPublic.model_fields)
+OVERVIEW_FIELDS = tuple(AttendanceOverview.model_fields)
+STATUS_FIELDS = tuple(MyStatus.model_fields)
+PLAYER_FIELDS = tuple(PlayerTrainingSummary.model_fields)
+ITEM_FIELDS = tuple(Item.model_fields)
+
+# udalosť bez riadku v event_attendance_summary (ako get_event_overview)
+_NO_ANSWERS: Dict[str, Any] = {"yes_count": 0, "unknown_count": 0, "no_count": 0, "yes": [], "unknown": [], "no": []}
+
+_LIMIT = Query(config.API_PAGE_SIZE, ge=1, le=config.API_MAX_PAGE_SIZE)
+_FIELDS = Query(None, description="čiarkou oddelené polia, napr. id,date")
+
+
+def _fields(raw: Optional[str], allowed: Tuple[str, ...]) -> Optional[Tuple[str, ...]]:
+    try:
+        return parse_fields(raw, allowed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _cursor(cursor: Optional[str], kind: type) -> Any:
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor, kind)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _ids(raw: str) -> List[int]:
+    """?event_ids=1,2,3 -> [1, 2, 3] bez duplicít; najviac API_MAX_PAGE_SIZE."""
+    try:
+        ids = list(dict.fromkeys(int(x) for x in raw.split(",") if x.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="event_ids musia byť čísla oddelené čiarkou")
+    if len(ids) > config.API_MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"Najviac {config.API_MAX_PAGE_SIZE} event_ids naraz")
+    return ids
+
+
+def _page(
+    rows: List[Dict[str, Any]],
+    limit: int,
+    fields: Optional[Tuple[str, ...]],
+    key: Callable[[Dict[str, Any]], Any],
+) -> JSONBytesResponse:
+    # rows = o jeden navyše, ak existuje ďalšia strana
+    data = rows[:limit]
+    next_cursor = encode_cursor(key(data[-1])) if len(rows) > limit else None
+    return JSONBytesResponse({"data": project(data, fields), "next_cursor": next_cursor})
+
+
+# ---------- UDALOSTI ----------
+
+
+@router.get("/events", name="api_events", responses={200: {"model": Page[EventPublic]}})
+async def api_events(
+    window: str = "upcoming",
+    cursor: Optional[str] = None,
+    limit: int = _LIMIT,
+    fields: Optional[str] = _FIELDS,
+    svc: EventsService = Depends(events_service),
+):
+    # rovnaké okná a kurzory ako /events
+    selected = _fields(fields, EVENT_FIELDS)
+    try:
+        page = await svc.aio.list_events_page(window=window, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return JSONBytesResponse({
+        "data": project(page["events"], selected),
+        "next_cursor": page["next_cursor"],
+        "window": page["window"],
+    })
+
+
+@router.get("/events/{event_id}", name="api_event", responses={200: {"model": EventPublic}})
+async def api_event(
+    event_id: int,
+    fields: Optional[str] = _FIELDS,
+    svc: EventsService = Depends(events_service),
+):
+    selected = _fields(fields, EVENT_FIELDS)
+    ev = await svc.aio.get_event(event_id)
+    if ev is None:
+        raise HTTPException(status_code=404, detail="Udalosť neexistuje")
+    return JSONBytesResponse(project([dict(ev)], selected)[0])
+
+
+# ---------- DOCHÁDZKA ----------
+
+
+@router.get("/attendance/overview", name="api_attendance_overview",
+            responses={200: {"model": Page[AttendanceOverview]}})
+async def api_attendance_overview(
+    event_ids: str = Query(..., description="čiarkou oddelené id udalostí (napr. z jednej strany /api/v1/events)"),
+    fields: Optional[str] = _FIELDS,
+    att_svc: AttendanceService = Depends(attendance_service),
+):
+    selected = _fields(fields, OVERVIEW_FIELDS)
+    ids = _ids(event_ids)
+    summaries = await att_svc.aio.get_attendance_overview(ids)
+    rows = [{"event_id": event_id, **summaries.get(event_id, _NO_ANSWERS)} for event_id in ids]
+    return JSONBytesResponse({"data": project(rows, selected), "next_cursor": None})
+
+
+@router.get("/me/statuses", name="api_my_statuses", responses={200: {"model": Page[MyStatus]}})
+async def api_my_statuses(
+    user: User = Depends(require_user),
+    event_ids: Optional[str] = Query(None, description="len tieto udalosti; bez neho všetky s odpoveďou"),
+    cursor: Optional[str] = None,
+    limit: int = _LIMIT,
+    fields: Optional[str] = _FIELDS,
+    att_svc: AttendanceService = Depends(attendance_service),
+):
+    # bez záznamu = hráč neodpovedal (na webe "Neviem" bez zvýraznenia)
+    selected = _fields(fields, STATUS_FIELDS)
+    rows = await att_svc.aio.list_user_statuses(
+        user.id,
+        after_event_id=_cursor(cursor, int),
+        limit=limit + 1,
+        event_ids=None if event_ids is None else _ids(event_ids),
+    )
+    return _page(rows, limit, selected, key=lambda r: r["event_id"])
+
+
+@router.get("/players/summary", name="api_players_summary", responses={200: {"model": Page[PlayerTrainingSummary]}})
+async def api_players_summary(
+    user: User = Depends(require_coach_or_admin),
+    cursor: Optional[str] = None,
+    limit: int = _LIMIT,
+    fields: Optional[str] = _FIELDS,
+    att_svc: AttendanceService = Depends(attendance_service),
+):
+    # súhrn je zoradený podľa username (ako /players) – kurzor = posledné meno
+    selected = _fields(fields, PLAYER_FIELDS)
+    after = _cursor(cursor, str)
+    rows = await att_svc.aio.get_players_training_summary()
+    if after is not None:
+        rows = list(dropwhile(lambda r: r["username"] <= after, rows))
+    return _page(rows[:limit + 1], limit, selected, key=lambda r: r["username"])
+
+
+# ---------- POLOŽKY ----------
+
+
+@router.get("/items", name="api_items", responses={200: {"model": Page[Item]}})
+async def api_items(
+    cursor: Optional[str] = None,
+    limit: int = _LIMIT,
+    fields: Optional[str] = _FIELDS,
+    svc: ItemsService = Depends(items_service),
+):
+    # od najnovšej (ako /items), kurzor = id poslednej položky
+    selected = _fields(fields, ITEM_FIELDS)
+    rows = await svc.aio.list_items_page(before_id=_cursor(cursor, int), limit=limit + 1)
+    return _page(rows, limit, selected, key=lambda r: r["id"])
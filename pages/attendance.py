@@ -14,7 +14,7 @@ async def attendance_overview_ui(
     ev  = Depends(events_service),
 ):
     tpl = request.app.state.templates
-    events = ev.list_events()
+    events = await ev.aio.list_events()
 
     if not events:
         return tpl.TemplateResponse("attendance_overview.html", {
@@ -25,7 +25,7 @@ async def attendance_overview_ui(
         event_id = events[0]["id"]
 
     selected_event = next((x for x in events if x["id"] == event_id), events[0])
-    overview = att.get_event_overview(event_id)
+    overview = await att.aio.get_event_overview(event_id)
 
     return tpl.TemplateResponse("attendance_overview.html", {
         "request": request,
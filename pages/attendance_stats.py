@@ -1,26 +1,31 @@
+from typing import Optional
+
 from fastapi import APIRouter, Request, Depends
+from fastapi.responses import RedirectResponse
+
 from dependencies import attendance_service, get_current_user
+from services.attendance import AttendanceService
+from services.auth import User
 
 router = APIRouter()
 
-@router.get("/attendance/stats")
-def attendance_stats_ui(
+@router.get("/attendance/stats", name="attendance_stats_ui")
+async def attendance_stats_ui(
     request: Request,
-    svc = Depends(attendance_service),
-    current_user = Depends(get_current_user),
+    svc: AttendanceService = Depends(attendance_service),
+    current_user: Optional[User] = Depends(get_current_user),
 ):
     if not current_user:
-        # ak máš vlastný redirect/login mechanizmus, použi ten
-        return request.app.state.templates.TemplateResponse(
-            "login.html", {"request": request, "error": "Prihlás sa."}
-        )
+        return RedirectResponse(url="/login", status_code=302)
 
-    stats = svc.get_user_stats(current_user["id"], only_past=True)
+    # séria, okno, sezóna aj počty – udržiavané pri RSVP, tu len lookup
+    stats = await svc.aio.get_player_trends(current_user.id)
 
     return request.app.state.templates.TemplateResponse(
         "attendance_stats.html",
         {
             "request": request,
+            "user": current_user,
             "current_user": current_user,
             "stats": stats,
         },
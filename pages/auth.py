@@ -1,9 +1,12 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, Form, Request
 from fastapi.responses import RedirectResponse
 from starlette import status
-from dependencies import auth_service
-from services.auth import AuthService
-from services.session import SESSION_COOKIE_NAME, session_store
+from dependencies import get_current_user, password_auth_service
+from services.auth import AuthService, User
+from services.passwords import PasswordHasherBusy
+from services.session import SESSION_COOKIE_NAME, session_store, set_session_cookie
 
 router = APIRouter()
 
@@ -21,9 +24,18 @@ async def login_post(
     request: Request,
     username: str = Form(...),
     password: str = Form(...),
-    svc: AuthService = Depends(auth_service),
+    svc: AuthService = Depends(password_auth_service),
 ):
-    user = svc.authenticate(username, password)
+    try:
+        user = await svc.authenticate_async(username, password)
+    except PasswordHasherBusy as e:
+        # front na bcrypt je plný – radšej hneď 503, než nechať request visieť
+        return request.app.state.templates.TemplateResponse(
+            "login.html",
+            {"request": request, "error": str(e)},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": "1"},
+        )
     if not user:
         return request.app.state.templates.TemplateResponse(
             "login.html",
@@ -34,19 +46,19 @@ async def login_post(
             status_code=status.HTTP_401_UNAUTHORIZED,
         )
 
-    session_id = session_store.create_session(user)
+    session_id = await session_store.create_session_async(user)
     response = RedirectResponse(
         url=request.query_params.get("next") or request.url_for("home_ui"),
         status_code=status.HTTP_303_SEE_OTHER,
     )
-    response.set_cookie(SESSION_COOKIE_NAME, session_id, httponly=True)
+    set_session_cookie(response, session_id)
     return response
 
 
 @router.post("/logout", name="logout")
 async def logout(request: Request):
     session_id = request.cookies.get(SESSION_COOKIE_NAME)
-    session_store.delete_session(session_id)
+    await session_store.delete_session_async(session_id)
     response = RedirectResponse(
         url=request.url_for("home_ui"),
         status_code=status.HTTP_303_SEE_OTHER,
@@ -55,8 +67,8 @@ async def logout(request: Request):
     return response
 
 @router.get("/change-password", name="change_password_ui")
-async def change_password_ui(request: Request):
-    user = getattr(request.state, "user", None)
+async def change_password_ui(request: Request, user: Optional[User] = Depends(get_current_user)):
+    # sync dependency – session sa overí v threadpoole, nie v event loope
     if not user:
         return RedirectResponse(url=request.url_for("login_ui"), status_code=status.HTTP_303_SEE_OTHER)
 
@@ -68,9 +80,9 @@ async def change_password_ui(request: Request):
 @router.post("/change-password", name="change_password_ui")
 async def change_password_submit(
     request: Request,
-    svc: AuthService = Depends(auth_service),
+    svc: AuthService = Depends(password_auth_service),
+    user: Optional[User] = Depends(get_current_user),
 ):
-    user = getattr(request.state, "user", None)
     if not user:
         return RedirectResponse(url=request.url_for("login_ui"), status_code=status.HTTP_303_SEE_OTHER)
 
@@ -86,14 +98,30 @@ async def change_password_submit(
         )
 
     try:
-        svc.change_password(user_id=user.id, old_password=old_password, new_password=new_password)
-        return request.app.state.templates.TemplateResponse(
+        version, revoked_at = await svc.change_password_async(
+            user_id=user.id, old_password=old_password, new_password=new_password
+        )
+        # staré prihlásenia (aj na iných zariadeniach) prestanú platiť, toto dostane nové
+        await session_store.revoke_user_async(user.id, version, revoked_at)
+        response = request.app.state.templates.TemplateResponse(
             "change_password.html",
             {"request": request, "error": None, "success": "Heslo bolo zmenené ✅"},
         )
+        session_id = await session_store.create_session_async(
+            User(id=user.id, username=user.username, role=user.role, credential_version=version)
+        )
+        set_session_cookie(response, session_id)
+        return response
     except ValueError as e:
         return request.app.state.templates.TemplateResponse(
             "change_password.html",
             {"request": request, "error": str(e), "success": None},
         )
+    except PasswordHasherBusy as e:
+        return request.app.state.templates.TemplateResponse(
+            "change_password.html",
+            {"request": request, "error": str(e), "success": None},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": "1"},
+        )
 
@@ -1,18 +1,25 @@
 # pages/events.py
 from __future__ import annotations
 
-from typing import Optional, Dict
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, Form, Request, HTTPException
-from fastapi.responses import RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse
+from markupsafe import Markup
 from starlette import status as http_status
 
+import config
+from model.attendance import BulkAttendanceIn
 from services.events import EventsService
-from services.attendance import AttendanceService
-from services.auth import User
+from services.attendance import STATUSES, AttendanceService, BulkAttendanceError
+from services.auth import AuthService, User
+from services.fragment_cache import event_row_cache
+from request_context import request_context
 from dependencies import (
     events_service,
     attendance_service,
+    attendance_writer_service,
+    auth_service,
     get_current_user,
     require_admin,
     require_coach_or_admin,
@@ -20,6 +27,69 @@ from dependencies import (
 
 router = APIRouter()  # prefix /events je nastavený v main.py
 
+_EVENT_COLUMNS = ("event_type", "date", "time_from", "time_to", "location", "note")
+# RSVP na pozadí (events.html): hlavička requestu aj odpovede, "event-row" = telo je jeden <tr>
+ROW_FRAGMENT_HEADER = "x-fragment"
+
+
+def _event_row_renderer(request: Request, user: Optional[User]) -> Callable[..., Markup]:
+    """
+    render(ev, ov, st) -> HTML riadku tabuľky; nezmenené sa vezmú z event_row_cache.
+    Kľúč: udalosť + jej dáta, súhrn dochádzky, čo divák vidí (rola) a jeho status.
+    """
+    template = request.app.state.templates.get_template("_event_row.html")
+    # admin a tréner vidia ten istý riadok (akcie), hráč len svoju účasť
+    view = None if user is None else ("staff" if user.role in ("admin", "coach") else "member")
+    base_url = str(request.base_url)  # url_for v riadku je absolútna URL
+
+    def render(ev: Dict[str, Any], ov: Optional[Dict[str, Any]], st: Optional[str]) -> Markup:
+        key = (
+            ev["id"],
+            tuple(ev[c] for c in _EVENT_COLUMNS),
+            None if ov is None else (
+                ov["yes_count"], ov["unknown_count"], ov["no_count"],
+                tuple(ov["yes"]), tuple(ov["unknown"]), tuple(ov["no"]),
+            ),
+            view,
+            st,
+            base_url,
+        )
+        html = event_row_cache.get_or_render(
+            ev["id"], key,
+            lambda: template.render(request=request, ev=ev, ov=ov, st=st, user=user),
+        )
+        return Markup(html)
+
+    return render
+
+
+def _render_event_rows(
+    request: Request,
+    events: List[Dict[str, Any]],
+    overview: Dict[int, Dict[str, Any]],
+    user: Optional[User],
+    statuses: Dict[int, str],
+) -> List[Markup]:
+    render = _event_row_renderer(request, user)
+    return [render(ev, overview.get(ev["id"]), statuses.get(ev["id"])) for ev in events]
+
+
+async def _stream_event_rows(
+    request: Request,
+    events: List[Dict[str, Any]],
+    att_svc: AttendanceService,
+    user: Optional[User],
+) -> AsyncIterator[Markup]:
+    """Riadky pre streamovanú stránku: dochádzka sa načíta až po odoslaní hlavičky."""
+    event_ids = [e["id"] for e in events]
+    overview = await att_svc.aio.get_attendance_overview(event_ids)
+    statuses: Dict[int, str] = {}
+    if user is not None:
+        statuses = await att_svc.aio.get_statuses_for_user(user.id, event_ids)
+    render = _event_row_renderer(request, user)
+    for ev in events:
+        yield render(ev, overview.get(ev["id"]), statuses.get(ev["id"]))
+
 
 @router.get("/events-debug")
 async def events_debug() -> dict:
@@ -29,32 +99,44 @@ async def events_debug() -> dict:
 @router.get("/", name="events_ui")
 async def events_ui(
     request: Request,
+    window: str = "upcoming",
+    cursor: Optional[str] = None,
     svc: EventsService = Depends(events_service),
     att_svc: AttendanceService = Depends(attendance_service),
     user: Optional[User] = Depends(get_current_user),
 ):
-    events = svc.list_events()
+    try:
+        page = await svc.aio.list_events_page(window=window, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    events = page["events"]
+    context = {
+        "request": request,
+        "events": events,
+        "user": user,
+        "window": page["window"],
+        "next_cursor": page["next_cursor"],
+        "first_page": cursor is None,
+    }
 
-    # NEW: prehľad dochádzky pre všetkých (na každý event)
-    attendance_overview = att_svc.get_attendance_overview()
+    if config.STREAM_HTML:
+        # stránka udalostí sa načíta vopred (zlý kurzor = 400 ešte pred hlavičkami),
+        # dochádzka a riadky až počas streamovania
+        context["event_rows"] = _stream_event_rows(request, events, att_svc, user)
+        return request.app.state.streaming_templates.TemplateResponse("events.html", context)
+
+    event_ids = [e["id"] for e in events]
+
+    # prehľad dochádzky len pre eventy na tejto strane (z event_attendance_summary)
+    attendance_overview = await att_svc.aio.get_attendance_overview(event_ids)
 
     # tvoja dochádzka (pre zvýraznenie tlačidiel Idem/Neviem/Neprídem)
     user_statuses: Dict[int, str] = {}
     if user is not None:
-        user_statuses = att_svc.get_statuses_for_user(user.id)
-
-    templates = request.app.state.templates
-    return templates.TemplateResponse(
-        "events.html",
-        {
-            "request": request,
-            "events": events,
-            "user": user,
-            "user_statuses": user_statuses,
-            "attendance_overview": attendance_overview,  # NEW
-        },
-    )
+        user_statuses = await att_svc.aio.get_statuses_for_user(user.id, event_ids)
 
+    context["event_rows"] = _render_event_rows(request, events, attendance_overview, user, user_statuses)
+    return request.app.state.templates.TemplateResponse("events.html", context)
 
 
 @router.get("/create", name="create_event_ui")
@@ -119,7 +201,7 @@ async def create_event_submit(
             },
         )
 
-    svc.create_event(
+    await svc.aio.create_event(
         event_type=event_type.strip(),
         date=date.strip(),
         time_from=time_from or None,
@@ -144,7 +226,7 @@ async def edit_event_ui(
     svc: EventsService = Depends(events_service),
     user: User = Depends(require_coach_or_admin),
 ):
-    event = svc.get_event(event_id)
+    event = await svc.aio.get_event(event_id)
     if event is None:
         raise HTTPException(status_code=404, detail="Udalosť neexistuje")
 
@@ -209,7 +291,7 @@ async def edit_event_submit(
             },
         )
 
-    svc.update_event(
+    await svc.aio.update_event(
         event_id=event_id,
         event_type=event_type.strip(),
         date=date.strip(),
@@ -235,7 +317,7 @@ async def delete_event_submit(
     svc: EventsService = Depends(events_service),
     user: User = Depends(require_coach_or_admin),
 ):
-    svc.delete_event(event_id)
+    await svc.aio.delete_event(event_id)
     return RedirectResponse(
         url=request.url_for("events_ui"),
         status_code=http_status.HTTP_303_SEE_OTHER,
@@ -249,7 +331,7 @@ async def delete_event_submit(
 async def set_attendance(
     event_id: int,
     request: Request,
-    att_svc: AttendanceService = Depends(attendance_service),
+    att_svc: AttendanceService = Depends(attendance_writer_service),
     user: Optional[User] = Depends(get_current_user),
     status: str = Form(...),
 ):
@@ -259,13 +341,148 @@ async def set_attendance(
     if status not in ("yes", "no", "unknown"):
         raise HTTPException(status_code=400, detail="Neplatný status")
 
-    att_svc.set_status(
+    await att_svc.set_status_async(
         event_id=event_id,
         user_id=user.id,
         status=status,
     )
 
+    # JS v events.html odosiela formulár na pozadí a pýta si len zmenu;
+    # bežný formulár (bez JS) dostane presmerovanie na celý zoznam
+    if request.headers.get(ROW_FRAGMENT_HEADER) == "event-row":
+        return await _attendance_row(request, event_id, user, status)
+    if "application/json" in request.headers.get("accept", ""):
+        # čítanie cez spojenie requestu (čaká sa naň v event loope), zápis ho nepotreboval
+        reader = await request_context(request).service_async(AttendanceService)
+        overview = await reader.aio.get_event_overview(event_id)
+        return {"event_id": event_id, "status": status, **overview}
+
     return RedirectResponse(
         url=request.url_for("events_ui"),
         status_code=http_status.HTTP_303_SEE_OTHER,
     )
+
+
+async def _attendance_row(request: Request, event_id: int, user: User, status: str) -> HTMLResponse:
+    """Riadok udalosti po RSVP – rovnaký fragment (aj kľúč v event_row_cache) ako v zozname."""
+    ctx = request_context(request)
+    svc = await ctx.service_async(EventsService)
+    ev = await svc.aio.get_event(event_id)
+    if ev is None:
+        raise HTTPException(status_code=404, detail="Udalosť neexistuje")
+    att_svc = await ctx.service_async(AttendanceService)
+    overview = await att_svc.aio.get_attendance_overview([event_id])
+    html = _event_row_renderer(request, user)(ev, overview.get(event_id), status)
+    return HTMLResponse(html, headers={ROW_FRAGMENT_HEADER: "event-row", "Cache-Control": "no-store"})
+
+
+# ---------- HROMADNÁ DOCHÁDZKA (tréner) ----------
+
+
+async def _grid_context(
+    request: Request,
+    svc: EventsService,
+    att_svc: AttendanceService,
+    auth: AuthService,
+    user: User,
+    window: str,
+    cursor: Optional[str],
+) -> Dict[str, Any]:
+    page = await svc.aio.list_events_page(window=window, cursor=cursor, limit=config.ATTENDANCE_GRID_EVENTS)
+    events = page["events"]
+    players = [u for u in await auth.aio.list_users() if u["role"] == "player"]
+    statuses = await att_svc.aio.get_statuses_for_events([e["id"] for e in events])
+    return {
+        "request": request,
+        "user": user,
+        "events": events,
+        "players": players,
+        "statuses": statuses,
+        "status_choices": STATUSES,
+        "window": page["window"],
+        "cursor": cursor or "",
+        "next_cursor": page["next_cursor"],
+        "errors": [],
+        "applied": None,
+    }
+
+
+@router.get("/attendance/grid", name="attendance_grid_ui")
+async def attendance_grid_ui(
+    request: Request,
+    window: str = "past",
+    cursor: Optional[str] = None,
+    applied: Optional[int] = None,
+    svc: EventsService = Depends(events_service),
+    att_svc: AttendanceService = Depends(attendance_service),
+    auth: AuthService = Depends(auth_service),
+    user: User = Depends(require_coach_or_admin),
+):
+    try:
+        ctx = await _grid_context(request, svc, att_svc, auth, user, window, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    ctx["applied"] = applied
+    return request.app.state.templates.TemplateResponse("attendance_grid.html", ctx)
+
+
+def _parse_grid_form(items: List[Tuple[str, Any]]) -> Tuple[List[Tuple[int, int, str]], List[str]]:
+    """Polia "s:<event_id>:<user_id>" = status; prázdna hodnota = bez zmeny."""
+    changes: List[Tuple[int, int, str]] = []
+    errors: List[str] = []
+    for key, value in items:
+        if not key.startswith("s:") or not value:
+            continue
+        try:
+            _, event_id, user_id = key.split(":")
+            changes.append((int(event_id), int(user_id), str(value)))
+        except ValueError:
+            errors.append(f"Neplatné pole formulára: {key}")
+    return changes, errors
+
+
+@router.post("/attendance/grid", name="attendance_grid_submit")
+async def attendance_grid_submit(
+    request: Request,
+    svc: EventsService = Depends(events_service),
+    att_svc: AttendanceService = Depends(attendance_service),
+    auth: AuthService = Depends(auth_service),
+    user: User = Depends(require_coach_or_admin),
+):
+    form = await request.form()
+    window = str(form.get("window") or "past")
+    cursor = str(form.get("cursor") or "") or None
+    changes, errors = _parse_grid_form(list(form.multi_items()))
+
+    if not errors:
+        try:
+            result = await att_svc.aio.bulk_set_statuses(changes)
+        except BulkAttendanceError as e:
+            errors = e.errors
+    if errors:
+        try:
+            ctx = await _grid_context(request, svc, att_svc, auth, user, window, cursor)
+        except ValueError:
+            # window/cursor z formulára sú neplatné – chyby ukážeme nad predvolenou stranou
+            ctx = await _grid_context(request, svc, att_svc, auth, user, "past", None)
+        ctx["errors"] = errors
+        return request.app.state.templates.TemplateResponse("attendance_grid.html", ctx, status_code=400)
+
+    url = request.url_for("attendance_grid_ui").include_query_params(window=window, applied=result["applied"])
+    if cursor:
+        url = url.include_query_params(cursor=cursor)
+    return RedirectResponse(url=str(url), status_code=http_status.HTTP_303_SEE_OTHER)
+
+
+@router.post("/attendance/bulk", name="attendance_bulk")
+async def attendance_bulk(
+    payload: BulkAttendanceIn,
+    att_svc: AttendanceService = Depends(attendance_service),
+    user: User = Depends(require_coach_or_admin),
+) -> dict:
+    """JSON: {"changes": [{"event_id", "user_id", "status"}, ...]} -> kompaktný diff."""
+    changes = [(c.event_id, c.user_id, c.status) for c in payload.changes]
+    try:
+        return await att_svc.aio.bulk_set_statuses(changes)
+    except BulkAttendanceError as e:
+        raise HTTPException(status_code=422, detail={"errors": e.errors})
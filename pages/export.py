@@ -0,0 +1,54 @@
+# pages/export.py
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from database.database import get_export_pool
+from database.executor import iterate_db
+from database.pool import PoolTimeout
+from dependencies import require_coach_or_admin
+from request_context import request_context
+from services.auth import User
+from services.export import ExportRequest, stream_export
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+
+@router.get("/attendance", name="export_attendance")
+async def export_attendance(
+    request: Request,
+    kind: str = "matrix",
+    format: str = "csv",
+    gzip: bool = False,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    event_type: Optional[str] = None,
+    user: User = Depends(require_coach_or_admin),
+):
+    try:
+        req = ExportRequest(
+            kind=kind,
+            fmt=format,
+            gzip=gzip,
+            date_from=date_from or None,
+            date_to=date_to or None,
+            event_type=event_type or None,
+        ).validate()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        # vlastné spojenie na celé sťahovanie; vráti ho middleware po poslednom kuse
+        conn = await request_context(request).borrow_async(get_export_pool())
+    except PoolTimeout:
+        raise HTTPException(status_code=503, detail="Príliš veľa exportov naraz, skús to o chvíľu.")
+
+    # čítanie z kurzora beží na DB executore, nie v event loope
+    return StreamingResponse(
+        iterate_db(stream_export(req, conn)),
+        media_type=req.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{req.filename}"'},
+    )
@@ -15,8 +15,8 @@ async def items_ui(
     svc: ItemsService = Depends(items_service),
     user: Optional[User] = Depends(get_current_user),
 ):
-    items: List[Dict[str, Any]] = svc.list_items()
-    total = svc.total_price()
+    items: List[Dict[str, Any]] = await svc.aio.list_items()
+    total = await svc.aio.total_price()
     return request.app.state.templates.TemplateResponse(
         "items.html",
         {"request": request, "items": items, "total": total, "user": user},
@@ -70,7 +70,7 @@ async def create_item_post(
         )
 
     # if no errors, create the item
-    svc.create_item(name=name.strip(), price=price, description=description)
+    await svc.aio.create_item(name=name.strip(), price=price, description=description)
 
     # in case of success, redirect to the items list to prevent sending the form again by reloading the page
     return RedirectResponse(url=request.url_for("items_ui"), status_code=status.HTTP_303_SEE_OTHER)
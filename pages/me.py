@@ -1,23 +1,35 @@
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Depends, Request
 from fastapi.responses import RedirectResponse
 
-from dependencies import attendance_service, get_current_user
+import config
+from database.executor import iterate_db
+from dependencies import get_request_context
+from request_context import RequestContext
+from services.attendance import AttendanceService
 
 router = APIRouter()
 
 @router.get("/me")
-def my_attendance_ui(request: Request):
-    user = get_current_user(request)
+def my_attendance_ui(request: Request, ctx: RequestContext = Depends(get_request_context)):
+    user = ctx.user
     if not user:
         return RedirectResponse(url="/login", status_code=302)
 
-    svc = attendance_service()
     user_id = user["id"] if isinstance(user, dict) else user.id
 
+    # spojenie requestu – jedno pre celú stránku, vráti ho middleware
+    svc = ctx.service(AttendanceService)
     stats = svc.get_my_training_summary(user_id)   # ✅ toto berie user_id
-    trainings = svc.get_my_trainings(user_id)      # ✅ toto berie user_id
+    trends = svc.get_player_trends(user_id)        # séria / okno / sezóna – lookup
+    if config.STREAM_HTML:
+        # súhrn hore je pár čísel; dlhý zoznam tréningov sa streamuje z kurzora
+        trainings = iterate_db(svc.iter_my_trainings(user_id), batch=config.STREAM_HTML_BATCH)
+        templates = request.app.state.streaming_templates
+    else:
+        trainings = svc.get_my_trainings(user_id)  # ✅ toto berie user_id
+        templates = request.app.state.templates
 
-    return request.app.state.templates.TemplateResponse(
+    return templates.TemplateResponse(
         "my_attendance.html",
-        {"request": request, "user": user, "stats": stats, "trainings": trainings},
+        {"request": request, "user": user, "stats": stats, "trainings": trainings, "trends": trends},
     )
@@ -1,13 +1,17 @@
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Depends, Request
 from fastapi.responses import RedirectResponse
 
-from dependencies import get_current_user, attendance_service
+import config
+from database.executor import iterate_db
+from dependencies import get_request_context
+from request_context import RequestContext
+from services.attendance import AttendanceService
 
 router = APIRouter()
 
 @router.get("/players")
-def players_attendance_ui(request: Request):
-    user = get_current_user(request)
+def players_attendance_ui(request: Request, ctx: RequestContext = Depends(get_request_context)):
+    user = ctx.user
     if not user:
         return RedirectResponse(url="/login", status_code=302)
 
@@ -16,10 +20,17 @@ def players_attendance_ui(request: Request):
     if role not in ("admin", "coach"):
         return RedirectResponse(url="/", status_code=302)
 
-    svc = attendance_service()
-    players = svc.get_players_training_summary()  # toto vracia zoznam hráčov so sumármi
+    # spojenie sa z poolu požičia až tu (anonym/hráč ho nepotrebuje)
+    svc = ctx.service(AttendanceService)
+    if config.STREAM_HTML:
+        # riadky až počas renderu, po dávkach z kurzora – hlavička stránky ide hneď
+        players = iterate_db(svc.iter_players_training_summary(), batch=config.STREAM_HTML_BATCH)
+        templates = request.app.state.streaming_templates
+    else:
+        players = svc.get_players_training_summary()  # toto vracia zoznam hráčov so sumármi
+        templates = request.app.state.templates
 
-    return request.app.state.templates.TemplateResponse(
+    return templates.TemplateResponse(
         "players.html",
         {"request": request, "user": user, "players": players},
     )
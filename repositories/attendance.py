@@ -0,0 +1,416 @@
+# app/repositories/attendance.py
+import datetime
+import json
+import sqlite3
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from database.routing import reads, writes
+
+
+def now_timestamp() -> str:
+    """Čas odpovede do attendance.updated_at ('YYYY-MM-DD HH:MM:SS', lokálny čas)."""
+    return datetime.datetime.now().isoformat(sep=" ", timespec="seconds")
+
+
+# (verzia pred zápisom, verzia po ňom) – pozri data_version v migrácii 6
+Versions = Tuple[int, int]
+
+
+@reads
+def data_version(conn: sqlite3.Connection) -> int:
+    """Počítadlo zmien attendance/events/users (zvyšujú ho triggery, aj pri zápise z iného procesu)."""
+    return conn.execute("SELECT version FROM data_version WHERE id = 1").fetchone()[0]
+
+
+def _versions_after(conn: sqlite3.Connection, written: int) -> Versions:
+    # ešte pred commitom, v tej istej transakcii; každý zapísaný riadok = +1
+    after = data_version(conn)
+    return after - written, after
+
+
+@writes
+def set_status(
+    conn: sqlite3.Connection, event_id: int, user_id: int, status: str, updated_at: Optional[str] = None
+) -> Versions:
+    # najjednoduchšie: SQLite "upsert" cez INSERT OR REPLACE
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO attendance (event_id, user_id, status, updated_at)
+        VALUES (?, ?, ?, ?)
+        """,
+        (event_id, user_id, status, updated_at or now_timestamp()),
+    )
+    versions = _versions_after(conn, 1)
+    conn.commit()
+    return versions
+
+
+@writes
+def set_statuses(
+    conn: sqlite3.Connection, rows: Iterable[Tuple[int, int, str]], updated_at: Optional[str] = None
+) -> Versions:
+    """Viac (event_id, user_id, status) naraz – jedna transakcia, jeden commit."""
+    ts = updated_at or now_timestamp()
+    params = [(event_id, user_id, status, ts) for event_id, user_id, status in rows]
+    conn.executemany(
+        """
+        INSERT OR REPLACE INTO attendance (event_id, user_id, status, updated_at)
+        VALUES (?, ?, ?, ?)
+        """,
+        params,
+    )
+    versions = _versions_after(conn, len(params))
+    conn.commit()
+    return versions
+
+
+@reads
+def get_user_timeline(
+    conn: sqlite3.Connection, user_id: int
+) -> Tuple[List[Tuple[str, Optional[str]]], Optional[str]]:
+    """
+    [(date, status | None)] cez všetky udalosti chronologicky (ako stĺpce matice)
+    + čas poslednej odpovede hráča (MAX(updated_at)).
+    """
+    timeline = [
+        (r[0], r[1])
+        for r in conn.execute(
+            """
+            SELECT e.date, a.status
+            FROM events e
+            LEFT JOIN attendance a ON a.event_id = e.id AND a.user_id = ?
+            ORDER BY e.date, IFNULL(e.time_from, ''), e.id
+            """,
+            (user_id,),
+        )
+    ]
+    last = conn.execute("SELECT MAX(updated_at) FROM attendance WHERE user_id = ?", (user_id,)).fetchone()[0]
+    return timeline, last
+
+
+def _in(values: Iterable[int]) -> Tuple[str, List[int]]:
+    ids = sorted(set(values))
+    return ",".join("?" * len(ids)) or "NULL", ids
+
+
+@reads
+def get_statuses_for_events(conn: sqlite3.Connection, event_ids: Sequence[int]) -> Dict[Tuple[int, int], str]:
+    """{(event_id, user_id): status} pre zadané eventy (mriežka dochádzky)."""
+    placeholders, ids = _in(event_ids)
+    rows = conn.execute(
+        f"SELECT event_id, user_id, status FROM attendance WHERE event_id IN ({placeholders})",
+        ids,
+    ).fetchall()
+    return {(r["event_id"], r["user_id"]): r["status"] for r in rows}
+
+
+@reads
+def list_user_statuses(
+    conn: sqlite3.Connection,
+    user_id: int,
+    after_event_id: Optional[int] = None,
+    limit: int = 100,
+    event_ids: Optional[Sequence[int]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Statusy usera po event_id (keyset cez ix_attendance_user_event), len udalosti
+    so záznamom; `event_ids` = len tieto eventy (None = všetky).
+    """
+    where = "user_id = ? AND event_id > ?"
+    params: List[Any] = [user_id, -1 if after_event_id is None else after_event_id]
+    if event_ids is not None:
+        placeholders, ids = _in(event_ids)
+        where += f" AND event_id IN ({placeholders})"
+        params.extend(ids)
+    params.append(limit)
+    rows = conn.execute(
+        f"""
+        SELECT event_id, status, updated_at
+        FROM attendance
+        WHERE {where}
+        ORDER BY event_id
+        LIMIT ?
+        """,
+        params,
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
+@reads
+def find_existing(
+    conn: sqlite3.Connection, event_ids: Iterable[int], user_ids: Iterable[int]
+) -> Tuple[set, Dict[int, str]]:
+    """Ktoré z event_ids existujú a aké roly majú existujúci user_ids."""
+    placeholders, ids = _in(event_ids)
+    events = {r[0] for r in conn.execute(f"SELECT id FROM events WHERE id IN ({placeholders})", ids)}
+    placeholders, ids = _in(user_ids)
+    users = {r[0]: r[1] for r in conn.execute(f"SELECT id, role FROM users WHERE id IN ({placeholders})", ids)}
+    return events, users
+
+
+@writes
+def apply_status_changes(
+    conn: sqlite3.Connection, rows: Sequence[Tuple[int, int, str]], updated_at: Optional[str] = None
+) -> Tuple[List[Tuple[int, int, Optional[str], str]], Optional[Versions]]:
+    """
+    Hromadná zmena v jednej transakcii: načíta aktuálne stavy, zapíše
+    (executemany) len tie, ktoré sa líšia, a vráti diff
+    [(event_id, user_id, starý_status | None, nový_status)] a Versions zápisu.
+    """
+    if not rows:
+        return [], None
+    if conn.in_transaction:
+        conn.commit()
+    # IMMEDIATE = zápisový zámok hneď, aby sa stav medzi čítaním a zápisom nezmenil
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        event_ph, event_ids = _in(r[0] for r in rows)
+        user_ph, user_ids = _in(r[1] for r in rows)
+        current = {
+            (r[0], r[1]): r[2]
+            for r in conn.execute(
+                f"""
+                SELECT event_id, user_id, status FROM attendance
+                WHERE event_id IN ({event_ph}) AND user_id IN ({user_ph})
+                """,
+                (*event_ids, *user_ids),
+            )
+        }
+        diff = [
+            (event_id, user_id, current.get((event_id, user_id)), status)
+            for event_id, user_id, status in rows
+            if current.get((event_id, user_id)) != status
+        ]
+        ts = updated_at or now_timestamp()
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO attendance (event_id, user_id, status, updated_at)
+            VALUES (?, ?, ?, ?)
+            """,
+            [(event_id, user_id, status, ts) for event_id, user_id, _, status in diff],
+        )
+        versions = _versions_after(conn, len(diff))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return diff, versions
+
+
+# ---------- event_attendance_summary ----------
+# Tabuľku udržiavajú triggery (migrácia 3) pri každom zápise do attendance,
+# events a users. Tu je len čítanie, kontrola a prebudovanie od nuly.
+
+_SUMMARY_COLUMNS = "event_id, yes_count, no_count, unknown_count, yes_names, no_names, unknown_names"
+
+
+def _summary_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        "yes_count": row["yes_count"],
+        "no_count": row["no_count"],
+        "unknown_count": row["unknown_count"],
+        # poradie z json_group_array nie je zaručené
+        "yes": sorted(json.loads(row["yes_names"])),
+        "no": sorted(json.loads(row["no_names"])),
+        "unknown": sorted(json.loads(row["unknown_names"])),
+    }
+
+
+@reads
+def get_summaries(
+    conn: sqlite3.Connection, event_ids: Optional[Sequence[int]] = None
+) -> Dict[int, Dict[str, Any]]:
+    """{event_id: {yes_count, no_count, unknown_count, yes, no, unknown}} pre zadané eventy (None = všetky)."""
+    if event_ids is None:
+        rows = conn.execute(f"SELECT {_SUMMARY_COLUMNS} FROM event_attendance_summary").fetchall()
+    else:
+        ids = list(event_ids)
+        if not ids:
+            return {}
+        placeholders = ",".join("?" * len(ids))
+        rows = conn.execute(
+            f"SELECT {_SUMMARY_COLUMNS} FROM event_attendance_summary WHERE event_id IN ({placeholders})",
+            ids,
+        ).fetchall()
+    return {row["event_id"]: _summary_from_row(row) for row in rows}
+
+
+@reads
+def check_summary(conn: sqlite3.Connection) -> List[int]:
+    """Eventy, ktorých riadok v súhrne nesedí s prepočtom od nuly (chýba, prebýva alebo iné čísla/mená)."""
+    rows = conn.execute(f"SELECT {_SUMMARY_COLUMNS} FROM v_event_attendance").fetchall()
+    expected = {row["event_id"]: _summary_from_row(row) for row in rows}
+    actual = get_summaries(conn)
+    return sorted(
+        event_id
+        for event_id in expected.keys() | actual.keys()
+        if expected.get(event_id) != actual.get(event_id)
+    )
+
+
+@writes
+def rebuild_summary(conn: sqlite3.Connection) -> int:
+    """Zahodí súhrn a prepočíta ho z attendance/events/users. Vráti počet riadkov."""
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM event_attendance_summary")
+        cur = conn.execute("INSERT INTO event_attendance_summary SELECT * FROM v_event_attendance")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return cur.rowcount
+
+
+# ---------- export (streamované) ----------
+# Výsledok sa neťahá cez fetchall – kurzor sa číta po dávkach, takže pamäť
+# nerastie s počtom eventov × hráčov. Spojenie musí žiť, kým sa iterátor dočíta.
+
+
+def _event_filter(
+    date_from: Optional[str], date_to: Optional[str], event_type: Optional[str]
+) -> Tuple[str, List[Any]]:
+    # dátumy sú 'YYYY-MM-DD' -> porovnanie TEXT ide cez index
+    clauses, params = ["1 = 1"], []
+    if date_from:
+        clauses.append("e.date >= ?")
+        params.append(date_from)
+    if date_to:
+        clauses.append("e.date <= ?")
+        params.append(date_to)
+    if event_type:
+        clauses.append("e.event_type = ?")
+        params.append(event_type)
+    return " AND ".join(clauses), params
+
+
+def _iter_cursor(cur: sqlite3.Cursor, batch: int) -> Iterator[sqlite3.Row]:
+    try:
+        while True:
+            rows = cur.fetchmany(batch)
+            if not rows:
+                return
+            yield from rows
+    finally:
+        cur.close()
+
+
+@reads
+def iter_attendance_matrix(
+    conn: sqlite3.Connection,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    event_type: Optional[str] = None,
+    batch: int = 1000,
+) -> Iterator[sqlite3.Row]:
+    """Každá bunka matice (event × hráč) ako riadok; hráč bez záznamu = 'unknown'."""
+    where, params = _event_filter(date_from, date_to, event_type)
+    cur = conn.execute(
+        f"""
+        SELECT
+          e.id AS event_id, e.date, e.time_from, e.time_to, e.event_type, e.location,
+          u.id AS user_id, u.username,
+          COALESCE(a.status, 'unknown') AS status,
+          a.updated_at
+        FROM events e
+        JOIN users u ON u.role = 'player'
+        LEFT JOIN attendance a ON a.event_id = e.id AND a.user_id = u.id
+        WHERE {where}
+        ORDER BY e.date, IFNULL(e.time_from, ''), e.id, u.username
+        """,
+        params,
+    )
+    return _iter_cursor(cur, batch)
+
+
+@reads
+def iter_player_summaries(
+    conn: sqlite3.Connection,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    event_type: Optional[str] = None,
+    batch: int = 1000,
+) -> Iterator[sqlite3.Row]:
+    """Súhrn na hráča za vybrané eventy: events_total, yes/no/unknown/missing, percent_yes."""
+    where, params = _event_filter(date_from, date_to, event_type)
+    cur = conn.execute(
+        f"""
+        SELECT
+          u.id AS user_id,
+          u.username,
+          COUNT(e.id) AS events_total,
+          COUNT(*) FILTER (WHERE a.status = 'yes') AS yes_count,
+          COUNT(*) FILTER (WHERE a.status = 'no') AS no_count,
+          COUNT(*) FILTER (WHERE a.status = 'unknown') AS unknown_count,
+          COUNT(e.id) - COUNT(a.status) AS missing_count,
+          ROUND(100.0 * COUNT(*) FILTER (WHERE a.status = 'yes') / NULLIF(COUNT(e.id), 0), 1) AS percent_yes
+        FROM users u
+        LEFT JOIN events e ON {where}
+        LEFT JOIN attendance a ON a.event_id = e.id AND a.user_id = u.id
+        WHERE u.role = 'player'
+        GROUP BY u.id
+        ORDER BY u.username
+        """,
+        params,
+    )
+    return _iter_cursor(cur, batch)
+
+
+@reads
+def iter_training_summaries(conn: sqlite3.Connection, batch: int = 200) -> Iterator[sqlite3.Row]:
+    """Tréningy na hráča (/players): trainings_total, yes/no, missing (unknown aj bez záznamu)."""
+    cur = conn.execute(
+        """
+        SELECT
+          u.id       AS user_id,
+          u.username AS username,
+
+          COUNT(e.id) AS trainings_total,
+
+          SUM(CASE WHEN a.status = 'yes' THEN 1 ELSE 0 END) AS yes_count,
+          SUM(CASE WHEN a.status = 'no' THEN 1 ELSE 0 END)  AS no_count,
+
+          -- unknown berieme ako "nezadané"
+          SUM(CASE WHEN a.status = 'unknown' OR a.status IS NULL THEN 1 ELSE 0 END) AS missing_count
+
+        FROM users u
+        CROSS JOIN events e
+        LEFT JOIN attendance a
+          ON a.user_id = u.id
+         AND a.event_id = e.id
+
+        WHERE u.role = 'player'
+          AND e.event_type = 'training'
+
+        GROUP BY u.id, u.username
+        ORDER BY u.username
+        """
+    )
+    return _iter_cursor(cur, batch)
+
+
+@reads
+def iter_user_trainings(conn: sqlite3.Connection, user_id: int, batch: int = 200) -> Iterator[sqlite3.Row]:
+    """Všetky tréningy od najnovšieho + status usera (bez záznamu = 'unknown')."""
+    cur = conn.execute(
+        """
+        SELECT
+          e.id,
+          e.date,
+          e.time_from,
+          e.time_to,
+          e.location,
+          e.note,
+          COALESCE(a.status, 'unknown') AS status
+        FROM events e
+        LEFT JOIN attendance a
+          ON a.event_id = e.id
+         AND a.user_id = ?
+        WHERE e.event_type = 'training'
+        ORDER BY e.date DESC, e.time_from DESC
+        """,
+        (user_id,),
+    )
+    return _iter_cursor(cur, batch)
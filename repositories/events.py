@@ -1,8 +1,11 @@
 # app/repositories/events.py
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import sqlite3
 
+from database.routing import reads, writes
 
+
+@reads
 def list_events(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
     rows = conn.execute(
         """
@@ -14,6 +17,59 @@ def list_events(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
     return [dict(r) for r in rows]
 
 
+# kľúč stránkovania: (date, IFNULL(time_from, ''), id) – rovnaký ako index ix_events_date_time_id
+EventKey = Tuple[str, str, int]
+
+
+@reads
+def list_events_page(
+    conn: sqlite3.Connection,
+    today: str,
+    past: bool = False,
+    after: Optional[EventKey] = None,
+    limit: int = 50,
+) -> List[Dict[str, Any]]:
+    """
+    Jedna strana udalostí (keyset). Nadchádzajúce (date >= today) od najbližšej,
+    minulé (date < today) od najnovšej. `after` = kľúč posledného riadku
+    predchádzajúcej strany. `today` je 'YYYY-MM-DD', takže porovnanie TEXT
+    dátumov ide cez index a nie cez date() na každom riadku.
+    """
+    if past:
+        where, order, cmp = "date < ?", "DESC", "<"
+    else:
+        where, order, cmp = "date >= ?", "ASC", ">"
+    params: List[Any] = [today]
+    if after is not None:
+        where += f" AND (date, IFNULL(time_from, ''), id) {cmp} (?, ?, ?)"
+        params.extend(after)
+    params.append(limit)
+    rows = conn.execute(
+        f"""
+        SELECT id, event_type, date, time_from, time_to, location, note
+        FROM events
+        WHERE {where}
+        ORDER BY date {order}, IFNULL(time_from, '') {order}, id {order}
+        LIMIT ?
+        """,
+        params,
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
+@reads
+def get_event(conn: sqlite3.Connection, event_id: int) -> Optional[sqlite3.Row]:
+    return conn.execute(
+        """
+        SELECT id, event_type, date, time_from, time_to, location, note
+        FROM events
+        WHERE id = ?
+        """,
+        (event_id,),
+    ).fetchone()
+
+
+@writes
 def insert_event(
     conn: sqlite3.Connection,
     event_type: str,
@@ -32,3 +88,31 @@ def insert_event(
     )
     conn.commit()
     return cur.lastrowid
+
+
+@writes
+def update_event(
+    conn: sqlite3.Connection,
+    event_id: int,
+    event_type: str,
+    date: str,
+    time_from: Optional[str],
+    time_to: Optional[str],
+    location: Optional[str],
+    note: Optional[str],
+) -> None:
+    conn.execute(
+        """
+        UPDATE events
+        SET event_type = ?, date = ?, time_from = ?, time_to = ?, location = ?, note = ?
+        WHERE id = ?
+        """,
+        (event_type, date, time_from, time_to, location, note, event_id),
+    )
+    conn.commit()
+
+
+@writes
+def delete_event(conn: sqlite3.Connection, event_id: int) -> None:
+    conn.execute("DELETE FROM events WHERE id = ?", (event_id,))
+    conn.commit()
@@ -2,16 +2,35 @@
 from typing import List, Dict, Any, Optional
 import sqlite3
 
+from database.routing import reads, writes
+
+@reads
 def list_items(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
     rows = conn.execute(
         "SELECT id, name, description, price FROM items ORDER BY id DESC"
     ).fetchall()
     return [dict(r) for r in rows]
 
+@reads
+def list_items_page(conn: sqlite3.Connection, before_id: Optional[int] = None, limit: int = 100) -> List[Dict[str, Any]]:
+    """Ako list_items, ale jedna strana (keyset cez id): `before_id` = id poslednej položky predošlej strany."""
+    if before_id is None:
+        rows = conn.execute(
+            "SELECT id, name, description, price FROM items ORDER BY id DESC LIMIT ?", (limit,)
+        ).fetchall()
+    else:
+        rows = conn.execute(
+            "SELECT id, name, description, price FROM items WHERE id < ? ORDER BY id DESC LIMIT ?",
+            (before_id, limit),
+        ).fetchall()
+    return [dict(r) for r in rows]
+
+@reads
 def total_price(conn: sqlite3.Connection) -> float:
     row = conn.execute("SELECT SUM(price) AS total FROM items").fetchone()
     return row["total"] if row and row["total"] is not None else 0.0
 
+@writes
 def insert_item(
     conn: sqlite3.Connection,
     name: str,
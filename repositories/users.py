@@ -1,15 +1,34 @@
 import sqlite3
-from typing import Any, Dict, Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
+from database.routing import reads, writes
 
+
+@reads
 def get_user_by_username(conn: sqlite3.Connection, username: str) -> Optional[Dict[str, Any]]:
     row = conn.execute(
-        "SELECT id, username, password_hash, role FROM users WHERE username = ?",
+        "SELECT id, username, password_hash, role, credential_version FROM users WHERE username = ?",
         (username,),
     ).fetchone()
     return dict(row) if row else None
 
 
+@reads
+def get_user_by_id(conn: sqlite3.Connection, user_id: int) -> Optional[Dict[str, Any]]:
+    row = conn.execute(
+        "SELECT id, username, password_hash, role, credential_version FROM users WHERE id = ?",
+        (user_id,),
+    ).fetchone()
+    return dict(row) if row else None
+
+
+@reads
+def list_users(conn: sqlite3.Connection) -> List[sqlite3.Row]:
+    return conn.execute("SELECT id, username, role FROM users ORDER BY username").fetchall()
+
+
+@writes
 def insert_user(
     conn: sqlite3.Connection,
     username: str,
@@ -23,10 +42,67 @@ def insert_user(
     conn.commit()
     return cur.lastrowid
 
-def update_password_hash(user_id: int, password_hash: str) -> None:
-    with get_conn() as c:
-        c.execute(
-            "UPDATE users SET password_hash = ? WHERE id = ?",
+@writes
+def update_password_hash(
+    conn: sqlite3.Connection, user_id: int, password_hash: str, keep_revocations: float
+) -> Tuple[int, float]:
+    """
+    Nové heslo + credential_version o 1 vyššie + záznam do credential_revocations
+    (jedna transakcia). Vráti (nová verzia, čas odvolania). Odvolania staršie
+    ako `keep_revocations` (s) sa zmažú – má to byť absolútne TTL session
+    (config.SESSION_ABSOLUTE_TTL), tokeny z tej doby už aj tak vypršali.
+    """
+    revoked_at = time.time()
+    try:
+        conn.execute(
+            "UPDATE users SET password_hash = ?, credential_version = credential_version + 1 WHERE id = ?",
             (password_hash, user_id),
         )
-        c.commit()
+        version = conn.execute("SELECT credential_version FROM users WHERE id = ?", (user_id,)).fetchone()[0]
+        conn.execute(
+            "INSERT OR REPLACE INTO credential_revocations (user_id, min_version, revoked_at) VALUES (?, ?, ?)",
+            (user_id, version, revoked_at),
+        )
+        conn.execute("DELETE FROM credential_revocations WHERE revoked_at < ?", (revoked_at - keep_revocations,))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return version, revoked_at
+
+
+@writes
+def rehash_password(conn: sqlite3.Connection, user_id: int, old_hash: str, new_hash: str) -> bool:
+    """
+    Ten istý password s novou cenou bcryptu. Len ak sa hash medzitým nezmenil
+    (súbežná zmena hesla vyhrá); credential_version ostáva – session platia ďalej.
+    """
+    cur = conn.execute(
+        "UPDATE users SET password_hash = ? WHERE id = ? AND password_hash = ?",
+        (new_hash, user_id, old_hash),
+    )
+    conn.commit()
+    return cur.rowcount == 1
+
+
+@reads
+def count_password_hash_prefixes(conn: sqlite3.Connection) -> List[Tuple[str, int]]:
+    """[(prefix, počet)] – prefix "$2b$12$" nesie algoritmus a cenu, zvyšok hashu netreba."""
+    return [
+        (r[0], r[1])
+        for r in conn.execute(
+            "SELECT substr(password_hash, 1, 7) AS prefix, COUNT(*) FROM users GROUP BY prefix"
+        )
+    ]
+
+
+@reads
+def list_revocations(conn: sqlite3.Connection, since: float = 0.0) -> List[Tuple[int, int, float]]:
+    """[(user_id, min_version, revoked_at)] odvolané po čase `since`."""
+    return [
+        (r[0], r[1], r[2])
+        for r in conn.execute(
+            "SELECT user_id, min_version, revoked_at FROM credential_revocations WHERE revoked_at > ?",
+            (since,),
+        )
+    ]
@@ -0,0 +1,230 @@
+# app/request_context.py
+"""
+Kontext jedného requestu: používateľ, spojenie do DB a služby – každé
+najviac raz a až keď ho niekto naozaj potrebuje.
+
+Predtým sa používateľ zisťoval dvakrát (middleware aj Depends) a stránky
+ako /me si otvárali vlastné spojenia. Teraz:
+
+    ctx = request_context(request)
+    ctx.user                          # session sa overí len raz
+    svc = ctx.service(AttendanceService)   # jedno spojenie z poolu na celý request
+
+Spojenie vráti do poolu až RequestContextMiddleware, keď je odoslaná celá
+odpoveď (aj streamovaná). Ten istý middleware nastaví počítadlá spojení
+a SQL príkazov (`database.profiler.RequestCounters`) a zbiera ich súhrn
+podľa route pre /admin/db/requests.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
+
+from starlette.requests import HTTPConnection
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+import config
+from database.database import get_read_pool
+from database.pool import ConnectionPool
+from database.profiler import RequestCounters, request_counters
+from services.auth import User
+from services.session import SESSION_COOKIE_NAME, session_store, set_session_cookie
+
+S = TypeVar("S")
+
+_UNRESOLVED = object()
+
+
+class RequestContext:
+    def __init__(self, scope: Scope, managed: bool = True) -> None:
+        self._scope = scope
+        # managed=False: vznikol mimo middleware (nikto by nevrátil spojenie)
+        self._managed = managed
+        self._user: Any = _UNRESOLVED
+        self._conn: Optional[sqlite3.Connection] = None
+        # spojenia z iných poolov (export), vrátia sa tiež v close()
+        self._borrowed: List[Tuple[ConnectionPool, sqlite3.Connection]] = []
+        self._services: Dict[type, Any] = {}
+        self.counters = RequestCounters()
+        self.started = time.perf_counter()
+
+    # ---------- používateľ ----------
+
+    @property
+    def session_id(self) -> Optional[str]:
+        return HTTPConnection(self._scope).cookies.get(SESSION_COOKIE_NAME)
+
+    @property
+    def user(self) -> Optional[User]:
+        if self._user is _UNRESOLVED:
+            self._user = session_store.get_user(self.session_id)
+        return self._user
+
+    @property
+    def user_resolved(self) -> bool:
+        return self._user is not _UNRESOLVED
+
+    # ---------- spojenie a služby ----------
+
+    def _check_managed(self) -> None:
+        if not self._managed:
+            raise RuntimeError("RequestContextMiddleware nie je zapojený – spojenie by sa nevrátilo do poolu")
+
+    def connection(self) -> sqlite3.Connection:
+        """Spojenie requestu; blokujúco – volať z vlákna (sync handler, DB executor)."""
+        if self._conn is None:
+            self._check_managed()
+            self._conn = get_read_pool().acquire()
+        return self._conn
+
+    async def connection_async(self) -> sqlite3.Connection:
+        """Ako connection(), ale na voľné spojenie čaká v event loope."""
+        if self._conn is None:
+            self._check_managed()
+            self._conn = await get_read_pool().acquire_async()
+        return self._conn
+
+    async def borrow_async(self, pool: ConnectionPool) -> sqlite3.Connection:
+        """Ďalšie spojenie z iného poolu (čaká sa v event loope); vráti ho close() po odoslaní odpovede."""
+        self._check_managed()
+        conn = await pool.acquire_async()
+        self._borrowed.append((pool, conn))
+        return conn
+
+    def service(self, cls: Type[S]) -> S:
+        """Jedna inštancia služby na request, nad spojením requestu."""
+        svc = self._services.get(cls)
+        if svc is None:
+            svc = self._services[cls] = cls(self.connection())
+        return svc
+
+    async def service_async(self, cls: Type[S]) -> S:
+        await self.connection_async()
+        return self.service(cls)
+
+    def close(self) -> None:
+        conn, self._conn = self._conn, None
+        borrowed, self._borrowed = self._borrowed, []
+        self._services.clear()
+        if conn is not None:
+            get_read_pool().release(conn)
+        for pool, extra in borrowed:
+            pool.release(extra)
+
+
+def request_context(request: HTTPConnection) -> RequestContext:
+    """Kontext requestu (aj ako FastAPI dependency)."""
+    state = request.scope.setdefault("state", {})
+    ctx = state.get("ctx")
+    if ctx is None:
+        ctx = state["ctx"] = RequestContext(request.scope, managed=False)
+    return ctx
+
+
+class RequestStats:
+    """Súhrn počítadiel podľa route: koľko spojení a príkazov stojí jeden request."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Dict[str, float]] = {}
+
+    def record(self, route: str, ctx: RequestContext) -> None:
+        elapsed = time.perf_counter() - ctx.started
+        connections, statements = ctx.counters.connections, ctx.counters.statements
+        with self._lock:
+            st = self._routes.get(route)
+            if st is None:
+                st = self._routes[route] = {
+                    "requests": 0, "connections": 0, "statements": 0, "time": 0.0,
+                    "max_connections": 0, "max_statements": 0, "multi_connection": 0,
+                }
+            st["requests"] += 1
+            st["connections"] += connections
+            st["statements"] += statements
+            st["time"] += elapsed
+            st["max_connections"] = max(st["max_connections"], connections)
+            st["max_statements"] = max(st["max_statements"], statements)
+            if connections > 1:
+                st["multi_connection"] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            out = [
+                {
+                    "route": route,
+                    "requests": st["requests"],
+                    "connections_mean": round(st["connections"] / st["requests"], 3),
+                    "connections_max": st["max_connections"],
+                    "multi_connection_requests": st["multi_connection"],
+                    "statements_mean": round(st["statements"] / st["requests"], 3),
+                    "statements_max": st["max_statements"],
+                    "mean_ms": round(st["time"] * 1000 / st["requests"], 3),
+                }
+                for route, st in self._routes.items()
+            ]
+        out.sort(key=lambda r: r["statements_mean"] * r["requests"], reverse=True)
+        return out
+
+
+request_stats = RequestStats()
+
+
+class RequestContextMiddleware:
+    """
+    Čistý ASGI middleware (nie BaseHTTPMiddleware): beží, kým sa neodošle
+    posledný kúsok odpovede, takže spojenie sa vráti až po streamovanom tele.
+
+    Pri podpísaných session navyše pred hlavičkami prepodpíše cookie
+    (posunie idle TTL), ak request používateľa naozaj overoval.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        ctx = RequestContext(scope)
+        scope.setdefault("state", {})["ctx"] = ctx
+        token = request_counters.set(ctx.counters)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                self._reissue_cookie(ctx, headers)
+                if config.REQUEST_DB_HEADERS:
+                    headers.append((b"x-db-connections", str(ctx.counters.connections).encode()))
+                    headers.append((b"x-db-statements", str(ctx.counters.statements).encode()))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_counters.reset(token)
+            ctx.close()
+            route = scope.get("route")
+            request_stats.record(getattr(route, "path", None) or "(iné)", ctx)
+
+    @staticmethod
+    def _reissue_cookie(ctx: RequestContext, headers: List[Any]) -> None:
+        if not ctx.user_resolved or ctx.user is None:
+            return
+        # login/logout/zmena hesla si cookie nastavujú samy
+        prefix = SESSION_COOKIE_NAME.encode() + b"="
+        if any(k.lower() == b"set-cookie" and v.startswith(prefix) for k, v in headers):
+            return
+        new_id = session_store.reissue(ctx.session_id)
+        if new_id:
+            carrier = Response()
+            set_session_cookie(carrier, new_id)
+            headers.extend(h for h in carrier.raw_headers if h[0] == b"set-cookie")
@@ -1,4 +1,4 @@
-from database.database import open_connection
+from database.database import open_connection, close_pool
 from services.auth import AuthService
 
 def upsert_user(username: str, password: str, role: str):
@@ -29,3 +29,4 @@ def upsert_user(username: str, password: str, role: str):
 if __name__ == "__main__":
     upsert_user("coach", "coach123", "coach")
     upsert_user("player1", "player123", "player")
+    close_pool()
@@ -1,61 +1,137 @@
 from __future__ import annotations
-from typing import Dict, List, Any
-from database.database import open_connection
+import asyncio
+import datetime
+from typing import Dict, Iterator, List, Any, Optional, Sequence, Tuple
+import config
+from database.database import create_connection, get_read_pool
+from database.executor import AsyncProxy
+from database.group_commit import GroupCommitQueue
+from services.attendance_matrix import CODES, MISSING, UNKNOWN, attendance_matrix, compute_trends
+from services.fragment_cache import event_row_cache
+from repositories.attendance import (
+    apply_status_changes as repo_apply_status_changes,
+    check_summary as repo_check_summary,
+    find_existing as repo_find_existing,
+    get_statuses_for_events as repo_get_statuses_for_events,
+    get_summaries as repo_get_summaries,
+    get_user_timeline as repo_get_user_timeline,
+    list_user_statuses as repo_list_user_statuses,
+    iter_training_summaries as repo_iter_training_summaries,
+    iter_user_trainings as repo_iter_user_trainings,
+    now_timestamp,
+    rebuild_summary as repo_rebuild_summary,
+    set_status as repo_set_status,
+    set_statuses as repo_set_statuses,
+)
+
+STATUSES = ("yes", "unknown", "no")
+# max. zmien v jednej hromadnej požiadavke (jedna transakcia)
+BULK_MAX_CHANGES = 5000
+
+
+class BulkAttendanceError(ValueError):
+    """Hromadná zmena neprešla validáciou; `errors` sú všetky chyby naraz."""
+
+    def __init__(self, errors: List[str]) -> None:
+        super().__init__("; ".join(errors[:5]))
+        self.errors = errors
+
+
+def _apply_rsvps(conn, rows: Sequence[Tuple[int, int, str]]) -> None:
+    updated_at = now_timestamp()
+    versions = repo_set_statuses(conn, rows, updated_at)
+    # až po commite – matica nesmie predbehnúť DB
+    attendance_matrix.apply(rows, updated_at, versions)
+    _invalidate_rows(rows)
+
+
+def _invalidate_rows(rows: Sequence[Tuple[int, int, str]]) -> None:
+    # riadky /events týchto udalostí majú nový súhrn dochádzky
+    for event_id in {row[0] for row in rows}:
+        event_row_cache.invalidate(event_id)
+
+
+# RSVP z events.html: čo príde v rámci pár ms, ide jedným commitom
+rsvp_queue = GroupCommitQueue(
+    _apply_rsvps,
+    connect=create_connection,
+    key=lambda row: (row[0], row[1]),  # (event_id, user_id)
+    window_ms=config.RSVP_BATCH_WINDOW_MS,
+    max_batch=config.RSVP_MAX_BATCH,
+    name="rsvp-writer",
+)
+
 
 class AttendanceService:
     def __init__(self, conn=None):
-        # ak sa neodovzdá conn, otvoríme si ho sami
+        # ak sa neodovzdá conn, požičiame si ho z poolu
         self.conn = conn
 
+    @property
+    def aio(self) -> "AsyncProxy[AttendanceService]":
+        """Awaitable varianty metód, bežia na DB executore."""
+        return AsyncProxy(self)
+
     def _get_conn(self):
-        # helper: buď používame self.conn, alebo otvoríme connection
+        # helper: buď používame self.conn, alebo si spojenie požičiame z poolu
         if self.conn is not None:
             return self.conn, None
-        ctx = open_connection()
+        ctx = get_read_pool().connection()
         return ctx.__enter__(), ctx
 
-    def get_statuses_for_user(self, user_id: int) -> Dict[int, str]:
+    def get_statuses_for_user(self, user_id: int, event_ids: Optional[Sequence[int]] = None) -> Dict[int, str]:
+        """{event_id: status} pre usera; `event_ids` = len tieto eventy (None = všetky)."""
         conn, ctx = self._get_conn()
         try:
-            cur = conn.execute(
-                """
-                SELECT event_id, status
-                FROM attendance
-                WHERE user_id = ?
-                """,
-                (user_id,),
-            )
+            if event_ids is None:
+                cur = conn.execute(
+                    """
+                    SELECT event_id, status
+                    FROM attendance
+                    WHERE user_id = ?
+                    """,
+                    (user_id,),
+                )
+            else:
+                ids = list(event_ids)
+                if not ids:
+                    return {}
+                placeholders = ",".join("?" * len(ids))
+                cur = conn.execute(
+                    f"""
+                    SELECT event_id, status
+                    FROM attendance
+                    WHERE user_id = ? AND event_id IN ({placeholders})
+                    """,
+                    (user_id, *ids),
+                )
             return {row["event_id"]: row["status"] for row in cur.fetchall()}
         finally:
             if ctx is not None:
                 ctx.__exit__(None, None, None)
 
-    def get_event_overview(self, event_id: int) -> Dict[str, List[str]]:
+    def list_user_statuses(self, user_id: int, after_event_id: Optional[int] = None, limit: int = 100,
+                           event_ids: Optional[Sequence[int]] = None) -> List[Dict[str, Any]]:
+        """Jedna strana [{event_id, status, updated_at}] usera podľa event_id (API)."""
+        conn, ctx = self._get_conn()
+        try:
+            return repo_list_user_statuses(conn, user_id, after_event_id, limit, event_ids)
+        finally:
+            if ctx is not None:
+                ctx.__exit__(None, None, None)
+
+    def get_event_overview(self, event_id: int) -> Dict[str, Any]:
         """
         Pre konkrétny event vráti:
-        {"yes":[...], "no":[...], "unknown":[...]}
-        Unknown = hráči bez záznamu v attendance
+        {"yes":[...], "no":[...], "unknown":[...], "yes_count": n, ...}
+        Unknown = hráči bez záznamu v attendance. Číta sa z event_attendance_summary.
         """
         conn, ctx = self._get_conn()
         try:
-            cur = conn.execute(
-                """
-                SELECT
-                    u.username,
-                    COALESCE(a.status, 'unknown') AS status
-                FROM users u
-                LEFT JOIN attendance a
-                  ON a.user_id = u.id AND a.event_id = ?
-                WHERE u.role = 'player'
-                ORDER BY u.username
-                """,
-                (event_id,),
-            )
-
-            out = {"yes": [], "unknown": [], "no": []}
-            for row in cur.fetchall():
-                out[row["status"]].append(row["username"])
-            return out
+            summary = repo_get_summaries(conn, [event_id]).get(event_id)
+            if summary is None:
+                return {"yes": [], "unknown": [], "no": [], "yes_count": 0, "unknown_count": 0, "no_count": 0}
+            return summary
         finally:
             if ctx is not None:
                 ctx.__exit__(None, None, None)
@@ -65,24 +141,97 @@ class AttendanceService:
         Uloží (insert/replace) status dochádzky pre usera na event.
         status: "yes" | "unknown" | "no"
         """
-        if status not in ("yes", "unknown", "no"):
+        if status not in STATUSES:
             raise ValueError("Invalid status")
 
+        if config.RSVP_GROUP_COMMIT:
+            # čaká, kým je dávka s týmto zápisom commitnutá
+            rsvp_queue.submit((event_id, user_id, status)).result()
+            return
+
         conn, ctx = self._get_conn()
         try:
-            # najjednoduchšie: SQLite "upsert" cez INSERT OR REPLACE
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO attendance (event_id, user_id, status)
-                VALUES (?, ?, ?)
-                """,
-                (event_id, user_id, status),
-            )
-            conn.commit()
+            updated_at = now_timestamp()
+            versions = repo_set_status(conn, event_id, user_id, status, updated_at)
+            attendance_matrix.apply([(event_id, user_id, status)], updated_at, versions)
+            event_row_cache.invalidate(event_id)
         finally:
             if ctx is not None:
                 ctx.__exit__(None, None, None)
 
+    async def set_status_async(self, event_id: int, user_id: int, status: str) -> None:
+        """Ako set_status, ale pri group commite nedrží vlákno, kým čaká na commit."""
+        if status not in STATUSES:
+            raise ValueError("Invalid status")
+
+        if config.RSVP_GROUP_COMMIT:
+            await asyncio.wrap_future(rsvp_queue.submit((event_id, user_id, status)))
+            return
+        await self.aio.set_status(event_id, user_id, status)
+
+    def get_statuses_for_events(self, event_ids: Sequence[int]) -> Dict[Tuple[int, int], str]:
+        conn, ctx = self._get_conn()
+        try:
+            return repo_get_statuses_for_events(conn, event_ids)
+        finally:
+            if ctx is not None:
+                ctx.__exit__(None, None, None)
+
+    def bulk_set_statuses(self, changes: Sequence[Tuple[int, int, str]]) -> Dict[str, Any]:
+        """
+        Hromadná zmena dochádzky (tréner opravuje, kto reálne prišiel).
+        changes: [(event_id, user_id, status), ...]
+
+        Validuje všetko naraz (BulkAttendanceError so zoznamom chýb, nič sa
+        nezapíše), potom jedna transakcia s executemany len pre zmenené bunky.
+        Vráti {"received", "applied", "unchanged", "diff": [[event_id, user_id, starý, nový], ...]}.
+        """
+        if len(changes) > BULK_MAX_CHANGES:
+            raise BulkAttendanceError([f"Príliš veľa zmien naraz (max {BULK_MAX_CHANGES})"])
+
+        errors: List[str] = []
+        latest: Dict[Tuple[int, int], str] = {}
+        for i, (event_id, user_id, status) in enumerate(changes):
+            if status not in STATUSES:
+                errors.append(f"#{i}: neplatný status {status!r}")
+                continue
+            key = (event_id, user_id)
+            if latest.get(key, status) != status:
+                errors.append(f"#{i}: protichodné zmeny pre udalosť {event_id}, hráča {user_id}")
+            latest[key] = status
+
+        conn, ctx = self._get_conn()
+        try:
+            # existencia sa overuje aj pre riadky s chybným statusom – všetky chyby naraz
+            event_ids = {e for e, _, _ in changes}
+            user_ids = {u for _, u, _ in changes}
+            events, users = repo_find_existing(conn, event_ids, user_ids)
+            for event_id in sorted(event_ids - events):
+                errors.append(f"Udalosť {event_id} neexistuje")
+            for user_id in sorted(user_ids):
+                if user_id not in users:
+                    errors.append(f"Používateľ {user_id} neexistuje")
+                elif users[user_id] != "player":
+                    errors.append(f"Používateľ {user_id} nie je hráč")
+            if errors:
+                raise BulkAttendanceError(errors)
+
+            updated_at = now_timestamp()
+            diff, versions = repo_apply_status_changes(conn, [(e, u, st) for (e, u), st in latest.items()], updated_at)
+        finally:
+            if ctx is not None:
+                ctx.__exit__(None, None, None)
+
+        applied = [(e, u, new) for e, u, _, new in diff]
+        attendance_matrix.apply(applied, updated_at, versions)
+        _invalidate_rows(applied)
+        return {
+            "received": len(changes),
+            "applied": len(diff),
+            "unchanged": len(latest) - len(diff),
+            "diff": [list(d) for d in diff],
+        }
+
     def list_events(self):
         conn, ctx = self._get_conn()
         try:
@@ -93,43 +242,35 @@ class AttendanceService:
             if ctx is not None:
                 ctx.__exit__(None, None, None)
 
-    def get_attendance_overview(self) -> Dict[int, Dict[str, List[str]]]:
+    def get_attendance_overview(self, event_ids: Optional[Sequence[int]] = None) -> Dict[int, Dict[str, Any]]:
         """
-        Vráti pre každý event_id zoznam hráčov podľa statusu:
-        { event_id: {"yes": [...], "unknown": [...], "no": [...]} }
+        Vráti pre každý event_id zoznam hráčov podľa statusu aj počty:
+        { event_id: {"yes": [...], "unknown": [...], "no": [...], "yes_count": n, ...} }
 
-        POZOR: musí zahŕňať aj hráčov bez záznamu (unknown),
-        preto to robíme cez users LEFT JOIN attendance.
+        Číta sa z materializovaného event_attendance_summary (udržiavajú ho triggery),
+        takže cena je O(zobrazených eventov), nie eventy × hráči.
+        `event_ids` = len tieto eventy (None = všetky).
         """
         conn, ctx = self._get_conn()
         try:
-            cur = conn.execute(
-                """
-                SELECT
-                    e.id AS event_id,
-                    u.username,
-                    COALESCE(a.status, 'unknown') AS status
-                FROM events e
-                CROSS JOIN users u
-                LEFT JOIN attendance a
-                  ON a.event_id = e.id AND a.user_id = u.id
-                WHERE u.role = 'player'
-                ORDER BY e.id, u.username
-                """
-            )
-
-            out: Dict[int, Dict[str, List[str]]] = {}
-            for row in cur.fetchall():
-                ev_id = row["event_id"]
-                st = row["status"]
-                name = row["username"]
-
-                if ev_id not in out:
-                    out[ev_id] = {"yes": [], "unknown": [], "no": []}
+            return repo_get_summaries(conn, event_ids)
+        finally:
+            if ctx is not None:
+                ctx.__exit__(None, None, None)
 
-                out[ev_id][st].append(name)
+    def check_summary(self) -> List[int]:
+        """Eventy, ktorých súhrn nesedí s prepočtom od nuly (prázdny zoznam = všetko sedí)."""
+        conn, ctx = self._get_conn()
+        try:
+            return repo_check_summary(conn)
+        finally:
+            if ctx is not None:
+                ctx.__exit__(None, None, None)
 
-            return out
+    def rebuild_summary(self) -> int:
+        conn, ctx = self._get_conn()
+        try:
+            return repo_rebuild_summary(conn)
         finally:
             if ctx is not None:
                 ctx.__exit__(None, None, None)
@@ -138,51 +279,39 @@ class AttendanceService:
         """
         Vráti štatistiku dochádzky hráča:
         total_events, going, not_going, maybe, no_response, percent_going
+        (going = yes, not_going = no, maybe = unknown, no_response = bez záznamu)
         """
         conn, ctx = self._get_conn()
         try:
-            # 1) všetky eventy (voliteľne len minulé)
-            if only_past:
-                total_row = conn.execute(
-                    "SELECT COUNT(*) AS cnt FROM events WHERE date(event_date) <= date('now')"
-                ).fetchone()
-            else:
-                total_row = conn.execute(
-                    "SELECT COUNT(*) AS cnt FROM events"
-                ).fetchone()
+            if config.ATTENDANCE_MATRIX:
+                return attendance_matrix.user_stats(conn, user_id, only_past=only_past)
 
-            total_events = int(total_row["cnt"] or 0)
+            # dátumy sú 'YYYY-MM-DD', takže stačí porovnať text s dneškom (ide cez index)
+            today = datetime.date.today().isoformat()
+            date_filter = "WHERE date <= ?" if only_past else ""
+            params: Tuple[Any, ...] = (today,) if only_past else ()
 
-            # 2) rozdelenie podľa statusov pre usera
-            # (uprav si názvy statusov podľa toho, čo ukladáš: napr. 'yes'/'no'/'maybe')
-            if only_past:
-                rows = conn.execute(
-                    """
-                    SELECT a.status, COUNT(*) AS cnt
-                    FROM attendance a
-                    JOIN events e ON e.id = a.event_id
-                    WHERE a.user_id = ?
-                      AND date(e.event_date) <= date('now')
-                    GROUP BY a.status
-                    """,
-                    (user_id,),
-                ).fetchall()
-            else:
-                rows = conn.execute(
-                    """
-                    SELECT status, COUNT(*) AS cnt
-                    FROM attendance
-                    WHERE user_id = ?
-                    GROUP BY status
-                    """,
-                    (user_id,),
-                ).fetchall()
+            total_row = conn.execute(
+                f"SELECT COUNT(*) AS cnt FROM events {date_filter}", params
+            ).fetchone()
+            total_events = int(total_row["cnt"] or 0)
 
+            rows = conn.execute(
+                f"""
+                SELECT a.status, COUNT(*) AS cnt
+                FROM attendance a
+                JOIN events e ON e.id = a.event_id
+                WHERE a.user_id = ?
+                  {"AND e.date <= ?" if only_past else ""}
+                GROUP BY a.status
+                """,
+                (user_id, *params),
+            ).fetchall()
             by_status = {r["status"]: int(r["cnt"]) for r in rows}
 
-            going = by_status.get("going", 0)  # alebo "yes"
-            not_going = by_status.get("not_going", 0)  # alebo "no"
-            maybe = by_status.get("maybe", 0)
+            going = by_status.get("yes", 0)
+            not_going = by_status.get("no", 0)
+            maybe = by_status.get("unknown", 0)
 
             responded = going + not_going + maybe
             no_response = max(total_events - responded, 0)
@@ -203,37 +332,48 @@ class AttendanceService:
             if ctx is not None:
                 ctx.__exit__(None, None, None)
 
-    def get_players_training_summary(self):
+    def get_player_trends(self, user_id: int) -> Dict[str, Any]:
+        """
+        Séria účastí (aktuálna / najdlhšia), účasť za posledné týždne a v sezóne,
+        čas poslednej odpovede + kľúče z get_user_stats (len minulé udalosti).
+        S maticou je to lookup udržiavaný pri RSVP, bez nej jeden prechod cez udalosti.
+        """
         conn, ctx = self._get_conn()
         try:
-            rows = conn.execute(
-                """
-                SELECT
-                  u.id       AS user_id,
-                  u.username AS username,
-
-                  COUNT(e.id) AS trainings_total,
-
-                  SUM(CASE WHEN a.status = 'yes' THEN 1 ELSE 0 END) AS yes_count,
-                  SUM(CASE WHEN a.status = 'no' THEN 1 ELSE 0 END)  AS no_count,
-
-                  -- unknown berieme ako "nezadané" (alebo si môžeš spraviť vlastný stĺpec)
-                  SUM(CASE WHEN a.status = 'unknown' OR a.status IS NULL THEN 1 ELSE 0 END) AS missing_count
-
-                FROM users u
-                CROSS JOIN events e
-                LEFT JOIN attendance a
-                  ON a.user_id = u.id
-                 AND a.event_id = e.id
+            if config.ATTENDANCE_MATRIX:
+                return attendance_matrix.player_trends(conn, user_id)
+            timeline, last_response = repo_get_user_timeline(conn, user_id)
+            trends = compute_trends(
+                [date for date, _ in timeline],
+                [CODES.get(status, UNKNOWN) if status else MISSING for _, status in timeline],
+                datetime.date.today().isoformat(),
+            )
+            return {**trends, "last_response_at": last_response}
+        finally:
+            if ctx is not None:
+                ctx.__exit__(None, None, None)
 
-                WHERE u.role = 'player'
-                  AND e.event_type = 'training'
+    def get_players_training_summary(self):
+        conn, ctx = self._get_conn()
+        try:
+            if config.ATTENDANCE_MATRIX:
+                return attendance_matrix.players_training_summary(conn)
+            return [dict(r) for r in repo_iter_training_summaries(conn)]
+        finally:
+            if ctx is not None:
+                ctx.__exit__(None, None, None)
 
-                GROUP BY u.id, u.username
-                ORDER BY u.username;
-                """
-            ).fetchall()
-            return [dict(r) for r in rows]
+    def iter_players_training_summary(self) -> Iterator[Any]:
+        """
+        Ako get_players_training_summary, ale riadky idú rovno z kurzora
+        (streamovaná /players). Spojenie drží, kým sa iterátor nedočíta alebo nezavrie.
+        """
+        conn, ctx = self._get_conn()
+        try:
+            if config.ATTENDANCE_MATRIX:
+                yield from attendance_matrix.players_training_summary(conn)
+            else:
+                yield from repo_iter_training_summaries(conn)
         finally:
             if ctx is not None:
                 ctx.__exit__(None, None, None)
@@ -241,6 +381,9 @@ class AttendanceService:
     def get_my_trainings_yes(self, user_id: int):
         conn, ctx = self._get_conn()
         try:
+            if config.ATTENDANCE_MATRIX:
+                return attendance_matrix.my_trainings(conn, user_id, only_yes=True)
+
             rows = conn.execute(
                 """
                 SELECT
@@ -265,6 +408,7 @@ class AttendanceService:
         finally:
             if ctx is not None:
                 ctx.__exit__(None, None, None)
+
     def get_my_training_summary(self, user_id: int) -> Dict[str, Any]:
         """
         Štatistika pre jedného hráča len pre tréningy:
@@ -272,6 +416,9 @@ class AttendanceService:
         """
         conn, ctx = self._get_conn()
         try:
+            if config.ATTENDANCE_MATRIX:
+                return attendance_matrix.my_training_summary(conn, user_id)
+
             row = conn.execute(
                 """
                 SELECT
@@ -305,26 +452,21 @@ class AttendanceService:
         """
         conn, ctx = self._get_conn()
         try:
-            rows = conn.execute(
-                """
-                SELECT
-                  e.id,
-                  e.date,
-                  e.time_from,
-                  e.time_to,
-                  e.location,
-                  e.note,
-                  COALESCE(a.status, 'unknown') AS status
-                FROM events e
-                LEFT JOIN attendance a
-                  ON a.event_id = e.id
-                 AND a.user_id = ?
-                WHERE e.event_type = 'training'
-                ORDER BY e.date DESC, e.time_from DESC;
-                """,
-                (user_id,),
-            ).fetchall()
-            return [dict(r) for r in rows]
+            if config.ATTENDANCE_MATRIX:
+                return attendance_matrix.my_trainings(conn, user_id)
+            return [dict(r) for r in repo_iter_user_trainings(conn, user_id)]
+        finally:
+            if ctx is not None:
+                ctx.__exit__(None, None, None)
+
+    def iter_my_trainings(self, user_id: int) -> Iterator[Any]:
+        """get_my_trainings ako lazy iterátor (streamovaná /me)."""
+        conn, ctx = self._get_conn()
+        try:
+            if config.ATTENDANCE_MATRIX:
+                yield from attendance_matrix.my_trainings(conn, user_id)
+            else:
+                yield from repo_iter_user_trainings(conn, user_id)
         finally:
             if ctx is not None:
                 ctx.__exit__(None, None, None)
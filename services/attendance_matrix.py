@@ -0,0 +1,517 @@
+# app/services/attendance_matrix.py
+"""
+Hustá matica používatelia × udalosti so stavom dochádzky.
+
+Načíta sa raz (users, events, attendance) a potom sa len aktualizuje:
+RSVP zapíše do matice jednu bunku, zmena udalostí / používateľov maticu
+zneplatní a pri ďalšom čítaní sa načíta nanovo. Súhrny pre /players a /me
+(počty yes/no/missing, percentá, počty na event) sú potom vektorové
+redukcie nad maticou namiesto CROSS JOIN dotazov.
+
+- s NumPy: matica int8, redukcie cez (M[:, maska] == kód).sum(axis=1)
+- bez NumPy (je voliteľná): každý stav je bitset (Python int) na riadok,
+  počty cez (riadok & maska).bit_count() – 64 udalostí na jednu inštrukciu
+
+Nad maticou sú aj trendy hráča (séria účastí, účasť za posledné týždne
+a v sezóne, posledná odpoveď) – počítajú sa raz na hráča a deň a RSVP
+ich prepočíta len pre dotknutého hráča, takže /attendance/stats a /me
+ich len prečítajú.
+
+Matica je v pamäti procesu. Zápisy z iného procesu (ďalší worker, CLI
+skript, ručná úprava DB) zachytí počítadlo data_version (migrácia 6,
+zvyšujú ho triggery): každé čítanie ho porovná s verziou matice a pri
+rozdiele ju načíta nanovo. Vlastné zápisy posielajú do apply() verzie
+pred a po zápise, takže maticu len aktualizujú.
+"""
+from __future__ import annotations
+
+import bisect
+import datetime
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import config
+from repositories.attendance import Versions, data_version
+
+# numpy (voliteľná) sa importuje až pri prvom načítaní matice – štart workera ju nepotrebuje
+np: Any = None
+_numpy_checked = False
+
+
+def _numpy() -> Any:
+    """Modul numpy alebo None, ak nie je nainštalovaná."""
+    global np, _numpy_checked
+    if not _numpy_checked:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        np, _numpy_checked = numpy, True
+    return np
+
+# kódy v bunkách; MISSING = bez záznamu v attendance
+MISSING, YES, NO, UNKNOWN = 0, 1, 2, 3
+CODES = {"yes": YES, "no": NO, "unknown": UNKNOWN}
+# ako to vracia SQL cez COALESCE(a.status, 'unknown')
+STATUS_NAMES = {MISSING: "unknown", YES: "yes", NO: "no", UNKNOWN: "unknown"}
+
+
+def season_start(day: datetime.date) -> datetime.date:
+    """Začiatok sezóny, do ktorej patrí `day` (config.SEASON_START = 'MM-DD')."""
+    month, dom = (int(part) for part in config.SEASON_START.split("-"))
+    start = datetime.date(day.year, month, dom)
+    return start if start <= day else start.replace(year=day.year - 1)
+
+
+def compute_trends(dates: Sequence[str], codes: Sequence[int], today: str) -> Dict[str, Any]:
+    """
+    Metriky hráča z jeho riadku: `dates` a `codes` sú zoradené chronologicky
+    (stĺpce matice), rátajú sa len udalosti s date <= today.
+
+    Séria = po sebe idúce udalosti s "yes"; "no", "unknown" aj chýbajúca
+    odpoveď ju prerušia. Kľúče total_events … percent_going sú tie isté ako
+    v get_user_stats.
+    """
+    day = datetime.date.fromisoformat(today)
+    n_past = bisect.bisect_right(dates, today)
+    window_from = bisect.bisect_right(dates, (day - datetime.timedelta(days=config.TREND_WINDOW_DAYS)).isoformat())
+    season = season_start(day).isoformat()
+    season_from = bisect.bisect_left(dates, season)
+
+    counts = [0, 0, 0, 0]
+    run = longest = 0
+    for code in codes[:n_past]:
+        counts[code] += 1
+        if code == YES:
+            run += 1
+            if run > longest:
+                longest = run
+        else:
+            run = 0
+
+    def rate(start: int) -> Tuple[int, int, Optional[float]]:
+        total = n_past - start
+        yes = sum(1 for code in codes[start:n_past] if code == YES)
+        return total, yes, (round(yes / total * 100, 1) if total else None)
+
+    window_events, window_yes, window_percent = rate(window_from)
+    season_events, season_yes, season_percent = rate(season_from)
+    going, not_going, maybe = counts[YES], counts[NO], counts[UNKNOWN]
+    return {
+        "as_of": today,
+        "total_events": n_past,
+        "going": going,
+        "not_going": not_going,
+        "maybe": maybe,
+        "no_response": counts[MISSING],
+        "percent_going": round(going / n_past * 100, 1) if n_past else 0,
+        "current_streak": run,
+        "longest_streak": longest,
+        "window_days": config.TREND_WINDOW_DAYS,
+        "window_events": window_events,
+        "window_yes": window_yes,
+        "window_percent": window_percent,
+        "season_start": season,
+        "season_events": season_events,
+        "season_yes": season_yes,
+        "season_percent": season_percent,
+    }
+
+
+USER_STATS_KEYS = ("total_events", "going", "not_going", "maybe", "no_response", "percent_going")
+
+
+class _NumpyCells:
+    backend = "numpy"
+
+    def __init__(self, users: int, events: int) -> None:
+        self.m = np.zeros((users, events), dtype=np.int8)
+
+    def load(self, cells: Sequence[Tuple[int, int, int]], user_index: Dict[int, int],
+             event_index: Dict[int, int]) -> None:
+        if not cells:
+            return
+        arr = np.array(cells, dtype=np.int64)  # (event_id, user_id, kód)
+        cols = self._positions(event_index, arr[:, 0])
+        rows = self._positions(user_index, arr[:, 1])
+        ok = (rows >= 0) & (cols >= 0)
+        self.m[rows[ok], cols[ok]] = arr[ok, 2]
+
+    @staticmethod
+    def _positions(index: Dict[int, int], ids: Any) -> Any:
+        """id -> pozícia v matici cez lookup pole; neznáme id = -1."""
+        table = np.full(max(max(index, default=0), int(ids.max())) + 1, -1, dtype=np.int64)
+        if index:
+            table[np.fromiter(index.keys(), dtype=np.int64, count=len(index))] = np.fromiter(
+                index.values(), dtype=np.int64, count=len(index)
+            )
+        return table[ids]
+
+    def set(self, row: int, col: int, code: int) -> None:
+        self.m[row, col] = code
+
+    def mask(self, flags: Sequence[bool]) -> Any:
+        return np.asarray(flags, dtype=bool)
+
+    def counts(self, cols: Any, rows: Any) -> Dict[int, List[int]]:
+        """{kód: počet buniek s kódom v stĺpcoch `cols` pre každý riadok z `rows`}."""
+        sub = self.m[np.ix_(rows, cols)]  # jedna kópia pre všetky kódy
+        return {code: np.count_nonzero(sub == code, axis=1).tolist() for code in (MISSING, YES, NO, UNKNOWN)}
+
+    def row_counts(self, row: int, cols: Any) -> Dict[int, int]:
+        return dict(zip(range(4), np.bincount(self.m[row, cols], minlength=4).tolist()))
+
+    def row(self, row: int) -> List[int]:
+        return self.m[row].tolist()
+
+    def column_counts(self, code: int, rows: Any) -> List[int]:
+        return np.count_nonzero(self.m[rows] == code, axis=0).tolist()
+
+
+class _BitsetCells:
+    backend = "bitset"
+
+    def __init__(self, users: int, events: int) -> None:
+        self.events = events
+        # planes[kód][riadok] = bity udalostí s týmto kódom (MISSING sa dopočíta)
+        self.planes = {code: [0] * users for code in (YES, NO, UNKNOWN)}
+
+    def load(self, cells: Sequence[Tuple[int, int, int]], user_index: Dict[int, int],
+             event_index: Dict[int, int]) -> None:
+        # riadok skladáme ako text '0'/'1' (najvyšší bit vľavo) a parsujeme naraz cez int(..., 2);
+        # OR-ovanie po jednom bite by pri každej bunke alokovalo nový veľký int
+        zero = b"0" * self.events
+        buffers: Dict[Tuple[int, int], bytearray] = {}
+        last = self.events - 1
+        for event_id, user_id, code in cells:
+            row = user_index.get(user_id)
+            col = event_index.get(event_id)
+            if row is None or col is None:
+                continue
+            buf = buffers.get((code, row))
+            if buf is None:
+                buf = buffers[(code, row)] = bytearray(zero)
+            buf[last - col] = 49  # ord("1")
+        for (code, row), buf in buffers.items():
+            self.planes[code][row] = int(buf, 2)
+
+    def set(self, row: int, col: int, code: int) -> None:
+        bit = 1 << col
+        for plane_code, plane in self.planes.items():
+            if plane_code == code:
+                plane[row] |= bit
+            else:
+                plane[row] &= ~bit
+
+    def mask(self, flags: Sequence[bool]) -> int:
+        # bit i = flags[i]; int(..., 2) chce najvyšší bit vľavo
+        return int("".join("1" if f else "0" for f in reversed(flags)) or "0", 2)
+
+    def _count(self, code: int, row: int, cols: int) -> int:
+        if code == MISSING:
+            filled = self.planes[YES][row] | self.planes[NO][row] | self.planes[UNKNOWN][row]
+            return cols.bit_count() - (filled & cols).bit_count()
+        return (self.planes[code][row] & cols).bit_count()
+
+    def counts(self, cols: int, rows: Sequence[int]) -> Dict[int, List[int]]:
+        return {code: [self._count(code, row, cols) for row in rows] for code in (MISSING, YES, NO, UNKNOWN)}
+
+    def row_counts(self, row: int, cols: int) -> Dict[int, int]:
+        return {code: self._count(code, row, cols) for code in (MISSING, YES, NO, UNKNOWN)}
+
+    def row(self, row: int) -> List[int]:
+        out = [MISSING] * self.events
+        for code, plane in self.planes.items():
+            bits = plane[row]
+            while bits:
+                low = bits & -bits
+                out[low.bit_length() - 1] = code
+                bits ^= low
+        return out
+
+    def column_counts(self, code: int, rows: Sequence[int]) -> List[int]:
+        out = [0] * self.events
+        for row in rows:
+            for col, value in enumerate(self.row(row)):
+                if value == code:
+                    out[col] += 1
+        return out
+
+
+class _Snapshot:
+    """Načítaná matica + indexy; mení sa len pod zámkom AttendanceMatrix."""
+
+    def __init__(self, users: List[sqlite3.Row], events: List[sqlite3.Row],
+                 cells: Sequence[Tuple[int, int, int]], backend: Optional[str],
+                 last_response: Dict[int, str], version: int) -> None:
+        # data_version, ktorej zodpovedá obsah matice
+        self.version = version
+        self.user_ids = [u["id"] for u in users]
+        self.usernames = [u["username"] for u in users]
+        self.user_index = {uid: i for i, uid in enumerate(self.user_ids)}
+        # hráči zoradení podľa mena (poradie pre /players)
+        self.player_rows = [i for i, u in enumerate(users) if u["role"] == "player"]
+
+        # stĺpce zoradené podľa (date, time_from, id) – minulé udalosti sú prefix
+        self.events = [dict(e) for e in events]
+        self.event_index = {e["id"]: i for i, e in enumerate(self.events)}
+        self.dates = [e["date"] for e in self.events]
+        is_training = [e["event_type"] == "training" for e in self.events]
+        self.training_cols = [i for i, t in enumerate(is_training) if t]
+
+        use_numpy = _numpy() is not None and backend != "bitset"
+        self.cells = (_NumpyCells if use_numpy else _BitsetCells)(len(users), len(self.events))
+        self.cells.load(cells, self.user_index, self.event_index)
+        self.training_mask = self.cells.mask(is_training)
+        self.all_mask = self.cells.mask([True] * len(self.events))
+
+        # user_id -> MAX(attendance.updated_at); RSVP ho posúva dopredu
+        self.last_response = last_response
+        # riadok -> compute_trends(...) pre deň trends_day; nový deň = nanovo (okná sa posunú)
+        self.trends: Dict[int, Dict[str, Any]] = {}
+        self.trends_day: Optional[str] = None
+
+    def trends_for(self, row: int) -> Dict[str, Any]:
+        return compute_trends(self.dates, self.cells.row(row), self.trends_day)
+
+
+class AttendanceMatrix:
+    def __init__(self, backend: Optional[str] = None) -> None:
+        # backend: None = numpy ak je k dispozícii, "bitset" = vynútiť čistý Python
+        self.backend = backend
+        self._snap: Optional[_Snapshot] = None
+        self._lock = threading.RLock()
+        self._loads = 0
+        self._load_ms = 0.0
+        self._applied = 0
+        self._invalidations = 0
+        self._stale_reloads = 0
+        self._trend_hits = 0
+        self._trend_misses = 0
+
+    # ---------- údržba ----------
+
+    def invalidate(self) -> None:
+        """Zmena udalostí / používateľov – načíta sa znova pri ďalšom čítaní."""
+        with self._lock:
+            self._snap = None
+            self._invalidations += 1
+
+    def apply(self, rows: Iterable[Tuple[int, int, str]], updated_at: Optional[str] = None,
+              versions: Optional[Versions] = None) -> None:
+        """Po commite RSVP: (event_id, user_id, status) -> bunky v matici (+ trendy dotknutých hráčov)."""
+        with self._lock:
+            snap = self._snap
+            if snap is None:
+                return  # načíta sa aj s týmito zmenami
+            if versions is not None:
+                before, after = versions
+                if snap.version != before:
+                    # medzi načítaním a týmto zápisom zapisoval niekto iný (alebo iný zápis
+                    # z tohto procesu ešte nie je v matici) – radšej načítať celé
+                    self._snap = None
+                    self._invalidations += 1
+                    return
+                snap.version = after
+            touched = set()
+            for event_id, user_id, status in rows:
+                row = snap.user_index.get(user_id)
+                col = snap.event_index.get(event_id)
+                if row is None or col is None:
+                    # nový používateľ / udalosť, o ktorej ešte nevieme
+                    self._snap = None
+                    self._invalidations += 1
+                    return
+                snap.cells.set(row, col, CODES.get(status, UNKNOWN))
+                self._applied += 1
+                touched.add(row)
+                if updated_at and updated_at > snap.last_response.get(user_id, ""):
+                    snap.last_response[user_id] = updated_at
+            # prepočet len pre hráčov, ktorých trendy už niekto čítal
+            for row in touched:
+                if row in snap.trends:
+                    snap.trends[row] = snap.trends_for(row)
+
+    def _get(self, conn: sqlite3.Connection) -> _Snapshot:
+        # číta sa pod zámkom – apply() počas načítania počká a neprepíše ho starými dátami
+        with self._lock:
+            # jeden riadok podľa PK – zmeny z iných procesov
+            version = data_version(conn)
+            if self._snap is not None and self._snap.version != version:
+                self._snap = None
+                self._stale_reloads += 1
+            if self._snap is None:
+                started = time.perf_counter()
+                users = conn.execute(
+                    "SELECT id, username, role FROM users ORDER BY username"
+                ).fetchall()
+                events = conn.execute(
+                    """
+                    SELECT id, event_type, date, time_from, time_to, location, note
+                    FROM events
+                    ORDER BY date, IFNULL(time_from, ''), id
+                    """
+                ).fetchall()
+                # najväčšia tabuľka – holé tuple namiesto sqlite3.Row
+                cur = conn.cursor()
+                cur.row_factory = None
+                cells = cur.execute(
+                    f"""
+                    SELECT event_id, user_id,
+                           CASE status WHEN 'yes' THEN {YES} WHEN 'no' THEN {NO} ELSE {UNKNOWN} END
+                    FROM attendance
+                    """
+                ).fetchall()
+                last_response = {
+                    user_id: ts
+                    for user_id, ts in cur.execute(
+                        """
+                        SELECT user_id, MAX(updated_at) FROM attendance
+                        WHERE updated_at IS NOT NULL
+                        GROUP BY user_id
+                        """
+                    )
+                }
+                # verzia je prečítaná pred dátami – zápis počas načítania spôsobí len ďalšie načítanie
+                self._snap = _Snapshot(users, events, cells, self.backend, last_response, version)
+                self._loads += 1
+                self._load_ms = (time.perf_counter() - started) * 1000
+            return self._snap
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            snap = self._snap
+            return {
+                "loaded": snap is not None,
+                "backend": snap.cells.backend if snap else ("numpy" if _numpy() is not None and self.backend != "bitset" else "bitset"),
+                "version": snap.version if snap else None,
+                "users": len(snap.user_ids) if snap else 0,
+                "events": len(snap.events) if snap else 0,
+                "loads": self._loads,
+                "last_load_ms": round(self._load_ms, 3),
+                "applied": self._applied,
+                "invalidations": self._invalidations,
+                "stale_reloads": self._stale_reloads,
+                "trends_cached": len(snap.trends) if snap else 0,
+                "trend_hits": self._trend_hits,
+                "trend_misses": self._trend_misses,
+            }
+
+    # ---------- súhrny ----------
+
+    def players_training_summary(self, conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+        with self._lock:
+            snap = self._get(conn)
+            rows = snap.player_rows
+            counts = snap.cells.counts(snap.training_mask, rows)
+            yes, no, unknown, missing = counts[YES], counts[NO], counts[UNKNOWN], counts[MISSING]
+            total = len(snap.training_cols)
+            return [
+                {
+                    "user_id": snap.user_ids[r],
+                    "username": snap.usernames[r],
+                    "trainings_total": total,
+                    "yes_count": yes[i],
+                    "no_count": no[i],
+                    "missing_count": unknown[i] + missing[i],
+                }
+                for i, r in enumerate(rows)
+            ]
+
+    def my_training_summary(self, conn: sqlite3.Connection, user_id: int) -> Dict[str, Any]:
+        with self._lock:
+            snap = self._get(conn)
+            total = len(snap.training_cols)
+            row = snap.user_index.get(user_id)
+            if row is None:
+                return {"trainings_total": total, "yes_count": 0, "no_count": 0, "missing_count": total}
+            counts = snap.cells.row_counts(row, snap.training_mask)
+            return {
+                "trainings_total": total,
+                "yes_count": counts[YES],
+                "no_count": counts[NO],
+                "missing_count": counts[UNKNOWN] + counts[MISSING],
+            }
+
+    def my_trainings(self, conn: sqlite3.Connection, user_id: int, only_yes: bool = False) -> List[Dict[str, Any]]:
+        """Tréningy od najnovšieho + môj status (ako get_my_trainings / get_my_trainings_yes)."""
+        with self._lock:
+            snap = self._get(conn)
+            row = snap.user_index.get(user_id)
+            codes = snap.cells.row(row) if row is not None else [MISSING] * len(snap.events)
+            out = []
+            for col in reversed(snap.training_cols):
+                code = codes[col]
+                if only_yes and code != YES:
+                    continue
+                event = snap.events[col]
+                out.append({
+                    "id": event["id"],
+                    "date": event["date"],
+                    "time_from": event["time_from"],
+                    "time_to": event["time_to"],
+                    "location": event["location"],
+                    "note": event["note"],
+                    "status": STATUS_NAMES[code],
+                })
+            return out
+
+    def player_trends(self, conn: sqlite3.Connection, user_id: int,
+                      today: Optional[str] = None) -> Dict[str, Any]:
+        """compute_trends pre hráča + last_response_at; opakované čítanie je lookup v slovníku."""
+        today = today or datetime.date.today().isoformat()
+        with self._lock:
+            snap = self._get(conn)
+            if snap.trends_day != today:
+                snap.trends.clear()
+                snap.trends_day = today
+            row = snap.user_index.get(user_id)
+            if row is None:
+                trends = compute_trends(snap.dates, [MISSING] * len(snap.events), today)
+            else:
+                trends = snap.trends.get(row)
+                if trends is None:
+                    self._trend_misses += 1
+                    trends = snap.trends[row] = snap.trends_for(row)
+                else:
+                    self._trend_hits += 1
+            return {**trends, "last_response_at": snap.last_response.get(user_id)}
+
+    def user_stats(self, conn: sqlite3.Connection, user_id: int, only_past: bool = True,
+                   today: Optional[str] = None) -> Dict[str, Any]:
+        if only_past:
+            # rovnaké čísla sú v trendoch hráča – netreba znova redukovať riadok
+            trends = self.player_trends(conn, user_id, today)
+            return {key: trends[key] for key in USER_STATS_KEYS}
+        with self._lock:
+            snap = self._get(conn)
+            mask, total = snap.all_mask, len(snap.events)
+            row = snap.user_index.get(user_id)
+            counts = snap.cells.row_counts(row, mask) if row is not None else {YES: 0, NO: 0, UNKNOWN: 0}
+            going, not_going, maybe = counts[YES], counts[NO], counts[UNKNOWN]
+            return {
+                "total_events": total,
+                "going": going,
+                "not_going": not_going,
+                "maybe": maybe,
+                "no_response": max(total - going - not_going - maybe, 0),
+                "percent_going": round(going / total * 100, 1) if total else 0,
+            }
+
+    def event_counts(self, conn: sqlite3.Connection) -> Dict[int, Dict[str, int]]:
+        """{event_id: {"yes", "no", "unknown"}} cez hráčov (unknown = aj bez záznamu)."""
+        with self._lock:
+            snap = self._get(conn)
+            rows, cells = snap.player_rows, snap.cells
+            yes = cells.column_counts(YES, rows)
+            no = cells.column_counts(NO, rows)
+            players = len(rows)
+            return {
+                e["id"]: {"yes": yes[i], "no": no[i], "unknown": players - yes[i] - no[i]}
+                for i, e in enumerate(snap.events)
+            }
+
+
+attendance_matrix = AttendanceMatrix()
@@ -1,11 +1,29 @@
+import asyncio
+import logging
 import sqlite3
 import secrets
+import config
 from dataclasses import dataclass
-from typing import Optional
-from passlib.context import CryptContext
-from repositories.users import get_user_by_username
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from typing import Any, Dict, Optional, Set, Tuple
+from database.database import get_read_pool
+from database.executor import AsyncProxy, run_db, run_db_pooled
+from repositories.users import (
+    get_user_by_id,
+    get_user_by_username,
+    insert_user,
+    count_password_hash_prefixes,
+    list_users,
+    rehash_password,
+    update_password_hash,
+)
+from services.attendance_matrix import attendance_matrix
+from services.fragment_cache import event_row_cache
+from services.passwords import cost_report, get_pwd_context, needs_rehash, password_hasher
+
+auth_logger = logging.getLogger("teamhub.auth")
+
+# bežiace prepočty hashov po prihlásení (referencia, aby ich GC nezrušil)
+_rehash_tasks: Set["asyncio.Task[None]"] = set()
 
 
 @dataclass
@@ -13,65 +31,137 @@ class User:
     id: int
     username: str
     role: str
+    # zvyšuje sa pri zmene hesla; podpísané session so staršou verziou neplatia
+    credential_version: int = 0
 
 
 class AuthService:
-    def __init__(self, conn: sqlite3.Connection):
+    def __init__(self, conn: Optional[sqlite3.Connection] = None):
+        # bez conn si *_async metódy požičajú spojenie z poolu len na dotaz,
+        # nie na celý bcrypt (ten môže v búrke prihlásení čakať vo fronte)
         self.conn = conn
 
+    def _call(self, fn, *args):
+        if self.conn is not None:
+            return fn(self.conn, *args)
+        with get_read_pool().connection() as conn:
+            return fn(conn, *args)
+
+    async def _call_async(self, fn, *args):
+        # bez conn sa na spojenie čaká v event loope – vlákno executora nesmie blokovať na poole
+        if self.conn is not None:
+            return await run_db(fn, self.conn, *args)
+        return await run_db_pooled(self._call, fn, *args)
+
+    @property
+    def aio(self) -> "AsyncProxy[AuthService]":
+        """Awaitable varianty metód, bežia na DB executore."""
+        return AsyncProxy(self)
+
     def authenticate(self, username: str, password: str) -> Optional[User]:
         user = get_user_by_username(self.conn, username)
         if not user:
             return None
-        if not pwd_context.verify(password, user["password_hash"]):
+        valid, new_hash = get_pwd_context().verify_and_update(password, user["password_hash"])
+        if not valid:
             return None
-        return User(id=user["id"], username=user["username"], role=user["role"])
+        if new_hash is not None:
+            # iná cena bcryptu než v configu – uložíme hash s aktuálnou
+            rehash_password(self.conn, user["id"], user["password_hash"], new_hash)
+        return User(id=user["id"], username=user["username"], role=user["role"],
+                    credential_version=user["credential_version"])
+
+    async def authenticate_async(self, username: str, password: str) -> Optional[User]:
+        """Ako authenticate, ale bcrypt beží v poole procesov (PasswordHasherBusy = plný front)."""
+        user = await self._call_async(get_user_by_username, username)
+        if not user:
+            return None
+        if not await password_hasher.verify(password, user["password_hash"]):
+            return None
+        if needs_rehash(user["password_hash"]):
+            # na pozadí – prihlásenie na druhý bcrypt nečaká
+            task = asyncio.get_running_loop().create_task(
+                self._rehash(user["id"], password, user["password_hash"])
+            )
+            _rehash_tasks.add(task)
+            task.add_done_callback(_rehash_tasks.discard)
+        return User(id=user["id"], username=user["username"], role=user["role"],
+                    credential_version=user["credential_version"])
+
+    async def _rehash(self, user_id: int, password: str, old_hash: str) -> None:
+        try:
+            new_hash = await password_hasher.rehash(password)
+            if new_hash is not None:
+                await self._call_async(rehash_password, user_id, old_hash, new_hash)
+        except Exception:  # prepočet je len optimalizácia, prihlásenie už prebehlo
+            auth_logger.exception("prepočet hashu pre používateľa %s zlyhal", user_id)
+
+    def password_cost_report(self) -> Dict[str, Any]:
+        """Koľko hashov má akú cenu bcryptu – postup prepočítavania po zmene TEAMHUB_BCRYPT_ROUNDS."""
+        return cost_report(self._call(count_password_hash_prefixes))
 
     def hash_password(self, password: str) -> str:
-        return pwd_context.hash(password)
-
-    def create_user(self, username: str, role: str = "player", temp_password: str | None = None):
+        return get_pwd_context().hash(password)
+
+    def create_user(
+        self,
+        username: str,
+        role: str = "player",
+        temp_password: str | None = None,
+        password_hash: str | None = None,
+    ):
         username = username.strip()
         if not username:
             return None, "Username je povinný"
 
-        cur = self.conn.execute("SELECT id FROM users WHERE username = ?", (username,))
-        if cur.fetchone():
+        if get_user_by_username(self.conn, username):
             return None, "Používateľ už existuje"
 
         if temp_password is None:
             temp_password = secrets.token_urlsafe(8)  # napr. dočasné heslo
 
         # tu použi rovnaké hashovanie ako pri authenticate()
-        pw_hash = self.hash_password(temp_password)  # alebo tvoja existujúca funkcia
-        self.conn.execute(
-            "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
-            (username, pw_hash, role),
-        )
-        self.conn.commit()
+        pw_hash = password_hash or self.hash_password(temp_password)
+        insert_user(self.conn, username, pw_hash, role)
+        attendance_matrix.invalidate()
+        event_row_cache.clear()  # nový hráč je v "❔" každej udalosti
 
         return temp_password, None
 
+    async def create_user_async(self, username: str, role: str = "player", temp_password: str | None = None):
+        """create_user s hashom dočasného hesla v poole procesov."""
+        if temp_password is None:
+            temp_password = secrets.token_urlsafe(8)
+        pw_hash = await password_hasher.hash(temp_password)
+        return await self.aio.create_user(username, role, temp_password, password_hash=pw_hash)
+
     def list_users(self):
-        cur = self.conn.execute("SELECT id, username, role FROM users ORDER BY username")
-        return cur.fetchall()
+        return list_users(self.conn)
+
+    def change_password(self, user_id: int, old_password: str, new_password: str) -> Tuple[int, float]:
+        """Vráti (nová credential_version, čas odvolania) – session vrstva podľa toho odvolá staré prihlásenia."""
+        row = get_user_by_id(self.conn, user_id)
+
+        if not row:
+            raise ValueError("Používateľ neexistuje")
+
+        if not get_pwd_context().verify(old_password, row["password_hash"]):
+            raise ValueError("Staré heslo nie je správne")
+
+        new_hash = get_pwd_context().hash(new_password)
+
+        return update_password_hash(self.conn, user_id, new_hash, config.SESSION_ABSOLUTE_TTL)
 
-    def change_password(self, user_id: int, old_password: str, new_password: str) -> None:
-        row = self.conn.execute(
-            "SELECT id, password_hash FROM users WHERE id = ?",
-            (user_id,),
-        ).fetchone()
+    async def change_password_async(self, user_id: int, old_password: str, new_password: str) -> Tuple[int, float]:
+        """change_password s bcrypt v poole procesov; DB časť ostáva na DB executore."""
+        row = await self._call_async(get_user_by_id, user_id)
 
         if not row:
             raise ValueError("Používateľ neexistuje")
 
-        if not pwd_context.verify(old_password, row["password_hash"]):
+        if not await password_hasher.verify(old_password, row["password_hash"]):
             raise ValueError("Staré heslo nie je správne")
 
-        new_hash = pwd_context.hash(new_password)
+        new_hash = await password_hasher.hash(new_password)
 
-        self.conn.execute(
-            "UPDATE users SET password_hash = ? WHERE id = ?",
-            (new_hash, user_id),
-        )
-        self.conn.commit()
\ No newline at end of file
+        return await self._call_async(update_password_hash, user_id, new_hash, config.SESSION_ABSOLUTE_TTL)
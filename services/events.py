@@ -1,20 +1,84 @@
 # app/services/events.py
 from typing import List, Dict, Any, Optional
+import base64
+import datetime
+import json
 import sqlite3
 
+import config
+from database.executor import AsyncProxy
+from services.attendance_matrix import attendance_matrix
+from services.fragment_cache import event_row_cache
+
 from repositories.events import (
+    EventKey,
     list_events as repo_list_events,
+    list_events_page as repo_list_events_page,
+    get_event as repo_get_event,
     insert_event as repo_insert_event,
+    update_event as repo_update_event,
+    delete_event as repo_delete_event,
 )
 
+WINDOWS = ("upcoming", "past")
+
+
+def encode_cursor(event: Dict[str, Any]) -> str:
+    """Kľúč posledného eventu na strane -> nepriehľadný token do URL."""
+    key = [event["date"], event["time_from"] or "", event["id"]]
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> EventKey:
+    """Opak encode_cursor; pri pokazenom tokene ValueError."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        date, time_from, event_id = json.loads(raw)
+        if not isinstance(date, str) or not isinstance(time_from, str) or not isinstance(event_id, int):
+            raise TypeError
+    except (ValueError, TypeError) as e:
+        raise ValueError("Neplatný kurzor") from e
+    return date, time_from, event_id
+
 
 class EventsService:
     def __init__(self, conn: sqlite3.Connection):
         self.conn = conn
 
+    @property
+    def aio(self) -> "AsyncProxy[EventsService]":
+        """Awaitable varianty metód, bežia na DB executore."""
+        return AsyncProxy(self)
+
     def list_events(self) -> List[Dict[str, Any]]:
         return repo_list_events(self.conn)
 
+    def list_events_page(
+        self,
+        window: str = "upcoming",
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Jedna strana udalostí: {"events": [...], "next_cursor": str | None, "window": ...}.
+        window: "upcoming" (dnes a neskôr, od najbližšej) | "past" (od najnovšej)
+        """
+        if window not in WINDOWS:
+            raise ValueError("Neplatné okno")
+        limit = limit or config.EVENTS_PAGE_SIZE
+        after = decode_cursor(cursor) if cursor else None
+        # o jeden navyše, aby sme vedeli, či existuje ďalšia strana
+        rows = repo_list_events_page(
+            self.conn,
+            today=datetime.date.today().isoformat(),
+            past=window == "past",
+            after=after,
+            limit=limit + 1,
+        )
+        events = rows[:limit]
+        next_cursor = encode_cursor(events[-1]) if len(rows) > limit else None
+        return {"events": events, "next_cursor": next_cursor, "window": window}
+
     def create_event(
         self,
         event_type: str,
@@ -24,7 +88,7 @@ class EventsService:
         location: Optional[str] = None,
         note: Optional[str] = None,
     ) -> int:
-        return repo_insert_event(
+        event_id = repo_insert_event(
             self.conn,
             event_type=event_type,
             date=date,
@@ -33,17 +97,11 @@ class EventsService:
             location=location,
             note=note,
         )
+        attendance_matrix.invalidate()
+        return event_id
 
     def get_event(self, event_id: int):
-        cur = self.conn.execute(
-            """
-            SELECT id, event_type, date, time_from, time_to, location, note
-            FROM events
-            WHERE id = ?
-            """,
-            (event_id,),
-        )
-        return cur.fetchone()
+        return repo_get_event(self.conn, event_id)
 
     def update_event(
             self,
@@ -55,16 +113,20 @@ class EventsService:
             location: str | None,
             note: str | None,
     ) -> None:
-        self.conn.execute(
-            """
-            UPDATE events
-            SET event_type = ?, date = ?, time_from = ?, time_to = ?, location = ?, note = ?
-            WHERE id = ?
-            """,
-            (event_type, date, time_from, time_to, location, note, event_id),
+        repo_update_event(
+            self.conn,
+            event_id=event_id,
+            event_type=event_type,
+            date=date,
+            time_from=time_from,
+            time_to=time_to,
+            location=location,
+            note=note,
         )
-        self.conn.commit()
+        attendance_matrix.invalidate()  # mohol sa zmeniť dátum / typ
+        event_row_cache.invalidate(event_id)
 
     def delete_event(self, event_id: int) -> None:
-        self.conn.execute("DELETE FROM events WHERE id = ?", (event_id,))
-        self.conn.commit()
+        repo_delete_event(self.conn, event_id)
+        attendance_matrix.invalidate()
+        event_row_cache.invalidate(event_id)
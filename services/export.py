@@ -0,0 +1,138 @@
+# app/services/export.py
+"""
+Export dochádzky (CSV / JSON Lines, voliteľne gzip) ako prúd bajtov.
+
+Riadky idú priamo z kurzora (fetchmany) cez generátor, takže pamäť je
+rovnaká pre jednu sezónu aj pre desať. Spojenie je z get_export_pool()
+(mimo poolu stránok, najviac TEAMHUB_EXPORT_MAX_CONCURRENT naraz);
+handler si ho požičia v event loope cez kontext requestu, takže sa
+vráti až po odoslaní celého prúdu (alebo keď klient odíde).
+"""
+from __future__ import annotations
+
+import csv
+import datetime
+import io
+import json
+import sqlite3
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from repositories.attendance import iter_attendance_matrix, iter_player_summaries
+
+# stĺpce sú v rovnakom poradí ako SELECT v repository – riadky sa kódujú pozične
+KINDS: Dict[str, Tuple[Callable[..., Iterator[Any]], List[str]]] = {
+    # celá matica v "dlhom" tvare: jeden riadok = jedna bunka event × hráč
+    "matrix": (
+        iter_attendance_matrix,
+        ["event_id", "date", "time_from", "time_to", "event_type", "location",
+         "user_id", "username", "status", "updated_at"],
+    ),
+    "summary": (
+        iter_player_summaries,
+        ["user_id", "username", "events_total", "yes_count", "no_count",
+         "unknown_count", "missing_count", "percent_yes"],
+    ),
+}
+FORMATS = {"csv": "text/csv; charset=utf-8", "jsonl": "application/x-ndjson"}
+EVENT_TYPES = ("training", "match")
+
+# koľko riadkov sa zakóduje naraz do jedného kusu odpovede
+ROWS_PER_CHUNK = 500
+
+
+@dataclass(frozen=True)
+class ExportRequest:
+    kind: str = "matrix"
+    fmt: str = "csv"
+    gzip: bool = False
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    event_type: Optional[str] = None
+
+    def validate(self) -> "ExportRequest":
+        """ValueError so správou pre používateľa, ak niečo nesedí."""
+        if self.kind not in KINDS:
+            raise ValueError(f"Neznámy export: {self.kind}")
+        if self.fmt not in FORMATS:
+            raise ValueError(f"Neznámy formát: {self.fmt}")
+        if self.event_type and self.event_type not in EVENT_TYPES:
+            raise ValueError(f"Neznámy typ udalosti: {self.event_type}")
+        for value in (self.date_from, self.date_to):
+            if value:
+                try:
+                    datetime.date.fromisoformat(value)
+                except ValueError:
+                    raise ValueError(f"Neplatný dátum: {value} (YYYY-MM-DD)") from None
+        if self.date_from and self.date_to and self.date_from > self.date_to:
+            raise ValueError("Dátum od je po dátume do")
+        return self
+
+    @property
+    def filename(self) -> str:
+        parts = ["dochadzka", self.kind]
+        if self.event_type:
+            parts.append(self.event_type)
+        if self.date_from or self.date_to:
+            parts.append(f"{self.date_from or 'zaciatok'}_{self.date_to or 'koniec'}")
+        name = "-".join(parts) + "." + self.fmt
+        return name + ".gz" if self.gzip else name
+
+    @property
+    def media_type(self) -> str:
+        return "application/gzip" if self.gzip else FORMATS[self.fmt]
+
+
+def _batches(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    batch: List[Any] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def csv_chunks(rows: Iterable[Any], columns: List[str]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    # BOM, aby Excel spoznal UTF-8 (mená s diakritikou)
+    buf.write("\ufeff")
+    writer.writerow(columns)
+    for batch in _batches(rows, ROWS_PER_CHUNK):
+        writer.writerows(batch)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():  # prázdny export = aspoň hlavička
+        yield buf.getvalue().encode("utf-8")
+
+
+def jsonl_chunks(rows: Iterable[Any], columns: List[str]) -> Iterator[bytes]:
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    for batch in _batches(rows, ROWS_PER_CHUNK):
+        yield "".join(dumps(dict(zip(columns, row))) + "\n" for row in batch).encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    # wbits=31 = gzip hlavička a pätička, nie holý zlib
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def stream_export(req: ExportRequest, conn: sqlite3.Connection) -> Iterator[bytes]:
+    """Generátor bajtov exportu nad `conn` (vracia ho volajúci)."""
+    query, columns = KINDS[req.kind]
+    encode = csv_chunks if req.fmt == "csv" else jsonl_chunks
+    rows = query(conn, date_from=req.date_from, date_to=req.date_to, event_type=req.event_type)
+    try:
+        chunks = encode(rows, columns)
+        yield from (gzip_chunks(chunks) if req.gzip else chunks)
+    finally:
+        rows.close()
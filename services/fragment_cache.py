@@ -0,0 +1,101 @@
+# app/services/fragment_cache.py
+"""
+LRU cache vyrenderovaných HTML fragmentov (riadky tabuľky /events).
+
+Kľúč obsahuje všetko, od čoho fragment závisí – pri riadku udalosti sú to
+verzia dát udalosti, verzia dochádzky, rola diváka a jeho vlastný status.
+"Verzia" je tu samotný obsah (n-tica stĺpcov / súhrnu dochádzky), ktorý
+stránka aj tak načíta z DB, takže zmenený riadok dostane nový kľúč aj
+v inom workeri a nikdy sa nevráti zastaraný.
+
+invalidate(tag) pri úprave udalosti a RSVP hneď zahodí fragmenty danej
+udalosti; inak by staré verzie len zaberali miesto, kým ich nevytlačí LRU.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Set, Tuple
+
+import config
+
+Key = Tuple[Hashable, ...]
+
+
+class FragmentCache:
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: "OrderedDict[Key, Tuple[Hashable, str]]" = OrderedDict()
+        self._by_tag: Dict[Hashable, Set[Key]] = {}
+        # invalidácie prichádzajú aj z vlákna RSVP zapisovača
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidated = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get_or_render(self, tag: Hashable, key: Key, render: Callable[[], str]) -> str:
+        """Fragment pre kľúč; pri miss ho vyrenderuje `render()` (mimo zámku) a uloží."""
+        if not self.enabled:
+            return render()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+        html = render()
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (tag, html)
+                self._by_tag.setdefault(tag, set()).add(key)
+                while len(self._entries) > self.max_size:
+                    old_key, (old_tag, _) = self._entries.popitem(last=False)
+                    self._forget_tag_locked(old_tag, old_key)
+                    self._evictions += 1
+        return html
+
+    def invalidate(self, tag: Hashable) -> None:
+        with self._lock:
+            keys = self._by_tag.pop(tag, ())
+            for key in keys:
+                self._entries.pop(key, None)
+            self._invalidated += len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._invalidated += len(self._entries)
+            self._entries.clear()
+            self._by_tag.clear()
+
+    def _forget_tag_locked(self, tag: Hashable, key: Key) -> None:
+        keys = self._by_tag.get(tag)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_tag[tag]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            looked_up = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "tags": len(self._by_tag),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / looked_up, 4) if looked_up else None,
+                "evictions": self._evictions,
+                "invalidated": self._invalidated,
+            }
+
+
+# riadky tabuľky udalostí; tag = event_id
+event_row_cache = FragmentCache(config.EVENT_ROW_CACHE_SIZE)
@@ -1,15 +1,29 @@
 # app/services/items.py
 from typing import List, Dict, Any, Optional
 import sqlite3
-from repositories.items import list_items as repo_list_items, insert_item as repo_insert_item, total_price as repo_total_price
+from database.executor import AsyncProxy
+from repositories.items import (
+    list_items as repo_list_items,
+    list_items_page as repo_list_items_page,
+    insert_item as repo_insert_item,
+    total_price as repo_total_price,
+)
 
 class ItemsService:
     def __init__(self, conn: sqlite3.Connection):
         self.conn = conn
 
+    @property
+    def aio(self) -> "AsyncProxy[ItemsService]":
+        """Awaitable varianty metód, bežia na DB executore."""
+        return AsyncProxy(self)
+
     def list_items(self) -> List[Dict[str, Any]]:
         return repo_list_items(self.conn)
 
+    def list_items_page(self, before_id: Optional[int] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        return repo_list_items_page(self.conn, before_id=before_id, limit=limit)
+
     def total_price(self) -> float:
         return repo_total_price(self.conn)
 
@@ -0,0 +1,212 @@
+# app/services/passwords.py
+"""
+bcrypt mimo event loopu aj mimo DB executora.
+
+Jedno overenie hesla je ~0.25 s čistého CPU. Keby bežalo na DB executore,
+pár súčasných prihlásení obsadí všetky jeho vlákna a ostatné stránky čakajú
+na voľný slot; v event loope by zamrzol celý worker. Preto sa hash/verify
+posiela do ProcessPoolExecutor s počtom procesov = počet jadier.
+
+Prijímanie je obmedzené: rozpracovaných (bežiacich + čakajúcich) môže byť
+najviac workers + queue_size. Ďalšie volanie hneď skončí PasswordHasherBusy
+(stránka vráti 503), namiesto toho, aby sa front nafukoval a každé ďalšie
+prihlásenie trvalo dlhšie.
+
+Cena bcryptu je TEAMHUB_BCRYPT_ROUNDS (vyberá ju calibrate_bcrypt.py).
+Hash s inou cenou sa po úspešnom prihlásení prepočíta na pozadí – len keď
+je voľný proces, prihlásenia majú prednosť.
+"""
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import config
+
+_pwd_context: Any = None
+_pwd_context_lock = threading.Lock()
+
+
+def get_pwd_context() -> Any:
+    """passlib CryptContext; passlib (a bcrypt) sa importuje až pri prvom použití, nie pri štarte workera."""
+    global _pwd_context
+    if _pwd_context is None:
+        with _pwd_context_lock:
+            if _pwd_context is None:
+                from passlib.context import CryptContext
+
+                _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=config.BCRYPT_ROUNDS)
+    return _pwd_context
+
+_BCRYPT_PREFIX_RE = re.compile(r"^\$2[abxy]?\$(\d{2})\$")
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """Hash má inú cenu (alebo schému) než aktuálne nastavenie – bez bcryptu, len podľa prefixu."""
+    return get_pwd_context().needs_update(password_hash)
+
+
+def bcrypt_cost(password_hash: str) -> Optional[int]:
+    match = _BCRYPT_PREFIX_RE.match(password_hash or "")
+    return int(match.group(1)) if match else None
+
+
+def cost_report(prefix_counts: Iterable[Tuple[str, int]]) -> Dict[str, Any]:
+    """Rozdelenie hashov podľa ceny a koľko z nich už má cieľovú cenu (postup prepočítavania)."""
+    costs: Dict[int, int] = {}
+    other = total = 0
+    for prefix, count in prefix_counts:
+        total += count
+        cost = bcrypt_cost(prefix)
+        if cost is None:
+            other += count
+        else:
+            costs[cost] = costs.get(cost, 0) + count
+    current = costs.get(config.BCRYPT_ROUNDS, 0)
+    return {
+        "target_rounds": config.BCRYPT_ROUNDS,
+        "costs": {str(cost): costs[cost] for cost in sorted(costs)},
+        "other": other,
+        "total": total,
+        "outdated": total - current,
+        "migrated_percent": round(current * 100 / total, 1) if total else None,
+    }
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Front na bcrypt je plný – skúsiť znova o chvíľu (503)."""
+
+
+# tieto dve bežia v procesoch poolu – musia byť na úrovni modulu (pickle)
+def _hash(password: str) -> str:
+    return get_pwd_context().hash(password)
+
+
+def _verify(password: str, password_hash: str) -> bool:
+    return get_pwd_context().verify(password, password_hash)
+
+
+def _noop() -> int:
+    get_pwd_context()  # warm-up: passlib sa v procese načíta hneď, nie pri prvom prihlásení
+    return os.getpid()
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, queue_size: int) -> None:
+        # workers=0: pôvodné správanie – bcrypt na DB executore (na porovnanie)
+        self.workers = workers
+        self.capacity = max(workers, 1) + queue_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._submitted = 0
+        self._rejected = 0
+        self._completed = 0
+        self._time_total = 0.0
+        self._time_max = 0.0
+        self._rehashed = 0
+        self._rehash_skipped = 0
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                # spawn, nie fork: rodič má vlákna (DB executor, zapisovač, sweeper)
+                # a fork by mohol skopírovať zamknutý zámok
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def warm_up(self) -> None:
+        """Spustí procesy hneď pri štarte, nie pri prvom prihlásení (spawn trvá ~100 ms)."""
+        if self.workers > 0:
+            executor = self._get_executor()
+            for future in [executor.submit(_noop) for _ in range(self.workers)]:
+                future.result()
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self._rejected += 1
+                raise PasswordHasherBusy("Príliš veľa prihlásení naraz, skús to o chvíľu.")
+            self._in_flight += 1
+            self._submitted += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+        started = time.perf_counter()
+        try:
+            if self.workers <= 0:
+                from database.executor import run_db
+
+                return await run_db(fn, *args)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+                self._time_total += elapsed
+                self._time_max = max(self._time_max, elapsed)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self._run(_verify, password, password_hash)
+
+    async def rehash(self, password: str) -> Optional[str]:
+        """Nový hash s aktuálnou cenou, alebo None, ak nie je voľný proces (skúsi sa pri ďalšom prihlásení)."""
+        with self._lock:
+            idle = self._in_flight < max(self.workers, 1)
+            if not idle:
+                self._rehash_skipped += 1
+        if not idle:
+            return None
+        try:
+            new_hash = await self._run(_hash, password)
+        except PasswordHasherBusy:
+            with self._lock:
+                self._rehash_skipped += 1
+            return None
+        with self._lock:
+            self._rehashed += 1
+        return new_hash
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            done = self._completed
+            return {
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "started": self._executor is not None,
+                "in_flight": self._in_flight,
+                "max_in_flight": self._max_in_flight,
+                "submitted": self._submitted,
+                "rejected": self._rejected,
+                "completed": done,
+                "mean_ms": round(self._time_total * 1000 / done, 3) if done else 0.0,
+                "max_ms": round(self._time_max * 1000, 3),
+                "bcrypt_rounds": config.BCRYPT_ROUNDS,
+                "rehashed": self._rehashed,
+                "rehash_skipped": self._rehash_skipped,
+            }
+
+
+password_hasher = PasswordHasher(
+    workers=config.PASSWORD_POOL_WORKERS,
+    queue_size=config.PASSWORD_QUEUE_SIZE,
+)
@@ -1,34 +1,603 @@
+# app/services/session.py
+"""
+Úložisko prihlásení (session_id v cookie -> User).
+
+- MemorySessionBackend: len v procese (pôvodné správanie + expirácia)
+- SqliteSessionBackend: tabuľka v samostatnom SQLite súbore, ktorú vidia
+  všetci workeri a prežije reštart; pred ňou je LRU cache v procese,
+  takže bežná požiadavka do DB vôbec nejde
+- SignedCookieSessionBackend: žiadne úložisko – cookie je podpísaný token
+  s identitou, overenie je len HMAC bez zámku
+
+Všetky majú idle TTL (bez aktivity) aj absolútne TTL (od prihlásenia)
+a vlákno na pozadí (mazanie vypršaných / načítanie odvolaní). Prvé dve
+namiesto jedného globálneho zámku používajú SESSION_LOCK_STRIPES zámkov
+podľa hash(session_id).
+
+Zmena hesla zavolá revoke_user(): stavové úložiská zmažú session
+používateľa, podpísané tokeny so starou credential_version prestanú platiť.
+"""
+from __future__ import annotations
+
+import hashlib
 import secrets
-from threading import Lock
-from typing import Dict, Optional
+from abc import ABC, abstractmethod
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from itsdangerous import BadData, URLSafeTimedSerializer
+from starlette.responses import Response
+
+import config
+from database.database import open_read_connection
+from database.executor import run_db
+from repositories.users import list_revocations
 from services.auth import User
 
 SESSION_COOKIE_NAME = "session_id"
 
 
-class SessionStore:
+@dataclass
+class _Record:
+    user: User
+    created_at: float  # time.time() – zdieľané medzi procesmi, monotonic nie
+    last_seen: float
+
+
+class _Stripe:
+    """Jeden pruh: zámok + jeho časť session + počítadlá (bez globálneho zámku)."""
+
     def __init__(self) -> None:
-        self._sessions: Dict[str, User] = {}
-        self._lock = Lock()
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[str, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.db_reads = 0
+        self.db_writes = 0
+
+
+class SessionBackend(ABC):
+    """Spoločné rozhranie; `session_store` je jedna z implementácií nižšie."""
+
+    name = "base"
+
+    def __init__(self, idle_ttl: float, absolute_ttl: float, stripes: int) -> None:
+        self.idle_ttl = idle_ttl
+        self.absolute_ttl = absolute_ttl
+        self._stripes = [_Stripe() for _ in range(max(1, stripes))]
+        self._swept = 0
+        self._sweeps = 0
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _stripe(self, session_id: str) -> _Stripe:
+        return self._stripes[hash(session_id) % len(self._stripes)]
+
+    def _expired(self, rec: _Record, now: float) -> bool:
+        return now - rec.last_seen > self.idle_ttl or now - rec.created_at > self.absolute_ttl
+
+    @abstractmethod
+    def create_session(self, user: User) -> str:
+        ...
+
+    @abstractmethod
+    def get_user(self, session_id: Optional[str]) -> Optional[User]:
+        ...
+
+    @abstractmethod
+    def delete_session(self, session_id: Optional[str]) -> None:
+        ...
+
+    @abstractmethod
+    def sweep(self) -> int:
+        """Zmaže vypršané session, vráti ich počet."""
+
+    @abstractmethod
+    def live_count(self) -> Optional[int]:
+        ...
+
+    @abstractmethod
+    def revoke_user(self, user_id: int, min_version: int, revoked_at: float) -> None:
+        """Zmena hesla: prihlásenia používateľa so staršou verziou prestanú platiť."""
+
+    def reissue(self, session_id: Optional[str]) -> Optional[str]:
+        """Nová hodnota cookie na posunutie idle TTL (len bezstavový backend), inak None."""
+        return None
+
+    # ---------- z async handlerov ----------
+    # SQLite backend zapisuje do súboru a na zámok môže čakať až busy_timeout – nie v event loope
+
+    async def create_session_async(self, user: User) -> str:
+        return await run_db(self.create_session, user)
+
+    async def delete_session_async(self, session_id: Optional[str]) -> None:
+        await run_db(self.delete_session, session_id)
+
+    async def revoke_user_async(self, user_id: int, min_version: int, revoked_at: float) -> None:
+        await run_db(self.revoke_user, user_id, min_version, revoked_at)
+
+    # ---------- mazanie na pozadí ----------
+
+    def start_sweeper(self, interval: float) -> None:
+        if self._sweeper is not None or interval <= 0:
+            return
+        self._stop.clear()
+        self._sweeper = threading.Thread(target=self._sweep_loop, args=(interval,),
+                                         name="session-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def _sweep_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.sweep()
+            except sqlite3.Error:
+                pass  # DB zamknutá / nedostupná – skúsi sa o interval neskôr
+
+    def close(self) -> None:
+        self._stop.set()
+        thread, self._sweeper = self._sweeper, None
+        if thread is not None:
+            thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        hits = sum(s.hits for s in self._stripes)
+        misses = sum(s.misses for s in self._stripes)
+        return {
+            "backend": self.name,
+            "live": self.live_count(),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+            "sweeps": self._sweeps,
+            "swept": self._swept,
+            "sweeper_running": self._sweeper is not None,
+            "idle_ttl": self.idle_ttl,
+            "absolute_ttl": self.absolute_ttl,
+            "stripes": len(self._stripes),
+        }
+
+
+class MemorySessionBackend(SessionBackend):
+    """Session len v pamäti procesu – pre jedného workera / vývoj."""
+
+    name = "memory"
 
     def create_session(self, user: User) -> str:
         session_id = secrets.token_urlsafe(32)
-        with self._lock:
-            self._sessions[session_id] = user
+        now = time.time()
+        stripe = self._stripe(session_id)
+        with stripe.lock:
+            stripe.entries[session_id] = _Record(user, now, now)
         return session_id
 
     def get_user(self, session_id: Optional[str]) -> Optional[User]:
         if not session_id:
             return None
-        with self._lock:
-            return self._sessions.get(session_id)
+        now = time.time()
+        stripe = self._stripe(session_id)
+        with stripe.lock:
+            rec = stripe.entries.get(session_id)
+            if rec is None:
+                stripe.misses += 1
+                return None
+            if self._expired(rec, now):
+                del stripe.entries[session_id]
+                stripe.misses += 1
+                return None
+            rec.last_seen = now
+            stripe.hits += 1
+            return rec.user
+
+    def delete_session(self, session_id: Optional[str]) -> None:
+        if not session_id:
+            return
+        stripe = self._stripe(session_id)
+        with stripe.lock:
+            stripe.entries.pop(session_id, None)
+
+    def sweep(self) -> int:
+        now = time.time()
+        removed = 0
+        for stripe in self._stripes:
+            with stripe.lock:
+                dead = [sid for sid, rec in stripe.entries.items() if self._expired(rec, now)]
+                for sid in dead:
+                    del stripe.entries[sid]
+                removed += len(dead)
+        self._sweeps += 1
+        self._swept += removed
+        return removed
+
+    def live_count(self) -> int:
+        now = time.time()
+        count = 0
+        for stripe in self._stripes:
+            with stripe.lock:
+                count += sum(1 for rec in stripe.entries.values() if not self._expired(rec, now))
+        return count
+
+    def revoke_user(self, user_id: int, min_version: int, revoked_at: float) -> None:
+        for stripe in self._stripes:
+            with stripe.lock:
+                for sid in [sid for sid, rec in stripe.entries.items() if rec.user.id == user_id]:
+                    del stripe.entries[sid]
+
+
+class SqliteSessionBackend(SessionBackend):
+    """
+    Session v SQLite (WAL) zdieľanom workermi + LRU cache v procese.
+
+    V DB je len SHA-256 session_id, nie samotný token z cookie. Záznam
+    z cache sa berie ako platný SESSION_CACHE_TTL sekúnd; odhlásenie na inom
+    workeri sa tu teda prejaví najneskôr po tomto čase. last_seen sa do DB
+    zapisuje najviac raz za touch_interval.
+    """
+
+    name = "sqlite"
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS sessions (
+          id         TEXT PRIMARY KEY,   -- sha256(session_id)
+          user_id    INTEGER NOT NULL,
+          username   TEXT NOT NULL,
+          role       TEXT NOT NULL,
+          created_at REAL NOT NULL,
+          last_seen  REAL NOT NULL
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_sessions_last_seen ON sessions(last_seen)",
+        "CREATE INDEX IF NOT EXISTS ix_sessions_created_at ON sessions(created_at)",
+    )
+
+    def __init__(
+        self,
+        path: str,
+        idle_ttl: float,
+        absolute_ttl: float,
+        stripes: int,
+        cache_size: int = 10000,
+        cache_ttl: float = 5.0,
+        touch_interval: float = 60.0,
+    ) -> None:
+        super().__init__(idle_ttl, absolute_ttl, stripes)
+        self.path = path
+        self.cache_ttl = cache_ttl
+        self.touch_interval = touch_interval
+        self._per_stripe = max(1, -(-cache_size // len(self._stripes)))
+        # spojenie na vlákno – pruhy sa tak neblokujú na jednom sqlite3.Connection
+        self._local = threading.local()
+        self._conns: List[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
+        self._schema_ready = False
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")  # stratená session po páde OS = nové prihlásenie
+            if not self._schema_ready:  # až pri prvom použití, nie pri importe
+                for statement in self.SCHEMA:
+                    conn.execute(statement)
+                self._schema_ready = True
+            self._local.conn = conn
+            with self._conns_lock:
+                self._conns.append(conn)
+        return conn
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return hashlib.sha256(session_id.encode()).hexdigest()
+
+    def _cache_put(self, stripe: _Stripe, session_id: str, rec: _Record, now: float) -> None:
+        stripe.entries[session_id] = (rec, now)
+        stripe.entries.move_to_end(session_id)
+        while len(stripe.entries) > self._per_stripe:
+            stripe.entries.popitem(last=False)
+
+    def _load(self, stripe: _Stripe, session_id: str) -> Optional[_Record]:
+        stripe.db_reads += 1
+        row = self._conn().execute(
+            "SELECT user_id, username, role, created_at, last_seen FROM sessions WHERE id = ?",
+            (self._key(session_id),),
+        ).fetchone()
+        if row is None:
+            return None
+        return _Record(User(id=row[0], username=row[1], role=row[2]), row[3], row[4])
+
+    def create_session(self, user: User) -> str:
+        session_id = secrets.token_urlsafe(32)
+        now = time.time()
+        self._conn().execute(
+            "INSERT INTO sessions (id, user_id, username, role, created_at, last_seen) VALUES (?, ?, ?, ?, ?, ?)",
+            (self._key(session_id), user.id, user.username, user.role, now, now),
+        )
+        stripe = self._stripe(session_id)
+        with stripe.lock:
+            stripe.db_writes += 1
+            self._cache_put(stripe, session_id, _Record(user, now, now), now)
+        return session_id
+
+    def get_user(self, session_id: Optional[str]) -> Optional[User]:
+        if not session_id:
+            return None
+        now = time.time()
+        stripe = self._stripe(session_id)
+        with stripe.lock:
+            cached: Optional[Tuple[_Record, float]] = stripe.entries.get(session_id)
+            rec = None
+            if cached is not None:
+                rec, cached_at = cached
+                # podozrivo starý / vypršaný záznam radšej overíme v DB (iný worker mohol
+                # posunúť last_seen alebo session zmazať)
+                if now - cached_at > self.cache_ttl or self._expired(rec, now):
+                    rec = None
+                else:
+                    stripe.entries.move_to_end(session_id)
+                    stripe.hits += 1
+            if rec is None:
+                stripe.misses += 1
+                rec = self._load(stripe, session_id)
+                if rec is None:
+                    stripe.entries.pop(session_id, None)
+                    return None
+                if self._expired(rec, now):
+                    stripe.entries.pop(session_id, None)
+                    self._delete(stripe, session_id)
+                    return None
+                self._cache_put(stripe, session_id, rec, now)
+            if now - rec.last_seen >= self.touch_interval:
+                rec.last_seen = now
+                self._conn().execute(
+                    "UPDATE sessions SET last_seen = ? WHERE id = ?", (now, self._key(session_id))
+                )
+                stripe.db_writes += 1
+            return rec.user
+
+    def _delete(self, stripe: _Stripe, session_id: str) -> None:
+        self._conn().execute("DELETE FROM sessions WHERE id = ?", (self._key(session_id),))
+        stripe.db_writes += 1
 
     def delete_session(self, session_id: Optional[str]) -> None:
         if not session_id:
             return
+        stripe = self._stripe(session_id)
+        with stripe.lock:
+            stripe.entries.pop(session_id, None)
+            self._delete(stripe, session_id)
+
+    def sweep(self) -> int:
+        now = time.time()
+        cur = self._conn().execute(
+            "DELETE FROM sessions WHERE last_seen < ? OR created_at < ?",
+            (now - self.idle_ttl, now - self.absolute_ttl),
+        )
+        removed = max(cur.rowcount, 0)
+        # aj z cache, nech nedrží pamäť pre mŕtve session
+        for stripe in self._stripes:
+            with stripe.lock:
+                dead = [sid for sid, (rec, _) in stripe.entries.items() if self._expired(rec, now)]
+                for sid in dead:
+                    del stripe.entries[sid]
+        self._sweeps += 1
+        self._swept += removed
+        return removed
+
+    def live_count(self) -> int:
+        now = time.time()
+        return self._conn().execute(
+            "SELECT COUNT(*) FROM sessions WHERE last_seen >= ? AND created_at >= ?",
+            (now - self.idle_ttl, now - self.absolute_ttl),
+        ).fetchone()[0]
+
+    def revoke_user(self, user_id: int, min_version: int, revoked_at: float) -> None:
+        # z DB pre všetkých workerov; ich cache to uvidí najneskôr po cache_ttl
+        self._conn().execute("DELETE FROM sessions WHERE user_id = ?", (user_id,))
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.db_writes += 1
+                for sid in [sid for sid, (rec, _) in stripe.entries.items() if rec.user.id == user_id]:
+                    del stripe.entries[sid]
+
+    def close(self) -> None:
+        super().close()
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            conn.close()
+        self._local = threading.local()
+
+    def stats(self) -> Dict[str, Any]:
+        out = super().stats()
+        out.update(
+            path=self.path,
+            cached=sum(len(s.entries) for s in self._stripes),
+            cache_capacity=self._per_stripe * len(self._stripes),
+            cache_ttl=self.cache_ttl,
+            db_reads=sum(s.db_reads for s in self._stripes),
+            db_writes=sum(s.db_writes for s in self._stripes),
+        )
+        return out
+
+
+class SignedCookieSessionBackend(SessionBackend):
+    """
+    Bezstavové session: cookie je podpísaný (itsdangerous) token
+    {id, username, role, credential_version, čas prihlásenia}.
+
+    get_user = overenie podpisu a času – žiadne úložisko, žiadny zámok.
+    Idle TTL je vek podpisu (middleware cookie raz za touch_interval
+    prepodpíše), absolútne TTL sa ráta od času prihlásenia v tokene.
+
+    Odvolanie (zmena hesla) si pamätá user_id -> min. platná verzia.
+    Do zoznamu sa pozeráme len pri tokenoch vydaných pred posledným
+    odvolaním; bežný token ho ani nečíta. Odvolania z iných workerov sa
+    načítajú z DB (credential_revocations) vláknom na pozadí.
+
+    Odhlásenie len zmaže cookie – skopírovaný token platí do idle TTL.
+    """
+
+    name = "signed"
+
+    def __init__(
+        self,
+        secret: str,
+        idle_ttl: float,
+        absolute_ttl: float,
+        touch_interval: float = 60.0,
+        refresh_interval: float = 5.0,
+    ) -> None:
+        super().__init__(idle_ttl, absolute_ttl, stripes=1)
+        self._serializer = URLSafeTimedSerializer(secret, salt="teamhub-session")
+        self.touch_interval = touch_interval
+        self.refresh_interval = refresh_interval
+        # čítanie bez zámku: pri zápise sa vymení celý dict (priradenie je atomické)
+        self._revoked: Dict[int, int] = {}
+        self._last_revocation = 0.0
+        self._refreshed_until = 0.0
+        self._loaded = False
+        self._lock = threading.Lock()  # len pre zápis odvolaní
+        # počítadlá bez zámku – pri súbehu môžu byť o pár menšie
+        self._verified = 0
+        self._rejected = 0
+        self._revocation_checks = 0
+        self._reissued = 0
+
+    def create_session(self, user: User) -> str:
+        return self._serializer.dumps({
+            "i": user.id,
+            "u": user.username,
+            "r": user.role,
+            "v": user.credential_version,
+            "t": round(time.time(), 3),
+        })
+
+    def _decode(self, token: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        try:
+            data, signed_at = self._serializer.loads(token, max_age=self.idle_ttl, return_timestamp=True)
+        except BadData:  # zlý podpis, poškodený token aj vypršaný (SignatureExpired)
+            return None
+        return data, signed_at.timestamp()
+
+    def get_user(self, session_id: Optional[str]) -> Optional[User]:
+        if not session_id:
+            return None
+        if not self._loaded:
+            self.sweep()  # odvolania z DB raz pri prvom použití (aj bez sweeper vlákna)
+        decoded = self._decode(session_id)
+        try:
+            if decoded is None:
+                raise KeyError
+            data = decoded[0]
+            user_id, version, issued_at = data["i"], data["v"], data["t"]
+            if time.time() - issued_at > self.absolute_ttl:
+                raise KeyError
+            if issued_at <= self._last_revocation:
+                # token je starší ako posledné odvolanie – až teraz sa pozrieme do zoznamu
+                self._revocation_checks += 1
+                if version < self._revoked.get(user_id, 0):
+                    raise KeyError
+            user = User(id=user_id, username=data["u"], role=data["r"], credential_version=version)
+        except (KeyError, TypeError):
+            self._rejected += 1
+            return None
+        self._verified += 1
+        return user
+
+    def reissue(self, session_id: Optional[str]) -> Optional[str]:
+        decoded = self._decode(session_id) if session_id else None
+        if decoded is None or time.time() - decoded[1] < self.touch_interval:
+            return None
+        self._reissued += 1
+        return self._serializer.dumps(decoded[0])
+
+    def delete_session(self, session_id: Optional[str]) -> None:
+        return None  # nič sa neukladá; stránka zmaže cookie
+
+    def revoke_user(self, user_id: int, min_version: int, revoked_at: float) -> None:
         with self._lock:
-            self._sessions.pop(session_id, None)
+            if min_version > self._revoked.get(user_id, 0):
+                revoked = dict(self._revoked)
+                revoked[user_id] = min_version
+                self._revoked = revoked
+            self._last_revocation = max(self._last_revocation, revoked_at)
+
+    def sweep(self) -> int:
+        """Načíta nové odvolania z DB (aj z iných workerov), vráti ich počet."""
+        # prekryv 60 s: odvolanie s o chvíľu starším revoked_at mohlo byť commitnuté neskôr
+        since = max(self._refreshed_until - 60.0, 0.0)
+        with open_read_connection() as conn:
+            rows = list_revocations(conn, since)
+        for user_id, min_version, revoked_at in rows:
+            self.revoke_user(user_id, min_version, revoked_at)
+            self._refreshed_until = max(self._refreshed_until, revoked_at)
+        self._loaded = True
+        self._sweeps += 1
+        return len(rows)
+
+    def start_sweeper(self, interval: float) -> None:
+        super().start_sweeper(min(interval, self.refresh_interval))
+
+    def live_count(self) -> Optional[int]:
+        return None  # bez úložiska sa nedá spočítať
+
+    def stats(self) -> Dict[str, Any]:
+        checked = self._verified + self._rejected
+        return {
+            "backend": self.name,
+            "live": None,
+            "verified": self._verified,
+            "rejected": self._rejected,
+            "revocation_checks": self._revocation_checks,
+            "revocation_check_rate": round(self._revocation_checks / checked, 4) if checked else None,
+            "revoked_users": len(self._revoked),
+            "last_revocation": self._last_revocation or None,
+            "reissued": self._reissued,
+            "refreshes": self._sweeps,
+            "sweeper_running": self._sweeper is not None,
+            "idle_ttl": self.idle_ttl,
+            "absolute_ttl": self.absolute_ttl,
+        }
+
+
+def set_session_cookie(response: Response, session_id: str) -> None:
+    # cookie nežije dlhšie než session (absolútne TTL), potom ju prehliadač sám zahodí
+    response.set_cookie(
+        SESSION_COOKIE_NAME, session_id, httponly=True, samesite="lax", max_age=int(config.SESSION_ABSOLUTE_TTL)
+    )
+
 
+def create_session_store(backend: Optional[str] = None) -> SessionBackend:
+    backend = backend or config.SESSION_BACKEND
+    if backend == "memory":
+        return MemorySessionBackend(config.SESSION_IDLE_TTL, config.SESSION_ABSOLUTE_TTL, config.SESSION_LOCK_STRIPES)
+    if backend == "sqlite":
+        return SqliteSessionBackend(
+            config.SESSION_DB_PATH,
+            idle_ttl=config.SESSION_IDLE_TTL,
+            absolute_ttl=config.SESSION_ABSOLUTE_TTL,
+            stripes=config.SESSION_LOCK_STRIPES,
+            cache_size=config.SESSION_CACHE_SIZE,
+            cache_ttl=config.SESSION_CACHE_TTL,
+            touch_interval=config.SESSION_TOUCH_INTERVAL,
+        )
+    if backend == "signed":
+        # s verejným predvoleným kľúčom by si ktokoľvek podpísal session admina
+        if config.SESSION_SECRET in ("", "dev-secret"):
+            raise ValueError("TEAMHUB_SESSION_BACKEND=signed vyžaduje vlastný TEAMHUB_SESSION_SECRET")
+        return SignedCookieSessionBackend(
+            config.SESSION_SECRET,
+            idle_ttl=config.SESSION_IDLE_TTL,
+            absolute_ttl=config.SESSION_ABSOLUTE_TTL,
+            touch_interval=config.SESSION_TOUCH_INTERVAL,
+            refresh_interval=config.SESSION_REVOCATION_REFRESH,
+        )
+    raise ValueError(f"Neznámy TEAMHUB_SESSION_BACKEND: {backend}")
 
-session_store = SessionStore()
 
+session_store = create_session_store()
@@ -0,0 +1,284 @@
+# app/startup.py
+"""
+Štart workera: routery stránok až pri prvom použití a meranie, čo štart stojí.
+
+create_app nedáva do app.routes cesty z pages/* priamo, ale zástupcov
+(_LazyRoutes) – jeden na modul z ROUTERS v main.py a jeden záchytný na
+konci. Zástupcu nahradia skutočné cesty modulu (na tom istom mieste, takže
+poradie a priority ciest sú rovnaké ako bez lenivosti), keď:
+
+- príde request na jeho cesty (hint `paths` v RouterSpec),
+- url_for hľadá meno, ktoré žiadna načítaná cesta nepozná (napr. odkazy v base.html),
+- sa generuje OpenAPI (/docs potrebuje všetky cesty),
+- request nesedí na nič – záchytný zástupca načíta všetko, takže 404 aj
+  presmerovanie /events -> /events/ fungujú ako pri bežnom štarte.
+
+Bez TEAMHUB_LAZY_STARTUP sa všetko načíta hneď v create_app tým istým kódom.
+
+    python main.py --profile-startup   # import po moduloch, create_app, lifespan, prvý request
+"""
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import anyio
+from fastapi import APIRouter, FastAPI
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+
+class RouterSpec(NamedTuple):
+    module: str                    # modul s `router`
+    paths: Tuple[str, ...]         # URL, ktoré obsluhuje (po prefixe) – kedy ho načítať
+    prefix: str = ""               # ako v app.include_router
+    tags: Optional[List[str]] = None
+
+
+def _serves(spec: RouterSpec, path: str) -> bool:
+    # "/" len presne, ostatné aj s podcestami (/events -> /events/12/edit)
+    return any(path == p or (p != "/" and path.startswith(p.rstrip("/") + "/")) for p in spec.paths)
+
+
+class _LazyRoutes(BaseRoute):
+    """Zástupca routera v app.routes, kým sa jeho modul nenačíta; spec=None = záchytný pre všetko."""
+
+    def __init__(self, loader: "RouterLoader", spec: Optional[RouterSpec]) -> None:
+        self.loader = loader
+        self.spec = spec
+
+    def matches(self, scope: Scope) -> Tuple[Match, Scope]:
+        if scope["type"] not in ("http", "websocket"):
+            return Match.NONE, {}
+        if self.spec is None or _serves(self.spec, scope["path"]):
+            return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, /, **path_params: Any) -> Any:
+        if self.spec is None:
+            raise NoMatchFound(name, path_params)
+        for route in self.loader.load(self.spec, "url_for"):
+            try:
+                return route.url_path_for(name, **path_params)
+            except NoMatchFound:
+                pass
+        raise NoMatchFound(name, path_params)
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # import mimo event loop; potom request prejde routingom znova, už so skutočnými cestami
+        if self.spec is None:
+            await anyio.to_thread.run_sync(self.loader.load_all, "request")
+        else:
+            await anyio.to_thread.run_sync(self.loader.load, self.spec, "request")
+        await self.loader.app.router(scope, receive, send)
+
+    def __repr__(self) -> str:
+        return f"_LazyRoutes({self.spec.module if self.spec else '*'})"
+
+
+class RouterLoader:
+    def __init__(self, app: FastAPI, specs: Sequence[RouterSpec]) -> None:
+        self.app = app
+        self.specs = list(specs)
+        self._lock = threading.Lock()
+        self._loaded: Dict[str, List[BaseRoute]] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        app.router.routes.extend([_LazyRoutes(self, spec) for spec in self.specs] + [_LazyRoutes(self, None)])
+
+        openapi = app.openapi
+
+        def openapi_all() -> Dict[str, Any]:
+            self.load_all("openapi")
+            return openapi()
+
+        app.openapi = openapi_all  # type: ignore[method-assign]
+
+    @property
+    def pending(self) -> List[str]:
+        return [spec.module for spec in self.specs if spec.module not in self._loaded]
+
+    def load(self, spec: RouterSpec, trigger: str = "startup") -> List[BaseRoute]:
+        """Naimportuje modul a jeho cesty dá na miesto zástupcu; vráti tieto cesty."""
+        with self._lock:
+            routes = self._loaded.get(spec.module)
+            if routes is not None:
+                return routes
+            started = time.perf_counter()
+            # __import__, nie importlib.import_module – ten -X importtime nevypisuje
+            module = __import__(spec.module, fromlist=["router"])
+            imported = time.perf_counter()
+            # rovnaké ako app.include_router, len do pomocného routera
+            scratch = APIRouter(dependency_overrides_provider=self.app)
+            scratch.include_router(module.router, prefix=spec.prefix, tags=spec.tags)
+            routes = scratch.routes
+
+            current = list(self.app.router.routes)
+            i = next(i for i, r in enumerate(current) if isinstance(r, _LazyRoutes) and r.spec is spec)
+            current[i:i + 1] = routes
+            self._loaded[spec.module] = routes
+            if not self.pending:
+                current = [r for r in current if not isinstance(r, _LazyRoutes)]
+            # nový zoznam naraz – routing v inom vlákne ešte iteruje ten starý
+            self.app.router.routes = current
+
+            self._stats[spec.module] = {
+                "trigger": trigger,
+                "routes": len(routes),
+                "import_ms": round((imported - started) * 1000, 2),
+                "include_ms": round((time.perf_counter() - imported) * 1000, 2),
+            }
+            return routes
+
+    def load_all(self, trigger: str = "startup") -> None:
+        for spec in self.specs:
+            self.load(spec, trigger)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"pending": self.pending, "loaded": dict(self._stats)}
+
+
+class Lazy:
+    """Objekt vytvorený až pri prvom prístupe k jeho atribútu (šablóny pri TEAMHUB_LAZY_STARTUP)."""
+
+    def __init__(self, factory: Callable[[], Any]) -> None:
+        self._factory = factory
+        self._value: Any = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._value is not None
+
+    def get(self) -> Any:
+        if self._value is None:
+            with self._lock:
+                if self._value is None:
+                    self._value = self._factory()
+        return self._value
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
+
+
+# ---------- python main.py --profile-startup ----------
+
+# v čerstvom procese s -X importtime: import main, lifespan, prvé requesty
+_CHILD = """
+import asyncio, json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+async def get(app, path):
+    # holé ASGI volanie – httpx by do merania pridal vlastné importy
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+             "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+             "headers": [(b"host", b"profile")], "client": ("127.0.0.1", 1), "server": ("profile", 80)}
+    status = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app(scope, receive, send)
+    return status[0]
+
+async def run():
+    app = main.app
+    out = {"import_ms": (imported - started) * 1000, "create_app_ms": app.state.startup["create_app_ms"]}
+    begin = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        out["lifespan_ms"] = (time.perf_counter() - begin) * 1000
+        out["requests"] = {}
+        for path in PATHS:
+            begin = time.perf_counter()
+            status = await get(app, path)
+            out["requests"][path] = {"status": status, "ms": (time.perf_counter() - begin) * 1000}
+        out["routers"] = app.state.routers.stats()
+    print(json.dumps(out))
+
+asyncio.run(run())
+"""
+# prvé requesty: HTML stránka (šablóny, base.html url_for) a JSON API
+PROFILE_PATHS = ["/", "/api/v1/events"]
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[int, int, int, str]]:
+    """Riadky -X importtime -> [(hĺbka, self µs, cumulative µs, modul)] v poradí výpisu (deti pred rodičom)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append((depth, int(self_us), int(cumulative_us), name.strip()))
+    return rows
+
+
+def _direct_imports(rows: List[Tuple[int, int, int, str]], parent: str) -> List[Tuple[str, float]]:
+    """Moduly, ktoré `parent` importoval priamo (a načítali sa prvýkrát), s kumulatívnym časom v ms."""
+    index = next((i for i, r in enumerate(rows) if r[3] == parent), None)
+    if index is None:
+        return []
+    depth = rows[index][0]
+    out = []
+    for row_depth, _, cumulative, name in reversed(rows[:index]):
+        if row_depth <= depth:
+            break
+        if row_depth == depth + 1:
+            out.append((name, cumulative / 1000))
+    return out[::-1]
+
+
+def _by_package(rows: List[Tuple[int, int, int, str]]) -> List[Tuple[str, float]]:
+    totals: Dict[str, float] = {}
+    for _, self_us, _, name in rows:
+        package = name.split(".")[0]
+        totals[package] = totals.get(package, 0.0) + self_us / 1000
+    return sorted(totals.items(), key=lambda kv: -kv[1])
+
+
+def _profile_child(lazy: bool) -> Tuple[Dict[str, Any], List[Tuple[int, int, int, str]]]:
+    env = dict(os.environ, TEAMHUB_LAZY_STARTUP="1" if lazy else "0", TEAMHUB_PRINT_ROUTES="0")
+    code = _CHILD.replace("PATHS", json.dumps(PROFILE_PATHS))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          env=env, capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-3000:])
+    return json.loads(proc.stdout.strip().splitlines()[-1]), _parse_importtime(proc.stderr)
+
+
+def profile_startup(top: int = 15) -> None:
+    """Porovná bežný a lenivý štart (TEAMHUB_LAZY_STARTUP), každý v čerstvom procese."""
+    for lazy in (False, True):
+        result, rows = _profile_child(lazy)
+        print(f"===== TEAMHUB_LAZY_STARTUP={int(lazy)} =====")
+        print(f"import main       {result['import_ms']:8.1f} ms  (z toho create_app {result['create_app_ms']:.1f} ms)")
+        print(f"lifespan štart    {result['lifespan_ms']:8.1f} ms")
+        for path, r in result["requests"].items():
+            print(f"prvý GET {path:16s} {r['ms']:8.1f} ms  ({r['status']})")
+
+        print(f"\nimporty main.py (kumulatívne ms, top {top}):")
+        for name, ms in sorted(_direct_imports(rows, "main"), key=lambda kv: -kv[1])[:top]:
+            print(f"  {name:36s} {ms:8.1f}")
+        print(f"\nimport podľa balíka (vlastný čas ms, celý beh vrátane requestov, top {top}):")
+        for name, ms in _by_package(rows)[:top]:
+            print(f"  {name:36s} {ms:8.1f}")
+
+        routers = result["routers"]
+        print("\nroutery (kedy a za koľko sa načítali):")
+        for module, st in routers["loaded"].items():
+            print(f"  {module:28s} {st['trigger']:8s} import {st['import_ms']:7.1f} ms  "
+                  f"include {st['include_ms']:6.1f} ms  ciest: {st['routes']}")
+        if routers["pending"]:
+            print(f"  nenačítané: {', '.join(routers['pending'])}")
+        print()
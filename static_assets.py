@@ -0,0 +1,291 @@
+# app/static_assets.py
+"""
+Statické súbory: odtlačky obsahu v názvoch, vopred skomprimované varianty
+a zmenšené obrázky.
+
+Build krok (python build_assets.py, pri deployi) z adresára static/ vyrobí
+static/dist/:
+
+- css/style.3f2a9c01be.css – zmenený obsah = nový názov, takže súbor môže
+  mať Cache-Control: immutable na rok a telefón ho už znova nesťahuje
+- vedľa textových súborov .gz (a .br, ak je nainštalované `brotli`) –
+  komprimuje sa raz pri builde, nie pri každom requeste
+- obrázky z IMAGE_VARIANTS v šírkach, v akých ich šablóny naozaj
+  zobrazujú, ako AVIF / WebP / PNG (potrebuje Pillow)
+- manifest.json: pôvodná cesta -> súbor s odtlačkom, kódovania, varianty
+
+V šablónach namiesto url_for('static', ...):
+
+    <link rel="stylesheet" href="{{ static_url('css/style.css') }}">
+    {% set logo = static_image('img/castkov.png') %}
+
+Bez buildu (alebo s TEAMHUB_STATIC_FINGERPRINT=0) vracajú pôvodné cesty
+a tie sa servírujú ako predtým, len s revalidáciou cez ETag.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+import config
+from compression import pick_encoding
+
+try:
+    import brotli
+except ImportError:  # brotli je voliteľné – bez neho len .gz
+    brotli = None
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow je voliteľný – bez neho sa obrázky len skopírujú s odtlačkom
+    Image = None
+
+STATIC_URL = "/static"
+BUILD_DIR = "dist"
+MANIFEST = "manifest.json"
+
+# komprimovať sa oplatí len text (PNG, WebP, AVIF sú už skomprimované)
+COMPRESSIBLE = (".css", ".js", ".svg", ".json", ".txt", ".html", ".map")
+# variant sa ponechá, len ak ušetrí aspoň 5 %
+MIN_SAVING = 0.05
+# poradie = preferencia (aj v manifeste): br je pri statických súboroch o ~15 % menší ako gzip
+ENCODING_SUFFIX = {"br": ".br", "gzip": ".gz"}
+
+# obrázok -> šírky v px, v akých sa zobrazuje (1x, 2x, 3x hustota displeja)
+# castkov.png: .brand__logo v base.html má 28×28 px; home.html obrázky nemá
+IMAGE_VARIANTS: Dict[str, Tuple[int, ...]] = {
+    "img/castkov.png": (28, 56, 84),
+}
+# (MIME, formát Pillow, prípona, parametre) – od najmenšieho; PNG je záloha pre <img>
+IMAGE_FORMATS: Tuple[Tuple[str, str, str, Dict[str, Any]], ...] = (
+    ("image/avif", "AVIF", ".avif", {"quality": 60}),
+    ("image/webp", "WEBP", ".webp", {"quality": 85, "method": 6}),
+    ("image/png", "PNG", ".png", {"optimize": True}),
+)
+
+IMMUTABLE = f"public, max-age={config.STATIC_MAX_AGE}, immutable"
+
+
+# ---------- build ----------
+
+
+def _fingerprinted(rel: str, data: bytes, suffix: str = "") -> str:
+    root, ext = os.path.splitext(rel)
+    return f"{BUILD_DIR}/{root}{suffix}.{hashlib.sha256(data).hexdigest()[:10]}{ext}"
+
+
+def _sources(static_dir: str) -> Iterator[str]:
+    for root, dirs, files in os.walk(static_dir):
+        rel_root = os.path.relpath(root, static_dir).replace(os.sep, "/")
+        if rel_root == ".":
+            rel_root = ""
+            dirs[:] = [d for d in dirs if d != BUILD_DIR]
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for name in sorted(files):
+            if not name.startswith("."):  # .DS_Store a spol.
+                yield f"{rel_root}/{name}" if rel_root else name
+
+
+def _compress(data: bytes) -> Dict[str, bytes]:
+    out: Dict[str, bytes] = {}
+    if brotli is not None:
+        out["br"] = brotli.compress(data, quality=11)
+    out["gzip"] = gzip.compress(data, compresslevel=9, mtime=0)  # mtime=0: rovnaký vstup = rovnaký súbor
+    return {enc: body for enc, body in out.items() if len(body) <= len(data) * (1 - MIN_SAVING)}
+
+
+def _image_variants(data: bytes, widths: Tuple[int, ...]) -> Dict[str, List[Tuple[int, bytes]]]:
+    src = Image.open(io.BytesIO(data))
+    src.load()
+    Image.init()
+    out: Dict[str, List[Tuple[int, bytes]]] = {}
+    for mime, fmt, _, options in IMAGE_FORMATS:
+        if fmt not in Image.SAVE:
+            continue  # napr. Pillow bez libavif
+        for width in widths:
+            width = min(width, src.width)  # nezväčšovať
+            height = max(1, round(src.height * width / src.width))
+            buf = io.BytesIO()
+            src.resize((width, height), Image.LANCZOS).save(buf, fmt, **options)
+            out.setdefault(mime, []).append((width, buf.getvalue()))
+    return out
+
+
+def _write(static_dir: str, rel: str, data: bytes) -> None:
+    path = os.path.join(static_dir, *rel.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def build(static_dir: str = config.STATIC_DIR, clean: bool = False) -> Dict[str, Any]:
+    """
+    Vyrobí static/dist a manifest.json; vráti manifest.
+    Staré súbory s odtlačkom nechá (stránky v cache ich ešte môžu chcieť),
+    clean=True zmaže všetko, čo nový manifest nepozná.
+    """
+    assets: Dict[str, Dict[str, Any]] = {}
+    files: Dict[str, List[str]] = {}
+
+    for rel in _sources(static_dir):
+        with open(os.path.join(static_dir, *rel.split("/")), "rb") as f:
+            data = f.read()
+        file = _fingerprinted(rel, data)
+        _write(static_dir, file, data)
+        entry: Dict[str, Any] = {"file": file, "size": len(data)}
+
+        encodings: List[str] = []
+        if rel.endswith(COMPRESSIBLE):
+            for encoding, body in _compress(data).items():
+                _write(static_dir, file + ENCODING_SUFFIX[encoding], body)
+                encodings.append(encoding)
+                entry[f"{encoding}_size"] = len(body)
+        files[file] = encodings
+        entry["encodings"] = encodings
+
+        widths = IMAGE_VARIANTS.get(rel)
+        if widths and Image is not None:
+            images: Dict[str, List[Tuple[int, str, int]]] = {}
+            for mime, variants in _image_variants(data, widths).items():
+                ext = next(e for m, _, e, _ in IMAGE_FORMATS if m == mime)
+                for width, body in variants:
+                    variant = _fingerprinted(os.path.splitext(rel)[0] + ext, body, suffix=f"-{width}")
+                    _write(static_dir, variant, body)
+                    files[variant] = []
+                    images.setdefault(mime, []).append((width, variant, len(body)))
+            entry["images"] = images
+        assets[rel] = entry
+
+    manifest = {"assets": assets, "files": files}
+    _write(static_dir, f"{BUILD_DIR}/{MANIFEST}",
+           json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+
+    if clean:
+        keep: Set[str] = {f"{BUILD_DIR}/{MANIFEST}"}
+        for file, encodings in files.items():
+            keep.add(file)
+            keep.update(file + ENCODING_SUFFIX[e] for e in encodings)
+        out_dir = os.path.join(static_dir, BUILD_DIR)
+        for root, _, names in os.walk(out_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                if os.path.relpath(path, static_dir).replace(os.sep, "/") not in keep:
+                    os.remove(path)
+    return manifest
+
+
+# ---------- runtime ----------
+
+
+class AssetManifest:
+    def __init__(self, assets: Optional[Dict[str, Dict[str, Any]]] = None,
+                 files: Optional[Dict[str, List[str]]] = None) -> None:
+        self._assets = assets or {}
+        self._files = files or {}
+
+    @classmethod
+    def load(cls, static_dir: str = config.STATIC_DIR) -> "AssetManifest":
+        try:
+            with open(os.path.join(static_dir, BUILD_DIR, MANIFEST), encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls()  # build ešte nebežal – pôvodné súbory
+        return cls(data.get("assets"), data.get("files"))
+
+    @property
+    def built(self) -> bool:
+        return bool(self._assets)
+
+    def url(self, path: str) -> str:
+        """URL súboru zo static/ – s odtlačkom, ak je v manifeste."""
+        entry = self._assets.get(path)
+        return f"{STATIC_URL}/{entry['file'] if entry else path}"
+
+    def image(self, path: str) -> Dict[str, Any]:
+        """
+        Pre <picture>: `sources` = [(MIME, srcset)] od najmenšieho formátu,
+        `src`/`srcset` = PNG pre <img>. Bez variantov len src pôvodného súboru.
+        """
+        images = self._assets.get(path, {}).get("images") or {}
+        sources = [(mime, self._srcset(variants)) for mime, variants in images.items() if mime != "image/png"]
+        fallback = images.get("image/png")
+        if not fallback:
+            return {"src": self.url(path), "srcset": "", "sources": sources}
+        return {"src": f"{STATIC_URL}/{fallback[0][1]}", "srcset": self._srcset(fallback), "sources": sources}
+
+    @staticmethod
+    def _srcset(variants: List[Any]) -> str:
+        # najmenšia šírka = 1x (obrázok má v CSS pevnú veľkosť)
+        base = variants[0][0]
+        return ", ".join(f"{STATIC_URL}/{file} {width / base:g}x" for width, file, *_ in variants)
+
+    def encodings(self, file: str) -> List[str]:
+        return self._files.get(file, [])
+
+    def is_fingerprinted(self, file: str) -> bool:
+        return file in self._files
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "built": self.built,
+            "assets": len(self._assets),
+            "files": len(self._files),
+            "bytes": {
+                path: {k: v for k, v in entry.items() if k == "size" or k.endswith("_size")}
+                for path, entry in self._assets.items()
+            },
+            "images": {
+                path: {mime: [w for w, *_ in variants] for mime, variants in entry["images"].items()}
+                for path, entry in self._assets.items() if entry.get("images")
+            },
+        }
+
+
+class AssetStaticFiles(StaticFiles):
+    """
+    StaticFiles s hlavičkami pre build výstup: súbory z manifestu majú
+    Cache-Control immutable a ak klient vie br/gzip, ide vopred skomprimovaný
+    variant (Content-Encoding + Vary). Ostatné súbory = no-cache (ETag / 304).
+    """
+
+    def __init__(self, *, manifest: AssetManifest, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.manifest = manifest
+        self._lock = threading.Lock()
+        self._served: Dict[str, int] = {}
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        file = path.replace(os.sep, "/")
+        encodings = self.manifest.encodings(file)
+        encoding = pick_encoding(Headers(scope=scope).get("accept-encoding", ""), encodings) if encodings else None
+
+        response = await super().get_response(path + ENCODING_SUFFIX[encoding] if encoding else path, scope)
+        if encoding:
+            response.headers["content-encoding"] = encoding
+        if encodings:
+            response.headers["vary"] = "Accept-Encoding"
+        fingerprinted = self.manifest.is_fingerprinted(file)
+        response.headers["cache-control"] = IMMUTABLE if fingerprinted else "no-cache"
+
+        key = encoding or ("identity" if fingerprinted else "unversioned")
+        with self._lock:
+            self._served[key] = self._served.get(key, 0) + 1
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            served = dict(self._served)
+        return dict(self.manifest.stats(), served=served, brotli=brotli is not None, pillow=Image is not None)
+
+
+asset_manifest = AssetManifest.load() if config.STATIC_FINGERPRINT else AssetManifest()
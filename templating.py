@@ -0,0 +1,216 @@
+# app/templating.py
+"""
+Jinja2 prostredie pre stránky.
+
+Predvolené Jinja2Templates(directory=...) kompiluje každú šablónu až pri
+prvom použití, v každom workeri a po každom reštarte znova, a pri každom
+renderi kontroluje čas zmeny súboru. Tu:
+
+- auto_reload je vypnutý (TEAMHUB_TEMPLATES_AUTO_RELOAD=1 pri vývoji)
+- skompilovaný bytecode sa ukladá na disk (FileSystemBytecodeCache) –
+  zdieľajú ho workeri aj ďalší štart; kľúčom je kontrolný súčet zdrojáku,
+  takže zmenená šablóna sa prekompiluje sama
+- warm_up() pri štarte načíta všetky šablóny z adresára, takže prvý request
+  po deployi už nič neparsuje
+
+StreamingTemplates (TEAMHUB_STREAM_HTML=1) renderuje veľké stránky cez
+generate_async do StreamingResponse: hlavička a navigácia z base.html
+odídu hneď, riadky sa dopisujú, ako prichádzajú z kurzora.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional
+
+import anyio
+import jinja2
+from jinja2.bccache import Bucket
+from starlette.responses import StreamingResponse
+from starlette.templating import Jinja2Templates
+
+import config
+
+
+class CountingBytecodeCache(jinja2.FileSystemBytecodeCache):
+    """FileSystemBytecodeCache s počítadlami – koľko šablón sa načítalo z disku a koľko kompilovalo."""
+
+    def __init__(self, directory: Optional[str] = None, pattern: str = "__jinja2_%s.cache") -> None:
+        super().__init__(directory or None, pattern)
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        super().load_bytecode(bucket)
+        if bucket.code is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        super().dump_bytecode(bucket)
+        self.writes += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {"directory": self.directory, "hits": self.hits, "misses": self.misses, "writes": self.writes}
+
+
+def create_templates(directory: str = "templates") -> Jinja2Templates:
+    bytecode_cache = CountingBytecodeCache(config.TEMPLATE_CACHE_DIR) if config.TEMPLATE_BYTECODE_CACHE else None
+    env = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(directory),
+        autoescape=True,  # ako Jinja2Templates(directory=...)
+        auto_reload=config.TEMPLATES_AUTO_RELOAD,
+        bytecode_cache=bytecode_cache,
+    )
+    return Jinja2Templates(env=env)
+
+
+class StreamingTemplates:
+    """
+    Tie isté šablóny v async prostredí Jinja2; TemplateResponse vracia
+    StreamingResponse namiesto jedného hotového reťazca.
+
+    Render beží v samostatnej úlohe a odpoveď pošle všetko, čo je hotové,
+    vždy keď render čaká (typicky na ďalšiu dávku riadkov z DB executora).
+    Prvý kus je teda stránka až po prvý dotaz, ďalšie sú dávky riadkov –
+    nie tisíce drobných zápisov po jednom výraze šablóny.
+    """
+
+    def __init__(self, templates: Jinja2Templates, max_buffer: int = 64 * 1024) -> None:
+        base = templates.env
+        # async kód je iný ako sync – v bytecode cache pod vlastným menom súborov
+        bytecode_cache = (
+            CountingBytecodeCache(config.TEMPLATE_CACHE_DIR, pattern="__jinja2_async_%s.cache")
+            if base.bytecode_cache is not None else None
+        )
+        self.env = jinja2.Environment(
+            loader=base.loader,
+            autoescape=base.autoescape,
+            auto_reload=base.auto_reload,
+            bytecode_cache=bytecode_cache,
+            enable_async=True,
+        )
+        # spoločné globály (url_for, get_user pridaný v main.py) aj filtre
+        self.env.globals = base.globals
+        self.env.filters = base.filters
+        self.env.tests = base.tests
+        # render predbehne klienta najviac o toľkoto znakov
+        self.max_buffer = max_buffer
+
+        self._responses = 0
+        self._chunks = 0
+        self._chars = 0
+        self._first_chunk_total = 0.0
+        self._first_chunk_max = 0.0
+
+    def TemplateResponse(
+        self,
+        name: str,
+        context: Dict[str, Any],
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> StreamingResponse:
+        if "request" not in context:
+            raise ValueError('context must include a "request" key')
+        template = self.env.get_template(name)
+        return StreamingResponse(
+            self._stream(template, context),
+            status_code=status_code,
+            headers=headers,
+            media_type="text/html",
+        )
+
+    async def _stream(self, template: jinja2.Template, context: Dict[str, Any]) -> AsyncIterator[str]:
+        started = time.perf_counter()
+        pieces: List[str] = []
+        buffered = 0
+        ready = asyncio.Event()    # v pieces niečo pribudlo, alebo render skončil
+        drained = asyncio.Event()  # odpoveď si buffer vzala
+        finished = False
+
+        async def render() -> None:
+            nonlocal buffered, finished
+            try:
+                async for piece in template.generate_async(context):
+                    pieces.append(piece)
+                    buffered += len(piece)
+                    # set() len prebudí odpoveď – na rad príde, až keď render začne čakať
+                    ready.set()
+                    if buffered >= self.max_buffer:
+                        drained.clear()
+                        await drained.wait()
+            finally:
+                finished = True
+                ready.set()
+
+        task = asyncio.ensure_future(render())
+        first = True
+        try:
+            while True:
+                await ready.wait()
+                ready.clear()
+                if pieces:
+                    chunk = "".join(pieces)
+                    pieces.clear()
+                    buffered = 0
+                    drained.set()
+                    self._chunks += 1
+                    self._chars += len(chunk)
+                    if first:
+                        first = False
+                        elapsed = time.perf_counter() - started
+                        self._first_chunk_total += elapsed
+                        self._first_chunk_max = max(self._first_chunk_max, elapsed)
+                    yield chunk
+                if finished:
+                    task.result()  # chyba v šablóne – hlavičky sú už preč, spojenie sa preruší
+                    break
+        finally:
+            self._responses += 1
+            if not task.done():
+                # klient odišiel: render zrušíme a počkáme, kým zavrie kurzor –
+                # spojenie requestu vráti middleware až po nás
+                task.cancel()
+                with anyio.CancelScope(shield=True):
+                    await asyncio.wait([task])
+
+    def stats(self) -> Dict[str, Any]:
+        responses = self._responses
+        return {
+            "responses": responses,
+            "chunks": self._chunks,
+            "chars": self._chars,
+            "chunks_per_response": round(self._chunks / responses, 2) if responses else None,
+            "first_chunk_mean_ms": round(self._first_chunk_total * 1000 / responses, 3) if responses else None,
+            "first_chunk_max_ms": round(self._first_chunk_max * 1000, 3),
+            "bytecode_cache": (self.env.bytecode_cache.stats()
+                               if isinstance(self.env.bytecode_cache, CountingBytecodeCache) else None),
+        }
+
+
+def warm_up(templates: Any) -> Dict[str, Any]:
+    """Načíta (skompiluje alebo vezme z bytecode cache) všetky .html šablóny."""
+    env = templates.env
+    started = time.perf_counter()
+    names = env.list_templates(extensions=["html"])
+    for name in names:
+        env.get_template(name)  # chybná šablóna zhodí štart, nie až request
+    return {"templates": len(names), "ms": round((time.perf_counter() - started) * 1000, 1)}
+
+
+def template_stats(
+    templates: Jinja2Templates,
+    warm_up_result: Optional[Dict[str, Any]] = None,
+    streaming: Optional[StreamingTemplates] = None,
+) -> Dict[str, Any]:
+    env = templates.env
+    cache = env.bytecode_cache
+    return {
+        "auto_reload": env.auto_reload,
+        "loaded": len(env.cache) if env.cache is not None else None,
+        "bytecode_cache": cache.stats() if isinstance(cache, CountingBytecodeCache) else None,
+        "warm_up": warm_up_result,
+        "streaming": dict(streaming.stats(), enabled=config.STREAM_HTML) if streaming is not None else None,
+    }